@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Adapters for job boards that publish a paginated JSON API.
+
+The pages are pulled lazily. paginate() is a generator that follows the
+`links.next` cursor (Laravel-style `{data, links, meta}` pages, as used by
+Arbeitnow), and only fetches the next page once the consumer has used the
+current one. With ijson installed (optional), each page is also parsed
+incrementally from the response stream and its items are handed on as they
+are decoded, so not even one whole page is held in memory; without it a page
+is parsed whole. The adapters filter while streaming (posting language and
+location) and stop paginating as soon as they reach a posting they have
+already seen:
+
+- a job ID that is already in the job store, or
+- a posting at or before the newest `created_at` seen on the previous run for
+  the same query. These cursors are kept in data/api-cursors.json.
+
+The API lists newest first, so everything after that point is old news.
+
+Usage:
+    python3 scripts/api_boards.py --keyword "python developer"            # live, no store writes
+    python3 scripts/api_boards.py --file data/arbeitnow.json               # map a saved page
+
+    from api_boards import iter_arbeitnow
+    for job in iter_arbeitnow("python developer", seen_ids=store.id_set()):
+        ...
+"""
+
+import argparse
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # pages are parsed whole with resp.json()
+
+from fetcher import fetch
+from html_backend import parse_document
+from job_store import generate_job_id
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+CURSORS_PATH = DATA_DIR / "api-cursors.json"
+
+ARBEITNOW_API_URL = "https://www.arbeitnow.com/api/job-board-api"
+MAX_API_PAGES = 10
+
+# Places that count as "in the Netherlands" for API boards without a country field
+NL_PLACE_TERMS = (
+    "netherlands", "nederland", "holland", "amsterdam", "rotterdam", "den haag",
+    "the hague", "utrecht", "eindhoven", "groningen", "tilburg", "almere", "breda",
+    "nijmegen", "arnhem", "haarlem", "enschede", "amersfoort", "apeldoorn",
+    "'s-hertogenbosch", "den bosch", "zwolle", "leiden", "maastricht", "delft",
+    "helmond", "veldhoven", "best", "deventer", "hilversum", "zoetermeer",
+)
+
+# Frequent function words per language, for a cheap language guess
+STOPWORDS = {
+    "en": {"the", "and", "you", "with", "for", "our", "are", "will", "your", "we", "of", "to"},
+    "nl": {"de", "het", "een", "en", "je", "van", "voor", "met", "wij", "onze", "zijn", "jouw"},
+    "de": {"der", "die", "das", "und", "du", "mit", "für", "wir", "bei", "unsere", "ist", "ein"},
+}
+_WORD_RE = re.compile(r"[a-zà-ÿ]+")
+_NL_PLACE_RE = re.compile(r"\b(?:" + "|".join(re.escape(term) for term in NL_PLACE_TERMS) + r")\b")
+
+
+def detect_language(text: str, max_words: int = 200) -> str:
+    """Best-guess ISO code (en/nl/de) of a posting from its function words, "" if unclear."""
+    words = _WORD_RE.findall(text.lower())[:max_words]
+    counts = {lang: sum(1 for w in words if w in stop) for lang, stop in STOPWORDS.items()}
+    lang, hits = max(counts.items(), key=lambda item: item[1])
+    return lang if hits >= 3 else ""
+
+
+def in_netherlands(location: str, remote: bool = False) -> bool:
+    return remote or bool(_NL_PLACE_RE.search(location.lower()))
+
+
+class FeedCursors:
+    """Newest-seen `created_at` per feed query, persisted between runs."""
+
+    def __init__(self, path: Path = CURSORS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.cursors: dict[str, float] = {}
+        if path.exists():
+            try:
+                self.cursors = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                self.cursors = {}
+
+    def get(self, key: str) -> float:
+        with self.lock:
+            return self.cursors.get(key, 0)
+
+    def advance(self, key: str, created_at: float) -> None:
+        with self.lock:
+            if created_at > self.cursors.get(key, 0):
+                self.cursors[key] = created_at
+
+    def save(self) -> None:
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.cursors, indent=2, sort_keys=True))
+
+
+def iter_page(stream, links: dict):
+    """
+    Yield the `data` items of one API page while reading `stream` (a binary
+    file object) incrementally with ijson, and store the page's `links.next`
+    in links["next"]. Raises ValueError on malformed JSON.
+    """
+    builder = None
+    try:
+        for prefix, event, value in ijson.parse(stream, use_float=True):
+            if builder is None and prefix == "data.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "data.item" and event == "end_map":
+                    yield builder.value
+                    builder = None
+            elif prefix == "links.next" and event in ("string", "null"):
+                links["next"] = value
+    except ijson.JSONError as e:
+        raise ValueError(f"Malformed API page: {e}") from e
+
+
+def paginate(url: str, params: dict | None = None, max_pages: int = MAX_API_PAGES,
+             state: dict | None = None):
+    """
+    Yield the items of a `{data, links: {next}}` API page by page. The next
+    page is requested only when the consumer asks for more items; with ijson
+    the current page is also decoded only as far as the consumer has read.
+    Sets state["exhausted"] when the last page was reached (not just
+    max_pages). Raises requests.RequestException like fetch(), and ValueError
+    on a malformed page.
+    """
+    for _ in range(max_pages):
+        if ijson is None:
+            page = fetch(url, params=params).json()
+            yield from page.get("data") or []
+            url = (page.get("links") or {}).get("next")
+        else:
+            links = {}
+            resp = fetch(url, params=params, stream=True)
+            resp.raw.decode_content = True
+            with resp:
+                yield from iter_page(resp.raw, links)
+            url = links.get("next")
+        if not url:
+            if state is not None:
+                state["exhausted"] = True
+            return
+        params = None  # the cursor URL already carries the query
+
+
+def arbeitnow_job(item: dict) -> dict:
+    """Map an Arbeitnow API item to the search.py job schema."""
+    description = item.get("description") or ""
+    if "<" in description:
+        description = parse_document(description).text(" ")
+    location = item.get("location") or ""
+    if item.get("remote"):
+        location = f"{location} (Remote)" if location else "Remote"
+    created_at = item.get("created_at")
+    return {
+        "id": generate_job_id(item["url"]),
+        "title": item.get("title", "").strip(),
+        "company": item.get("company_name") or "Unknown",
+        "location": location,
+        "url": item["url"],
+        "description": description,
+        "description_source": "api",
+        "salary": "",
+        "date_posted": datetime.fromtimestamp(created_at).date().isoformat() if created_at else "",
+        "source": "Arbeitnow",
+        "scraped_at": datetime.now().isoformat(),
+    }
+
+
+def iter_arbeitnow(keyword: str, languages: set | None = None, seen_ids: set | None = None,
+                   cursors: FeedCursors | None = None, max_pages: int = MAX_API_PAGES,
+                   items=None):
+    """
+    Stream matching Arbeitnow postings, newest first. Stops at the first
+    already-seen posting. `items` replaces the live API (e.g. a saved page).
+
+    The cursor advances to the newest posting only once the stream is fully
+    consumed and reached either an already-seen posting or the last page.
+    A failed page, MAX_API_PAGES or a consumer that stops early leaves it
+    where it was, so the older unseen postings are fetched next run.
+    """
+    key = f"arbeitnow:{keyword.lower()}"
+    since = cursors.get(key) if cursors else 0
+    pages = {"exhausted": True}
+    if items is None:
+        pages["exhausted"] = False
+        items = paginate(ARBEITNOW_API_URL, {"search": keyword}, max_pages, pages)
+
+    newest = 0
+    caught_up = False
+    for item in items:
+        if not item.get("url"):
+            continue
+        created_at = item.get("created_at") or 0
+        if since and created_at <= since:
+            caught_up = True
+            break
+        if seen_ids is not None and generate_job_id(item["url"]) in seen_ids:
+            caught_up = True
+            break
+        newest = max(newest, created_at)
+
+        if not in_netherlands(item.get("location") or "", item.get("remote", False)):
+            continue
+        job = arbeitnow_job(item)
+        if languages and detect_language(f"{job['title']} {job['description']}") not in languages:
+            continue
+        yield job
+
+    if cursors and newest and (caught_up or pages["exhausted"]):
+        cursors.advance(key, newest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON API job board adapters")
+    parser.add_argument("--keyword", type=str, default="developer", help="Search keyword")
+    parser.add_argument("--file", type=Path, help="Map a saved API page instead of fetching")
+    parser.add_argument("--languages", type=str, default="en,nl", help="Accepted posting languages")
+    args = parser.parse_args()
+
+    languages = {lang.strip() for lang in args.languages.split(",") if lang.strip()}
+    items = None
+    if args.file:
+        items = json.loads(args.file.read_text()).get("data", [])
+
+    count = 0
+    try:
+        for job in iter_arbeitnow(args.keyword, languages, items=items):
+            count += 1
+            print(f"  {job['title']} @ {job['company']} ({job['location']})")
+    except requests.RequestException as e:
+        print(f"ERROR: Arbeitnow API request failed: {e}")
+    print(f"{count} matching postings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Watchlist poller for company careers pages hosted on known ATS platforms.
+
+The apply/submit scripts have already met dozens of employers on Recruitee,
+Greenhouse, Workable and Homerun. Polling those tenants directly finds their
+new vacancies much sooner than keyword searches on the aggregators. Each
+tenant is read from its public listing endpoint:
+
+    Recruitee   https://<slug>.recruitee.com/api/offers/
+    Greenhouse  https://boards-api.greenhouse.io/v1/boards/<board>/jobs?content=true
+    Workable    https://apply.workable.com/api/v1/widget/accounts/<account>?details=true
+    Homerun     https://<company>.homerun.co/   (no public JSON; schema.org JobPostings
+                                                 or vacancy links on the careers page)
+
+Requests go through http_cache.fetch_cards. An unchanged tenant is therefore
+a conditional GET answered with 304. Tenants are polled in per-host lanes, at
+most --workers hosts at a time, behind the usual per-host token buckets and
+circuit breakers. Offers outside the Netherlands (and not remote) are dropped.
+
+Only new or changed offers reach the job store. A fingerprint of every
+offer's title, location and description is kept in data/ats-offers.json:
+
+- New offers are ingested like search results (dedupe, detail enrichment).
+- Changed offers get a new store version.
+
+The watchlist itself is data/ats-watchlist.json. --discover (or a missing
+file) fills it by scanning scripts/*.py and data/applications.json for
+tenant URLs.
+
+Usage:
+    python3 scripts/ats_watchlist.py                    # poll all tenants
+    python3 scripts/ats_watchlist.py --discover         # rescan scripts for tenants first
+    python3 scripts/ats_watchlist.py --ats recruitee    # one platform only
+    python3 scripts/ats_watchlist.py --dry-run          # print new/changed offers, no writes
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from api_boards import in_netherlands
+from embedded_json import find_objects, json_ld_blocks
+from fetcher import host_of, run_lanes
+from html_backend import parse_document
+from http_cache import ResponseCache, fetch_cards, set_default_cache
+from job_store import JobStore, generate_job_id
+from search import ingest_jobs
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+SCRIPTS_DIR = BASE_DIR / "scripts"
+WATCHLIST_PATH = DATA_DIR / "ats-watchlist.json"
+OFFERS_PATH = DATA_DIR / "ats-offers.json"
+
+MAX_WORKERS = 8
+
+# Tenant references in the apply scripts and the applications log
+TENANT_PATTERNS = {
+    "recruitee": [
+        re.compile(r"https?://([a-z0-9-]+)\.recruitee\.com"),
+        re.compile(r'"slug_company":\s*"([a-z0-9-]+)"'),
+    ],
+    "greenhouse": [
+        re.compile(r"(?:job-)?boards\.greenhouse\.io/([a-z0-9]+)(?:/|\b)"),
+        re.compile(r"boards-api\.greenhouse\.io/v1/boards/([a-z0-9]+)"),
+    ],
+    "workable": [
+        re.compile(r"apply\.workable\.com/([a-z0-9-]+)/"),
+        re.compile(r'ACCOUNT_SUBDOMAIN\s*=\s*"([a-z0-9-]+)"'),
+    ],
+    "homerun": [
+        re.compile(r"https?://([a-z0-9-]+)\.homerun\.co"),
+    ],
+}
+# Path segments the patterns above also match that are not tenants
+NOT_TENANTS = {"api", "www", "app", "embed", "v1", "jobs"}
+
+
+def _plain(text: str) -> str:
+    return parse_document(text).text(" ") if "<" in text else text.strip()
+
+
+def discover_tenants(paths: list[Path]) -> dict[str, list[str]]:
+    """{ats: sorted tenant slugs} referenced in the given files."""
+    found: dict[str, set] = {ats: set() for ats in TENANT_PATTERNS}
+    for path in paths:
+        try:
+            text = path.read_text(errors="replace")
+        except OSError:
+            continue
+        for ats, patterns in TENANT_PATTERNS.items():
+            for pattern in patterns:
+                found[ats].update(m.lower() for m in pattern.findall(text))
+    return {ats: sorted(slugs - NOT_TENANTS) for ats, slugs in found.items()}
+
+
+def load_watchlist(path: Path = WATCHLIST_PATH) -> dict[str, list[str]]:
+    if path.exists():
+        try:
+            return json.loads(path.read_text())
+        except json.JSONDecodeError:
+            pass
+    return {ats: [] for ats in TENANT_PATTERNS}
+
+
+def save_watchlist(watchlist: dict[str, list[str]], path: Path = WATCHLIST_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(watchlist, indent=2))
+
+
+def _job(url: str, title: str, company: str, location: str, description: str,
+         date_posted: str, source: str) -> dict:
+    return {
+        "id": generate_job_id(url),
+        "title": title.strip(),
+        "company": company or "Unknown",
+        "location": location,
+        "url": url,
+        "description": description,
+        "description_source": "ats",
+        "salary": "",
+        "date_posted": (date_posted or "")[:10],
+        "source": source,
+        "scraped_at": datetime.now().isoformat(),
+    }
+
+
+def parse_recruitee(text: str, slug: str) -> list[dict]:
+    """Map a Recruitee /api/offers/ response to jobs."""
+    jobs = []
+    for offer in json.loads(text).get("offers", []):
+        url = offer.get("careers_url") or f"https://{slug}.recruitee.com/o/{offer.get('slug', '')}"
+        location = offer.get("location") or ", ".join(
+            part for part in (offer.get("city"), offer.get("country")) if part
+        )
+        if not in_netherlands(location, offer.get("remote", False)):
+            continue
+        description = "\n".join(
+            _plain(offer.get(field) or "") for field in ("description", "requirements")
+        ).strip()
+        jobs.append(_job(
+            url, offer.get("title", ""), offer.get("company_name") or slug, location,
+            description, offer.get("published_at", ""), "Recruitee",
+        ))
+    return jobs
+
+
+def parse_greenhouse(text: str, board: str) -> list[dict]:
+    """Map a Greenhouse job board API response (content=true) to jobs."""
+    jobs = []
+    for item in json.loads(text).get("jobs", []):
+        location = (item.get("location") or {}).get("name", "")
+        if not in_netherlands(location, "remote" in location.lower()):
+            continue
+        # Greenhouse returns the posting HTML entity-escaped
+        description = _plain(html.unescape(item.get("content") or ""))
+        jobs.append(_job(
+            item["absolute_url"], item.get("title", ""), item.get("company_name") or board,
+            location, description, item.get("updated_at", ""), "Greenhouse",
+        ))
+    return jobs
+
+
+def parse_workable(text: str, account: str) -> list[dict]:
+    """Map a Workable widget API response (details=true) to jobs."""
+    data = json.loads(text)
+    company = data.get("name") or account
+    jobs = []
+    for item in data.get("jobs", []):
+        location = ", ".join(part for part in (item.get("city"), item.get("country")) if part)
+        if not in_netherlands(location, item.get("telecommuting", False)):
+            continue
+        url = item.get("url") or f"https://apply.workable.com/{account}/j/{item.get('shortcode', '')}/"
+        jobs.append(_job(
+            url, item.get("title", ""), company, location, _plain(item.get("description") or ""),
+            item.get("published_on") or item.get("created_at", ""), "Workable",
+        ))
+    return jobs
+
+
+def parse_homerun(text: str, company: str) -> list[dict]:
+    """
+    Homerun has no public JSON feed: read schema.org JobPostings from the
+    careers page, or fall back to its vacancy links.
+    """
+    base = f"https://{company}.homerun.co/"
+    jobs = []
+    for block in json_ld_blocks(text):
+        for posting in find_objects(block, lambda d: d.get("@type") == "JobPosting"):
+            place = posting.get("jobLocation") or {}
+            if isinstance(place, list):
+                place = place[0] if place else {}
+            address = place.get("address") if isinstance(place, dict) else None
+            if not isinstance(address, dict):
+                address = {}
+            location = ", ".join(
+                part for part in (address.get("addressLocality"), address.get("addressCountry"))
+                if isinstance(part, str) and part
+            )
+            if not in_netherlands(location, posting.get("jobLocationType") == "TELECOMMUTE"):
+                continue
+            jobs.append(_job(
+                urljoin(base, posting.get("url", "")), posting.get("title", ""),
+                (posting.get("hiringOrganization") or {}).get("name") or company, location,
+                _plain(posting.get("description") or ""), posting.get("datePosted", ""), "Homerun",
+            ))
+    if jobs:
+        return jobs
+
+    seen = set()
+    for link in parse_document(text).select("a[href]"):
+        url = urljoin(base, link.get("href") or "").split("?")[0].rstrip("/")
+        parts = urlsplit(url)
+        path = parts.path.strip("/")
+        # Vacancy pages are https://<company>.homerun.co/<vacancy-slug>
+        if parts.netloc != urlsplit(base).netloc or not path or "/" in path or url in seen:
+            continue
+        seen.add(url)
+        title = link.text(" ").strip() or path.replace("-", " ")
+        job = _job(url, title, company, "", "", "", "Homerun")
+        del job["description_source"]  # let enrich.py fetch the vacancy page
+        jobs.append(job)
+    return jobs
+
+
+ATS_SOURCES = {
+    "recruitee": (lambda slug: f"https://{slug}.recruitee.com/api/offers/", None, parse_recruitee),
+    "greenhouse": (
+        lambda board: f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs",
+        {"content": "true"},
+        parse_greenhouse,
+    ),
+    "workable": (
+        lambda account: f"https://apply.workable.com/api/v1/widget/accounts/{account}",
+        {"details": "true"},
+        parse_workable,
+    ),
+    "homerun": (lambda company: f"https://{company}.homerun.co/", None, parse_homerun),
+}
+
+
+def poll_tenant(ats: str, tenant: str) -> list[dict]:
+    """Fetch one tenant's listing with a conditional GET and return its jobs."""
+    url_for, params, parse = ATS_SOURCES[ats]
+    try:
+        return fetch_cards(url_for(tenant), lambda text: parse(text, tenant), params=params)
+    except requests.RequestException as e:
+        print(f"    Error polling {ats} tenant {tenant}: {e}")
+    except (ValueError, KeyError, AttributeError) as e:
+        print(f"    Warning: unexpected {ats} response for {tenant}: {e}")
+    return []
+
+
+def poll_watchlist(watchlist: dict[str, list[str]], max_workers: int = MAX_WORKERS) -> list[dict]:
+    """Poll every tenant, one lane per host, at most `max_workers` hosts at a time."""
+    lanes: dict[str, list] = {}
+    for ats, tenants in watchlist.items():
+        if ats not in ATS_SOURCES:
+            continue
+        url_for = ATS_SOURCES[ats][0]
+        for tenant in tenants:
+            lanes.setdefault(host_of(url_for(tenant)), []).append(
+                lambda ats=ats, tenant=tenant: poll_tenant(ats, tenant)
+            )
+    results = run_lanes(lanes, max_workers)
+    return [job for lane in results.values() for jobs in lane for job in jobs]
+
+
+class OfferFingerprints:
+    """{job id: hash of title/location/description} of every polled offer."""
+
+    def __init__(self, path: Path = OFFERS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.hashes: dict[str, str] = {}
+        if path.exists():
+            try:
+                self.hashes = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                self.hashes = {}
+
+    @staticmethod
+    def fingerprint(job: dict) -> str:
+        content = "\x1f".join((job["title"], job["location"], job["description"]))
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def split(self, jobs: list[dict]) -> tuple[list[dict], list[dict]]:
+        """Partition jobs into (new, changed) and remember their fingerprints."""
+        new, changed = [], []
+        with self.lock:
+            for job in jobs:
+                digest = self.fingerprint(job)
+                previous = self.hashes.get(job["id"])
+                if previous == digest:
+                    continue
+                (new if previous is None else changed).append(job)
+                self.hashes[job["id"]] = digest
+        return new, changed
+
+    def save(self) -> None:
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.hashes, indent=2, sort_keys=True))
+
+
+def apply_changes(store: JobStore, changed: list[dict]) -> int:
+    """Write a new version of every changed offer that is in the store."""
+    updated = 0
+    for job in changed:
+        current = store.get(job["id"])
+        if current is None:
+            continue
+        store.update({**current, **{k: job[k] for k in ("title", "location", "description")}})
+        updated += 1
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll known ATS tenants for new vacancies")
+    parser.add_argument("--discover", action="store_true", help="Rescan scripts for tenants first")
+    parser.add_argument("--ats", action="append", choices=sorted(ATS_SOURCES), help="Only these platforms")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Hosts polled at once")
+    parser.add_argument("--dry-run", action="store_true", help="Print new/changed offers, no writes")
+    args = parser.parse_args()
+
+    watchlist = load_watchlist()
+    if args.discover or not any(watchlist.values()):
+        sources = sorted(SCRIPTS_DIR.glob("*.py")) + [DATA_DIR / "applications.json"]
+        discovered = discover_tenants(sources)
+        for ats, tenants in discovered.items():
+            watchlist[ats] = sorted(set(watchlist.get(ats, [])) | set(tenants))
+        save_watchlist(watchlist)
+        print(f"Watchlist: {', '.join(f'{len(t)} {ats}' for ats, t in watchlist.items())}")
+    if args.ats:
+        watchlist = {ats: tenants for ats, tenants in watchlist.items() if ats in args.ats}
+
+    cache = ResponseCache()
+    set_default_cache(cache)
+    print(f"Polling {sum(len(t) for t in watchlist.values())} ATS tenants...")
+    jobs = poll_watchlist(watchlist, args.workers)
+    cache.save()
+    print(f"{len(jobs)} offers in the Netherlands. Response cache: {cache.summary()}")
+
+    fingerprints = OfferFingerprints()
+    new, changed = fingerprints.split(jobs)
+    print(f"{len(new)} new, {len(changed)} changed offers")
+    if args.dry_run:
+        for label, group in (("new", new), ("changed", changed)):
+            for job in group:
+                print(f"  [{label}] {job['title']} @ {job['company']} ({job['location']})")
+        return
+
+    store = JobStore()
+    if new:
+        ingest_jobs(store, new)
+    if changed:
+        print(f"  Updated {apply_changes(store, changed)} changed offers in the store")
+    store.close()
+    fingerprints.save()
+
+
+if __name__ == "__main__":
+    main()
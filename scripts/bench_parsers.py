@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+HTML backend benchmark — card extraction speed and output parity.
+
+Runs every board snapshot in data/*.html that has a card parser (see
+REPLAY_PARSERS in search.py) through each installed HTML backend, reports
+cards/sec per backend and checks that every backend extracts exactly the
+same cards as the BeautifulSoup reference.
+
+Usage:
+    python3 scripts/bench_parsers.py
+    python3 scripts/bench_parsers.py --repeat 5 --dir data/
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import html_backend
+from search import DATA_DIR, iter_snapshot_files, replay_parser_for
+
+REFERENCE_BACKEND = "bs4"
+
+
+def extract_all(snapshots: list[tuple[str, str]], backend: str) -> tuple[dict, float]:
+    """Parse every snapshot with one backend. Returns ({name: cards}, seconds)."""
+    html_backend.set_default_backend(backend)
+    results = {}
+    start = time.perf_counter()
+    for name, text in snapshots:
+        _, parse = replay_parser_for(name)
+        results[name] = parse(text, "Eindhoven")
+    elapsed = time.perf_counter() - start
+    # scraped_at is a wall-clock timestamp, not parser output
+    for cards in results.values():
+        for card in cards:
+            card.pop("scraped_at", None)
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML backend benchmark")
+    parser.add_argument("--dir", type=str, default=str(DATA_DIR), help="Snapshot directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per backend")
+    args = parser.parse_args()
+
+    snapshots = [
+        (name, text) for name, text in iter_snapshot_files(Path(args.dir))
+        if replay_parser_for(name)
+    ]
+    if not snapshots:
+        print(f"ERROR: No board snapshots with a card parser found in {args.dir}")
+        sys.exit(1)
+    total_bytes = sum(len(text.encode()) for _, text in snapshots)
+    print(f"Corpus: {len(snapshots)} snapshots, {total_bytes / 1024:.0f} KB")
+    print(f"Backends: {', '.join(html_backend.available_backends())}\n")
+
+    reference, _ = extract_all(snapshots, REFERENCE_BACKEND)
+    card_count = sum(len(cards) for cards in reference.values())
+
+    mismatches = 0
+    print(f"{'backend':<12} {'best (s)':>9} {'cards/sec':>10} {'speedup':>8}  parity")
+    baseline = None
+    for backend in reversed(html_backend.available_backends()):
+        best = float("inf")
+        for _ in range(args.repeat):
+            results, elapsed = extract_all(snapshots, backend)
+            best = min(best, elapsed)
+
+        differing = [name for name in reference if results[name] != reference[name]]
+        mismatches += len(differing)
+        baseline = baseline or best
+        parity = "identical" if not differing else f"DIFFERS in {', '.join(differing)}"
+        print(
+            f"{backend:<12} {best:>9.3f} {card_count / best:>10.0f} "
+            f"{baseline / best:>7.1f}x  {parity}"
+        )
+
+    print(f"\n{card_count} cards per pass")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
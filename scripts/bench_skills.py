@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Skill extraction benchmark — jobs/sec and output parity.
+
+Compares score.extract_skills_from_text (one compiled single-pass regex) with
+the previous implementation, which ran re.search twice for every pattern in
+score.SKILL_PATTERNS. The corpus is synthetic and seeded: job texts built
+from skill mentions in their common spellings ("ASP.NET Core", ".netcore",
+"node.js", "full-stack", "REST  API", "a.netcore", ...) mixed with filler words. Every
+text must give the same skill set from both implementations.
+
+Usage:
+    python3 scripts/bench_skills.py
+    python3 scripts/bench_skills.py --jobs 20000 --seed 7
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from score import SKILL_PATTERNS, extract_skills_from_text
+
+MENTIONS = [
+    "C#", "c# developer", ".NET", "ASP.NET", "asp.net core", ".NET Core", ".netcore",
+    "VB.NET", "Python", "JavaScript", "TypeScript", "Java", "SQL", "PostgreSQL",
+    "postgres", "HTML", "CSS", "C++", "Go", "Rust", "Ruby on Rails", "PHP", "Kotlin",
+    "Swift", "R", "Scala", "React", "Angular", "Vue", "Node.js", "nodejs", "Flask",
+    "Django", "FastAPI", "Spring Boot", "Blazor", "Next.js", "Express", "Laravel",
+    "Docker", "Kubernetes", "k8s", "Azure", "AWS", "GCP", "Git", "GitHub", "CI/CD",
+    "Jenkins", "Terraform", "Linux", "Redis", "MongoDB", "Elasticsearch", "RabbitMQ",
+    "Kafka", "machine learning", "ML", "AI", "deep learning", "data science", "DevOps",
+    "Scrum", "Agile", "microservices", "REST API", "REST  APIs", "restapi", "GraphQL",
+    "IoT", "MES", "manufacturing", "automation", "SaaS", "full-stack", "Full Stack",
+    "fullstack",
+    # .net glued to a preceding word, with and without "core"
+    "a.netcore", "b.net core", "ado.net", "vb.net core", "x.NET  Core",
+]
+FILLER = (
+    "we are looking for a developer to join our team in eindhoven you will work on "
+    "modern systems with experience in and a strong focus on quality ownership "
+    "collaboration customers products platform hybrid salary benefits growth"
+).split()
+SEPARATORS = [" ", ", ", " / ", " (", ") ", ". ", "\n", " - "]
+
+
+def legacy_extract(text: str) -> set[str]:
+    """The previous implementation: two re.search calls per matching pattern."""
+    found = set()
+    text_lower = text.lower()
+    for pattern in SKILL_PATTERNS:
+        if re.search(pattern, text_lower):
+            match = re.search(pattern, text_lower)
+            if match:
+                found.add(match.group(0).strip())
+    return found
+
+
+def synthetic_corpus(jobs: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(jobs):
+        words = []
+        for _ in range(rng.randint(40, 160)):
+            if rng.random() < 0.12:
+                words.append(rng.choice(MENTIONS))
+            else:
+                words.append(rng.choice(FILLER))
+            words.append(rng.choice(SEPARATORS) if rng.random() < 0.2 else " ")
+        corpus.append("".join(words))
+    return corpus
+
+
+def timed(extract, corpus: list[str]) -> tuple[list[set], float]:
+    start = time.perf_counter()
+    results = [extract(text) for text in corpus]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill extraction benchmark")
+    parser.add_argument("--jobs", type=int, default=100_000, help="Synthetic jobs in the corpus")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus random seed")
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.jobs, args.seed)
+    total_chars = sum(len(text) for text in corpus)
+    print(f"Corpus: {len(corpus)} synthetic jobs, {total_chars / 1_000_000:.1f}M characters\n")
+
+    legacy, legacy_time = timed(legacy_extract, corpus)
+    single, single_time = timed(extract_skills_from_text, corpus)
+
+    print(f"{'matcher':<22} {'seconds':>8} {'jobs/sec':>10} {'speedup':>8}")
+    print(f"{'per-pattern re.search':<22} {legacy_time:>8.2f} {len(corpus) / legacy_time:>10.0f} {'1.0x':>8}")
+    print(
+        f"{'single-pass regex':<22} {single_time:>8.2f} {len(corpus) / single_time:>10.0f} "
+        f"{legacy_time / single_time:>7.1f}x"
+    )
+
+    differing = [i for i, (a, b) in enumerate(zip(legacy, single)) if a != b]
+    if differing:
+        i = differing[0]
+        print(f"\nERROR: {len(differing)} jobs differ, e.g. job {i}:")
+        print(f"  legacy only: {sorted(legacy[i] - single[i])}")
+        print(f"  single only: {sorted(single[i] - legacy[i])}")
+        sys.exit(1)
+    print("\nParity: identical skill sets for every job")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Persistent BM25 relevance index over job descriptions.
+
+score.py's skills component only knows the terms in SKILL_PATTERNS. This
+index ranks jobs by free-text relevance to the resume instead, so terms like
+"MES", "Locust" or "OPC UA" count as soon as they occur in both.
+
+- Every job's title, description and company are tokenized into an inverted
+  index: {term: {job id: term frequency}} plus per-job lengths.
+- The index is updated incrementally. A job is re-tokenized only when the
+  hash of its text changed, and jobs that left the store are removed.
+- The query is the resume: each term weighted 1 + log(tf), terms from the
+  "## Skills" section boosted by SKILLS_BOOST. The QUERY_TERMS terms with the
+  highest weight x IDF are kept.
+- Scoring walks only the postings of the query terms. The cost is the
+  number of postings of those terms, not jobs x terms.
+
+The result is a breakdown field ("relevance": BM25 score plus the
+best-matching terms). It does not change the 1-10 score. BM25 depends on
+the whole corpus (IDF, average length), so score.py recomputes it for every
+job on every run instead of caching it with the score.
+
+The index lives in data/bm25-index.json and is written once per run.
+
+Usage:
+    python3 scripts/bm25_index.py              # top 10 jobs in the index score.py maintains
+    python3 scripts/bm25_index.py --top 25
+    python3 scripts/bm25_index.py --query      # show the weighted resume query
+
+    from bm25_index import BM25Index, resume_query
+    index = BM25Index()
+    index.update(jobs)
+    relevance = index.relevance(resume_query(resume_text, index))   # {job id: {...}}
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+from job_store import JobStore
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PROFILE_DIR = BASE_DIR / "profile"
+INDEX_PATH = DATA_DIR / "bm25-index.json"
+
+K1 = 1.2
+B = 0.75
+QUERY_TERMS = 60
+SKILLS_BOOST = 2.0
+TOP_TERMS = 5  # matched terms listed in the breakdown
+
+_TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:[./\-][a-z0-9+#]+)*")
+STOPWORDS = set("""
+a an and are as at be been but by can for from has have in into is it its of on or our
+that the their this to was we were will with you your they them he she his her not all
+also any more most other some such than then there these those which who what when where
+how about over under via per etc
+de het een en van in op te met voor is zijn je jij wij we ons onze bij als aan om uit
+naar door of ook dat die dit er niet maar tot over nog wordt worden heb hebt heeft hebben
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased terms: words, versions and tech names like c#, .net, node.js, ci/cd."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = token.rstrip(".-/")
+        if len(token) > 1 and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def job_text(job: dict) -> str:
+    return f"{job.get('title') or ''} {job.get('description') or ''} {job.get('company') or ''}"
+
+
+class BM25Index:
+    """Inverted index {term: {job id: tf}} with job lengths and text hashes, persisted as JSON."""
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.postings: dict[str, dict[str, int]] = {}
+        self.lengths: dict[str, int] = {}
+        self.hashes: dict[str, str] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                data = {}
+            self.postings = data.get("postings", {})
+            self.lengths = data.get("lengths", {})
+            self.hashes = data.get("hashes", {})
+        self.total_length = sum(self.lengths.values())
+        self.job_terms: dict[str, set] = {}
+        for term, docs in self.postings.items():
+            for job_id in docs:
+                self.job_terms.setdefault(job_id, set()).add(term)
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def _remove(self, job_id: str) -> None:
+        self.total_length -= self.lengths.pop(job_id, 0)
+        self.hashes.pop(job_id, None)
+        for term in self.job_terms.pop(job_id, ()):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(job_id, None)
+                if not docs:
+                    del self.postings[term]
+
+    def update(self, jobs) -> int:
+        """Index new and changed jobs. Returns the number (re)indexed."""
+        indexed = 0
+        with self.lock:
+            for job in jobs:
+                job_id = job.get("id")
+                if not job_id:
+                    continue
+                text = job_text(job)
+                digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                if self.hashes.get(job_id) == digest:
+                    continue
+                if job_id in self.lengths:
+                    self._remove(job_id)
+                counts = Counter(tokenize(text))
+                for term, tf in counts.items():
+                    self.postings.setdefault(term, {})[job_id] = tf
+                self.job_terms[job_id] = set(counts)
+                length = sum(counts.values())
+                self.lengths[job_id] = length
+                self.total_length += length
+                self.hashes[job_id] = digest
+                indexed += 1
+        return indexed
+
+    def retain(self, job_ids: set) -> int:
+        """Remove jobs that are no longer in the store. Returns the number removed."""
+        with self.lock:
+            gone = [job_id for job_id in self.lengths if job_id not in job_ids]
+            for job_id in gone:
+                self._remove(job_id)
+        return len(gone)
+
+    def idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.lengths) - df + 0.5) / (df + 0.5))
+
+    def relevance(self, query: dict[str, float]) -> dict[str, dict]:
+        """
+        BM25 of every job that shares a term with the weighted query:
+        {job id: {"bm25": score, "terms": best-matching terms}}. Jobs missing
+        from the result share no term with the query.
+        """
+        with self.lock:
+            if not self.lengths:
+                return {}
+            avg_length = self.total_length / len(self.lengths)
+            contributions: dict[str, dict[str, float]] = {}
+            for term, weight in query.items():
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                idf = self.idf(term)
+                for job_id, tf in docs.items():
+                    norm = K1 * (1 - B + B * self.lengths[job_id] / avg_length)
+                    contributions.setdefault(job_id, {})[term] = weight * idf * tf * (K1 + 1) / (tf + norm)
+        return {
+            job_id: {
+                "bm25": round(sum(terms.values()), 2),
+                "terms": sorted(terms, key=terms.get, reverse=True)[:TOP_TERMS],
+            }
+            for job_id, terms in contributions.items()
+        }
+
+    def save(self) -> None:
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(
+                {"postings": self.postings, "lengths": self.lengths, "hashes": self.hashes},
+                ensure_ascii=False,
+            ))
+
+
+def resume_query(resume_text: str, index: BM25Index) -> dict[str, float]:
+    """
+    Weighted query terms from the resume: 1 + log(tf), x SKILLS_BOOST for
+    terms in the "## Skills" section, keeping the QUERY_TERMS indexed terms
+    with the highest weight x IDF.
+    """
+    counts = Counter(tokenize(resume_text))
+    skills = re.search(r"^## skills\s*$(.*?)(?=^## |\Z)", resume_text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+    skill_terms = set(tokenize(skills.group(1))) if skills else set()
+    weights = {
+        term: (1 + math.log(tf)) * (SKILLS_BOOST if term in skill_terms else 1.0)
+        for term, tf in counts.items()
+        if term in index.postings
+    }
+    best = sorted(weights, key=lambda term: weights[term] * index.idf(term), reverse=True)
+    return {term: weights[term] for term in best[:QUERY_TERMS]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 relevance of indexed jobs to the resume")
+    parser.add_argument("--top", type=int, default=10, help="Number of top matches to show")
+    parser.add_argument("--query", action="store_true", help="Show the weighted resume query")
+    args = parser.parse_args()
+
+    index = BM25Index()
+    if not len(index):
+        print("ERROR: relevance index is empty. Run score.py first.")
+        sys.exit(1)
+    print(f"Index: {len(index)} jobs, {len(index.postings)} terms")
+
+    query = resume_query((PROFILE_DIR / "resume.md").read_text(), index)
+    if args.query:
+        print("\nResume query (term: weight, idf):")
+        for term, weight in query.items():
+            print(f"  {term:<24} {weight:5.2f}  {index.idf(term):5.2f}")
+
+    relevance = index.relevance(query)
+    ranked = sorted(relevance.items(), key=lambda item: item[1]["bm25"], reverse=True)[:args.top]
+    store = JobStore()
+    try:
+        print(f"\nTop {len(ranked)} jobs by relevance to the resume:")
+        for job_id, match in ranked:
+            job = store.get(job_id) or {}
+            print(f"  [{match['bm25']:6.2f}] {job.get('title')} @ {job.get('company')}")
+            print(f"           {', '.join(match['terms'])}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Job URL canonicalization and clickout redirect resolution.
+
+Boards hand out the same posting under many URLs: tracking parameters
+(utm_*, trk, refId, ...), localized hosts and slugs (nl.linkedin.com/jobs/
+view/net-developer-at-x-123 vs www.linkedin.com/jobs/view/123), and
+aggregator clickouts that redirect to the real vacancy
+(englishjobsearch.nl/clickout/...). generate_job_id() hashes the canonical
+form, so all later stages key on one stable ID per posting.
+
+- canonicalize_url(url): offline. Lower-cases scheme/host, drops the fragment
+  and tracking/locale params, and applies per-board rules. A board URL without
+  any of the board's identifying params keeps its query.
+- resolve_clickouts(urls): sends a HEAD request for each clickout URL (behind
+  the per-host token buckets, but with a breaker of its own so rejected
+  clickouts never block the host's search pages) and follows the redirects.
+  Resolved targets are memoized in data/redirect-cache.json for
+  REDIRECT_TTL_DAYS under the clickout's canonical form (e.g. Indeed's ad=
+  key, not the per-impression tracking URL), so a clickout is resolved at
+  most once per TTL. ingest_id(url) uses the same cache to predict the id a
+  scraped URL will have once stored.
+
+Usage:
+    python3 scripts/canonical_url.py "https://nl.linkedin.com/jobs/view/x-123?trk=abc"
+    python3 scripts/canonical_url.py --resolve "https://englishjobsearch.nl/clickout/bf3bc3215f130198"
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote_plus, urlsplit, urlunsplit
+
+import requests
+
+from fetcher import fetch_head, host_of, run_lanes
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+REDIRECT_CACHE_PATH = DATA_DIR / "redirect-cache.json"
+
+REDIRECT_TTL_DAYS = 30
+
+# Query parameters that never identify a posting
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmi", "_ga",
+    "trk", "trkinfo", "trackingid", "refid", "ref", "src", "source", "from",
+    "lang", "language", "locale", "hl",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# Per-board rules: host suffix -> query params to keep (everything else is dropped)
+BOARD_KEEP_PARAMS = {
+    "indeed.com": {"jk", "vjk", "ad"},
+    "linkedin.com": set(),
+    "ictergezocht.nl": set(),
+    "werkenbij.nl": set(),
+    "nationalevacaturebank.nl": set(),
+    "jobbird.com": set(),
+    "recruitee.com": set(),
+}
+
+# URL patterns of aggregator clickouts that redirect to the real vacancy
+CLICKOUT_PATTERNS = [
+    re.compile(r"^https?://(www\.)?englishjobsearch\.nl/clickout/"),
+    re.compile(r"^https?://[^/]*indeed\.com/(rc/clk|pagead/clk)"),
+    re.compile(r"^https?://(www\.)?adzuna\.nl/land/ad/"),
+    re.compile(r"^https?://[^/]*jooble\.org/(desc|away)/"),
+]
+
+_LINKEDIN_VIEW_RE = re.compile(r"^/jobs/view/(?:[^/]*?-)?(\d{6,})/?$")
+
+
+def _board_rule(host: str):
+    for suffix, keep in BOARD_KEEP_PARAMS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return suffix, keep
+    return None, None
+
+
+def canonicalize_url(url: str) -> str:
+    """Return the canonical form of a job URL (offline, no redirects followed)."""
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    host = parts.netloc.lower()
+    if host.endswith(":443") or host.endswith(":80"):
+        host = host.rsplit(":", 1)[0]
+    path = parts.path or "/"
+    board, keep = _board_rule(host)
+
+    if board == "linkedin.com":
+        # Localized hosts and title slugs all point at the same numeric job id
+        match = _LINKEDIN_VIEW_RE.match(path)
+        if match:
+            return f"https://www.linkedin.com/jobs/view/{match.group(1)}/"
+        host = "www.linkedin.com"
+
+    if board == "indeed.com" and path in ("/viewjob", "/rc/clk", "/pagead/clk"):
+        query = dict(parse_qsl(parts.query))
+        job_key = query.get("jk") or query.get("vjk")
+        if job_key:
+            return f"https://{host}/viewjob?jk={job_key}"
+
+    # Filter the raw query pieces so kept params keep their exact encoding
+    # (and bare flags like "?some-slug" stay without "=")
+    pieces = [(piece, unquote_plus(piece.split("=", 1)[0]).lower()) for piece in parts.query.split("&") if piece]
+    if keep and not any(key in keep for _, key in pieces):
+        # None of the board's identifying params (e.g. an Indeed clickout
+        # with neither jk nor ad): keep the query, or every such link would
+        # collapse into one URL and one job id
+        keep = None
+    query = []
+    for piece, key in pieces:
+        if keep is not None:
+            if key in keep:
+                query.append(piece)
+        elif key not in TRACKING_PARAMS and not key.startswith(TRACKING_PREFIXES):
+            query.append(piece)
+    query.sort()
+
+    return urlunsplit(("https", host, path, "&".join(query), ""))
+
+
+def is_clickout(url: str) -> bool:
+    """
+    True for aggregator redirects that need a HEAD request to identify the
+    posting. Indeed rc/clk links with a job key are not: they canonicalize
+    offline to viewjob?jk=.
+    """
+    if not any(pattern.match(url) for pattern in CLICKOUT_PATTERNS):
+        return False
+    return "/viewjob?jk=" not in canonicalize_url(url)
+
+
+class RedirectCache:
+    """
+    Persistent {clickout: {"target": url, "resolved_at": ts}} with a TTL.
+    Entries are keyed by canonicalize_url(clickout), which drops the
+    per-impression tracking params, so the same ad seen again is a hit.
+    """
+
+    def __init__(self, path: Path = REDIRECT_CACHE_PATH, ttl_days: float = REDIRECT_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.lock = threading.Lock()
+        self.entries: dict[str, dict] = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                self.entries = {}
+
+    def get(self, url: str) -> str | None:
+        with self.lock:
+            entry = self.entries.get(canonicalize_url(url))
+        if entry and time.time() - entry.get("resolved_at", 0) < self.ttl:
+            return entry["target"]
+        return None
+
+    def put(self, url: str, target: str) -> None:
+        with self.lock:
+            self.entries[canonicalize_url(url)] = {"target": target, "resolved_at": time.time()}
+
+    def save(self) -> None:
+        cutoff = time.time() - self.ttl
+        with self.lock:
+            self.entries = {
+                k: v for k, v in self.entries.items() if v.get("resolved_at", 0) >= cutoff
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.entries, indent=2, ensure_ascii=False))
+
+
+_default_redirects: RedirectCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_redirects() -> RedirectCache:
+    """The process-wide redirect cache, loaded on first use."""
+    global _default_redirects
+    with _default_lock:
+        if _default_redirects is None:
+            _default_redirects = RedirectCache()
+        return _default_redirects
+
+
+def ingest_id(url: str, cache: RedirectCache | None = None) -> str:
+    """
+    The id a scraped URL will have in the store: that of its cached clickout
+    target, else that of its canonical form (a clickout not resolved yet
+    keeps its parse-time id).
+    """
+    from job_store import generate_job_id
+
+    if cache is None:
+        cache = default_redirects()
+    target = cache.get(url) if is_clickout(url) else None
+    return generate_job_id(target or url)
+
+
+def resolve_clickouts(urls, cache: RedirectCache | None = None) -> dict[str, str]:
+    """
+    Resolve clickout URLs to their canonical final targets. Only cache misses
+    hit the network (one lane per clickout host). Returns {clickout: target}.
+    Unresolvable clickouts are left out of the result.
+    """
+    if cache is None:
+        cache = default_redirects()
+    resolved: dict[str, str] = {}
+    lanes: dict[str, list] = {}
+
+    for url in dict.fromkeys(u for u in urls if is_clickout(u)):
+        cached = cache.get(url)
+        if cached:
+            resolved[url] = cached
+            continue
+
+        def resolve(url=url):
+            try:
+                target = canonicalize_url(fetch_head(url, breaker_key=f"{host_of(url)} clickouts"))
+            except requests.RequestException as e:
+                print(f"    Warning: Could not resolve clickout {url}: {e}")
+                return url, None
+            cache.put(url, target)
+            return url, target
+
+        lanes.setdefault(host_of(url), []).append(resolve)
+
+    for results in run_lanes(lanes).values():
+        for url, target in results:
+            if target:
+                resolved[url] = target
+    return resolved
+
+
+def canonicalize_jobs(jobs: list[dict], resolve: bool = True,
+                      cache: RedirectCache | None = None) -> list[dict]:
+    """
+    Rewrite each job's url to its canonical form (resolving clickouts when
+    `resolve` is set) and recompute its id from it. The original URL is kept
+    in "raw_url" when it changed.
+    """
+    from job_store import generate_job_id
+
+    targets = {}
+    if resolve:
+        if cache is None:
+            cache = default_redirects()
+        targets = resolve_clickouts((job.get("url", "") for job in jobs), cache)
+        cache.save()
+
+    for job in jobs:
+        raw = job.get("url", "")
+        if not raw:
+            continue
+        # Clickouts with an offline job key form are never in targets (see
+        # is_clickout), so their ids match the ones parsers assign at parse time
+        canonical = targets.get(raw) or canonicalize_url(raw)
+        if canonical != raw:
+            job.setdefault("raw_url", raw)
+            job["url"] = canonical
+        job["id"] = generate_job_id(canonical)
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Canonicalize job URLs")
+    parser.add_argument("urls", nargs="+", help="URLs to canonicalize")
+    parser.add_argument("--resolve", action="store_true", help="Resolve clickout redirects")
+    args = parser.parse_args()
+
+    targets = {}
+    if args.resolve:
+        cache = default_redirects()
+        targets = resolve_clickouts(args.urls, cache)
+        cache.save()
+    for url in args.urls:
+        print(f"{url}\n  -> {targets.get(url) or canonicalize_url(url)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Cross-board near-duplicate detection with MinHash + LSH.
+
+The same vacancy shows up on LinkedIn, Indeed, ICTerGezocht and agency
+clickout URLs, so exact-URL dedupe lets it through several times. Every job
+gets two MinHash signatures:
+
+- identity: character 4-grams of the normalized "title company" (none when
+  the title is empty or the company unknown; such jobs are never merged)
+- content:  word 3-grams of the description (when there is one)
+
+Both signatures are split into LSH bands. Jobs that share a band bucket are
+candidates, so only a handful of jobs are compared per new job no matter how
+large the history is. A candidate is a duplicate when its estimated identity
+similarity is >= IDENTITY_THRESHOLD and, if both jobs have a description, the
+estimated containment of the shorter description in the longer one is
+>= CONTENT_THRESHOLD. Containment is used instead of Jaccard because one board
+often shows a snippet while another shows the full text. Candidates without a description
+match on identity alone, but only if no other candidate in the same cluster
+fails the content check.
+
+The first job of a cluster is its canonical record. Its id is the cluster ID,
+and it collects every source URL in "source_urls". Duplicates are still stored,
+but carry "cluster_id" pointing at the canonical record, so score.py scores
+each cluster once.
+
+The bucket index is append-only, like the job store: data/jobs/lsh.tsv holds
+one "job_id <TAB> cluster_id <TAB> band keys" line per job. Candidate
+signatures are recomputed from the store on demand, so no signatures are kept
+on disk.
+"""
+
+import hashlib
+import re
+import zlib
+from pathlib import Path
+
+from job_store import STORE_DIR, JobStore, generate_job_id
+
+LSH_INDEX_PATH = STORE_DIR / "lsh.tsv"
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # 8 rows: ~95% recall at similarity 0.8, ~6% at 0.5
+IDENTITY_THRESHOLD = 0.8
+CONTENT_THRESHOLD = 0.5
+MAX_CANDIDATES = 50  # upper bound on comparisons per new job
+MAX_DESCRIPTION_WORDS = 300
+UNKNOWN_COMPANIES = {"", "unknown"}  # normalized placeholders the scrapers use
+
+_MASK64 = (1 << 64) - 1
+_EMPTY = 1 << 64
+
+
+# Gender/audience markers that boards append to titles, e.g. "(m/v/x)", "(m/f/d)"
+_MARKER_RE = re.compile(r"\(\s*[mvfwxd](?:\s*/\s*[mvfwxd])+\s*\)")
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize(text: str) -> str:
+    """Lower-case, drop gender markers and punctuation, collapse whitespace."""
+    text = _MARKER_RE.sub(" ", (text or "").lower())
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def _hash(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def identity_shingles(job: dict) -> set[int]:
+    """
+    Character 4-grams of "title company". Empty when the title is empty or the
+    company is missing/"Unknown": the same title at two unknown companies says
+    nothing about whether they are the same vacancy.
+    """
+    title = normalize(job.get("title", ""))
+    company = normalize(job.get("company", ""))
+    if not title or company in UNKNOWN_COMPANIES:
+        return set()
+    text = f"{title} {company}"
+    return {_hash(text[i:i + 4]) for i in range(len(text) - 3)}
+
+
+def description_shingles(job: dict) -> set[int]:
+    words = normalize(job.get("description", "")).split()[:MAX_DESCRIPTION_WORDS]
+    return {_hash(" ".join(words[i:i + 3])) for i in range(len(words) - 2)}
+
+
+def _mix(h: int) -> int:
+    """64-bit finalizer (splitmix64) so crc32 values spread over all bins."""
+    h = (h + 0x9E3779B97F4A7C15) & _MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return h ^ (h >> 31)
+
+
+def minhash(shingles: set[int]) -> list[int]:
+    """
+    One-permutation MinHash: hash every shingle once, use the low bits to pick
+    one of NUM_PERM bins and keep the minimum of the high bits per bin. Empty
+    bins borrow from the next non-empty bin to the right (rotation
+    densification), which keeps the estimates valid for LSH. That costs one
+    pass over the shingles instead of NUM_PERM passes.
+    """
+    sig = [_EMPTY] * NUM_PERM
+    for h in shingles:
+        v = _mix(h)
+        b = v % NUM_PERM
+        r = v // NUM_PERM
+        if r < sig[b]:
+            sig[b] = r
+    if _EMPTY in sig:
+        filled = [i for i, v in enumerate(sig) if v != _EMPTY]
+        if filled:
+            dense = list(sig)
+            for i in range(NUM_PERM):
+                if sig[i] == _EMPTY:
+                    distance = 1
+                    while sig[(i + distance) % NUM_PERM] == _EMPTY:
+                        distance += 1
+                    dense[i] = sig[(i + distance) % NUM_PERM] + distance * _EMPTY
+            sig = dense
+    return sig
+
+
+def signatures(job: dict) -> tuple:
+    """
+    (identity signature, content signature, content shingle count). The
+    identity signature is None without a usable title and company, the content
+    signature is None when the job has no description.
+    """
+    ident = identity_shingles(job)
+    desc = description_shingles(job)
+    return (minhash(ident) if ident else None), (minhash(desc) if desc else None), len(desc)
+
+
+def similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def containment(sig_a: list[int], size_a: int, sig_b: list[int], size_b: int) -> float:
+    """Estimated share of the smaller shingle set that is contained in the larger one."""
+    jaccard = similarity(sig_a, sig_b)
+    intersection = jaccard * (size_a + size_b) / (1 + jaccard)
+    return intersection / max(min(size_a, size_b), 1)
+
+
+def band_keys(prefix: str, signature: list[int]) -> list[str]:
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(repr(rows).encode(), digest_size=6).hexdigest()
+        keys.append(f"{prefix}{band}:{digest}")
+    return keys
+
+
+class NearDuplicateIndex:
+    """LSH bucket index over the job store; see module docstring."""
+
+    def __init__(self, store: JobStore, path: Path = LSH_INDEX_PATH):
+        self.store = store
+        self.path = path
+        self.buckets: dict[str, list[str]] = {}
+        self.clusters: dict[str, str] = {}  # job id -> cluster id
+        self._signatures: dict[str, tuple] = {}  # per-run cache of computed signatures
+        self._file = None
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 3:
+                    continue
+                job_id, cluster_id, keys = parts
+                self.clusters[job_id] = cluster_id
+                for key in keys.split():
+                    self.buckets.setdefault(key, []).append(job_id)
+
+    def __len__(self) -> int:
+        return len(self.clusters)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.clusters
+
+    def _candidates(self, keys: list[str]) -> list[str]:
+        seen = set()
+        ordered = []
+        for key in keys:
+            for job_id in self.buckets.get(key, ()):
+                if job_id not in seen:
+                    seen.add(job_id)
+                    ordered.append(job_id)
+        return ordered
+
+    def _signatures_for(self, job_id: str):
+        sigs = self._signatures.get(job_id)
+        if sigs is None:
+            job = self.store.get(job_id)
+            sigs = signatures(job) if job else None
+            self._signatures[job_id] = sigs
+        return sigs
+
+    def _match(self, ident: list[int] | None, content: list[int] | None, size: int,
+               candidates: list[str]):
+        """
+        Return the cluster the job belongs to, or None. A cluster matches when
+        one of its candidates passes the identity check and none of its
+        candidates with a description fails the content check. A posting
+        without a description can't pull a different role into its cluster.
+        """
+        if ident is None:
+            return None
+        passed: list[str] = []
+        vetoed: set[str] = set()
+        for candidate_id in candidates[:MAX_CANDIDATES]:
+            sigs = self._signatures_for(candidate_id)
+            if sigs is None:
+                continue
+            other_ident, other_content, other_size = sigs
+            if other_ident is None or similarity(ident, other_ident) < IDENTITY_THRESHOLD:
+                continue
+            cluster_id = self.clusters.get(candidate_id, candidate_id)
+            if content is not None and other_content is not None and \
+                    containment(content, size, other_content, other_size) < CONTENT_THRESHOLD:
+                vetoed.add(cluster_id)
+            else:
+                passed.append(cluster_id)
+        for cluster_id in passed:
+            if cluster_id not in vetoed:
+                return cluster_id
+        return None
+
+    def assign(self, job: dict) -> str:
+        """
+        Find the cluster for a job, record it in the index and return the
+        cluster ID (the job's own id when it starts a new cluster).
+        """
+        job_id = job.setdefault("id", generate_job_id(job["url"]))
+        if job_id in self.clusters:
+            return self.clusters[job_id]
+
+        ident, content, size = signatures(job)
+        self._signatures[job_id] = (ident, content, size)
+        keys = (band_keys("i", ident) if ident else []) + (band_keys("c", content) if content else [])
+
+        candidates = [c for c in self._candidates(keys) if c != job_id]
+        cluster_id = self._match(ident, content, size, candidates) or job_id
+
+        self.clusters[job_id] = cluster_id
+        for key in keys:
+            self.buckets.setdefault(key, []).append(job_id)
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(f"{job_id}\t{cluster_id}\t{' '.join(keys)}\n")
+        return cluster_id
+
+    def close(self) -> None:
+        """Close the index file. The buckets stay loaded, so the index can be reused."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._signatures = {}  # stored jobs may change (enrichment) before the next use
+
+
+def add_source(canonical: dict, job: dict) -> bool:
+    """Record a duplicate's URL/board on its canonical job. Returns True if changed."""
+    urls = canonical.setdefault("source_urls", [canonical["url"]])
+    sources = canonical.setdefault("sources", [canonical.get("source", "")])
+    if job["url"] in urls:
+        return False
+    urls.append(job["url"])
+    if job.get("source", "") not in sources:
+        sources.append(job.get("source", ""))
+    return True
+
+
+def cluster_and_store(store: JobStore, index: NearDuplicateIndex, jobs) -> tuple[list[dict], int]:
+    """
+    Add new jobs to the store, clustering each against everything stored so
+    far (including earlier jobs of the same batch). Returns (added, duplicates).
+    """
+    added = []
+    duplicates = 0
+    for job in jobs:
+        if not job.get("url") or store.has_url(job["url"]):
+            continue
+        cluster_id = index.assign(job)
+        job["cluster_id"] = cluster_id
+        if cluster_id == job["id"]:
+            job["source_urls"] = [job["url"]]
+            job["sources"] = [job.get("source", "")]
+        else:
+            duplicates += 1
+            canonical = store.get(cluster_id)
+            if canonical and add_source(canonical, job):
+                store.update(canonical)
+        added.extend(store.add([job]))
+    return added, duplicates
+
+
+def backfill(store: JobStore, index: NearDuplicateIndex) -> int:
+    """Cluster stored jobs that predate the index. Returns the number indexed."""
+    pending = [job for job in store.iter_jobs() if job["id"] not in index]
+    for job in pending:
+        cluster_id = index.assign(job)
+        if cluster_id != job["id"]:
+            canonical = store.get(cluster_id)
+            if canonical and add_source(canonical, job):
+                store.update(canonical)
+        if job.get("cluster_id") != cluster_id:
+            job["cluster_id"] = cluster_id
+            store.update(job)
+    return len(pending)
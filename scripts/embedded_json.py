@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Extract the data blobs that server-rendered job boards embed in their HTML.
+
+Many "JS-heavy" boards send the listing data along with the page: the
+browser only turns it into markup. Reading the blobs straight from a plain
+HTTP response skips the browser entirely. Supported containers:
+
+- Next.js pages router:  <script id="__NEXT_DATA__" type="application/json">
+- Next.js app router:    self.__next_f.push([1, "..."]) flight chunks
+- Redux-style state:     window.__PRELOADED_STATE__[...] = {...};
+                         window.__INITIAL_STATE__ = {...};
+- schema.org:            <script type="application/ld+json">
+
+embedded_blobs(html) yields every decoded blob. find_objects() walks them
+for dicts that look like listings.
+
+Usage:
+    python3 scripts/embedded_json.py stepstone_python_v2.html    # summarize a saved page
+
+    from embedded_json import embedded_blobs, find_objects
+    for blob in embedded_blobs(html):
+        for item in find_objects(blob, lambda d: "title" in d and "url" in d):
+            ...
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+_NEXT_DATA_RE = re.compile(
+    r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL
+)
+_NEXT_F_RE = re.compile(r"self\.__next_f\.push\((\[.*?\])\)</script>", re.DOTALL)
+_STATE_RE = re.compile(
+    r"window\.__(?:PRELOADED|INITIAL|APOLLO)_STATE__(?:\[[^\]]*\])?\s*=\s*"
+)
+_JSON_LD_RE = re.compile(
+    r"<script[^>]+application/ld\+json[^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL
+)
+_FLIGHT_ROW_RE = re.compile(rb"([0-9a-f]+):")
+
+_decoder = json.JSONDecoder()
+
+
+def json_ld_blocks(html: str):
+    """Yield every parseable JSON-LD payload on the page."""
+    for match in _JSON_LD_RE.finditer(html):
+        raw = match.group(1).strip()
+        # Some sites wrap the payload in //<![CDATA[ ... //]]>
+        raw = raw.removeprefix("//<![CDATA[").removesuffix("//]]>").strip()
+        try:
+            yield json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+
+
+def next_data(html: str):
+    """The __NEXT_DATA__ payload of a Next.js pages-router page, or None."""
+    match = _NEXT_DATA_RE.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return None
+
+
+def flight_payload(html: str) -> bytes:
+    """Concatenated React flight stream from self.__next_f.push chunks."""
+    parts = []
+    for match in _NEXT_F_RE.finditer(html):
+        try:
+            chunk = json.loads(match.group(1))
+        except json.JSONDecodeError:
+            continue
+        if len(chunk) == 2 and chunk[0] == 1 and isinstance(chunk[1], str):
+            parts.append(chunk[1])
+    return "".join(parts).encode("utf-8")
+
+
+def flight_rows(payload: bytes):
+    """
+    Yield the JSON rows of a flight stream. Rows are "<hex id>:<json>\\n";
+    text rows are "<hex id>:T<hex byte length>,<text>" without a newline, and
+    module/hint rows ("I[...]", "HL[...]") carry no data and are skipped.
+    """
+    pos = 0
+    size = len(payload)
+    while pos < size:
+        match = _FLIGHT_ROW_RE.match(payload, pos)
+        if not match:
+            end = payload.find(b"\n", pos)
+            pos = size if end == -1 else end + 1
+            continue
+        pos = match.end()
+        if payload[pos:pos + 1] == b"T":
+            comma = payload.find(b",", pos)
+            if comma == -1:
+                break
+            pos = comma + 1 + int(payload[pos + 1:comma] or b"0", 16)
+            continue
+        end = payload.find(b"\n", pos)
+        if end == -1:
+            end = size
+        row = payload[pos:end]
+        pos = end + 1
+        if row[:1] in (b"[", b"{", b'"'):
+            try:
+                yield json.loads(row)
+            except json.JSONDecodeError:
+                continue
+
+
+def assigned_states(html: str):
+    """Yield objects assigned to window.__PRELOADED_STATE__ and friends."""
+    for match in _STATE_RE.finditer(html):
+        try:
+            value, _ = _decoder.raw_decode(html, match.end())
+        except json.JSONDecodeError:
+            continue
+        yield value
+
+
+def embedded_blobs(html: str):
+    """Yield every embedded data blob found on the page."""
+    data = next_data(html)
+    if data is not None:
+        yield data
+    yield from assigned_states(html)
+    yield from flight_rows(flight_payload(html))
+    yield from json_ld_blocks(html)
+
+
+def find_objects(data, predicate):
+    """Depth-first walk yielding every dict for which predicate(dict) is true."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if predicate(node):
+                yield node
+                continue
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the data blobs embedded in a page")
+    parser.add_argument("path", type=Path, help="Saved HTML page")
+    args = parser.parse_args()
+
+    html = args.path.read_text(errors="replace")
+    payload = flight_payload(html)
+    print(f"__NEXT_DATA__: {'yes' if next_data(html) is not None else 'no'}")
+    print(f"Assigned states: {sum(1 for _ in assigned_states(html))}")
+    print(f"Flight stream: {len(payload)} bytes, {sum(1 for _ in flight_rows(payload))} JSON rows")
+    print(f"JSON-LD blocks: {sum(1 for _ in json_ld_blocks(html))}")
+
+
+if __name__ == "__main__":
+    main()
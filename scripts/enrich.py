@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Detail-page enrichment: replace the search-card snippet in `description`
+with the full vacancy text from the job's own detail page.
+
+Only new, canonical jobs are fetched (near-duplicates share their canonical
+record's text). Detail pages are fetched concurrently through the shared
+fetcher: one lane per host, behind that host's token bucket. Every download
+is recorded in data/detail-cache.jsonl, keyed by canonical job ID, so a
+detail page is fetched at most once. Re-running enrichment, or meeting the
+same posting again, is served from the cache.
+
+The description is taken from the page's JSON-LD JobPosting when present,
+otherwise from the first known description container on the page.
+
+Usage:
+    python3 scripts/enrich.py                # enrich stored jobs that have no cached detail yet
+    python3 scripts/enrich.py --limit 50
+    python3 scripts/enrich.py --stats
+
+    from enrich import enrich_jobs
+    enrich_jobs(store, added_jobs)
+"""
+
+import argparse
+import html as html_lib
+import json
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from embedded_json import json_ld_blocks
+from fetcher import fetch, host_of, run_lanes
+from html_backend import parse_document
+from job_store import JobStore
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+DETAIL_CACHE_PATH = DATA_DIR / "detail-cache.jsonl"
+
+MAX_DESCRIPTION_CHARS = 10000
+MIN_DESCRIPTION_CHARS = 200  # shorter matches are navigation/teasers, not the vacancy text
+
+# HTTP statuses that mean the detail page is gone for good; cached as empty
+GONE_STATUSES = {404, 410}
+
+# Description containers, most specific first
+DESCRIPTION_SELECTORS = [
+    "#jobDescriptionText",                    # Indeed
+    "div.show-more-less-html__markup",        # LinkedIn guest view
+    "div.description__text",                  # LinkedIn
+    "[itemprop=description]",
+    "div.vacancy-description",
+    "div.job-description",
+    "div.vacancy-text",
+    "article",
+    "main",
+]
+
+
+def _clean(text: str) -> str:
+    return " ".join(text.split())[:MAX_DESCRIPTION_CHARS]
+
+
+def _job_postings(data):
+    """Yield every JobPosting object in a JSON-LD payload (lists and @graph included)."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _job_postings(item)
+    elif isinstance(data, dict):
+        kind = data.get("@type")
+        if kind == "JobPosting" or (isinstance(kind, list) and "JobPosting" in kind):
+            yield data
+        yield from _job_postings(data.get("@graph"))
+
+
+def json_ld_description(page: str) -> str:
+    """Description of the first JSON-LD JobPosting on the page, as plain text."""
+    for data in json_ld_blocks(page):
+        for posting in _job_postings(data):
+            description = posting.get("description")
+            if not isinstance(description, str) or not description.strip():
+                continue
+            if "&lt;" in description:
+                description = html_lib.unescape(description)
+            if "<" in description:
+                description = parse_document(description).text(" ")
+            return _clean(description)
+    return ""
+
+
+def extract_description(page: str) -> str:
+    """Full vacancy text from a detail page, or "" when none is found."""
+    description = json_ld_description(page)
+    if description:
+        return description
+    doc = parse_document(page)
+    for css in DESCRIPTION_SELECTORS:
+        el = doc.select_one(css)
+        if el is None:
+            continue
+        text = _clean(el.text(" "))
+        if len(text) >= MIN_DESCRIPTION_CHARS:
+            return text
+    return ""
+
+
+class DetailCache:
+    """Append-only {job id: {url, description, status, fetched_at}} log."""
+
+    def __init__(self, path: Path = DETAIL_CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries: dict[str, dict] = {}
+        self._file = None
+        if path.exists():
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn write from an interrupted run
+                    self.entries[entry["id"]] = entry
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.entries
+
+    def get(self, job_id: str) -> dict | None:
+        return self.entries.get(job_id)
+
+    def put(self, job_id: str, url: str, description: str, status: int) -> None:
+        entry = {
+            "id": job_id,
+            "url": url,
+            "description": description,
+            "status": status,
+            "fetched_at": time.time(),
+        }
+        with self.lock:
+            self.entries[job_id] = entry
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.path.open("a", encoding="utf-8")
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def fetch_detail(job: dict) -> tuple[str, int] | None:
+    """
+    Download a job's detail page. Returns (description, status), or None on a
+    transient failure that should be retried on a later run.
+    """
+    try:
+        resp = fetch(job["url"])
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else 0
+        if status in GONE_STATUSES:
+            return "", status
+        print(f"    Warning: Detail page for {job['url']} returned {status}")
+        return None
+    except requests.RequestException as e:
+        print(f"    Warning: Could not fetch detail page {job['url']}: {e}")
+        return None
+    return extract_description(resp.text), resp.status_code
+
+
+def enrich_jobs(store: JobStore, jobs, cache: DetailCache | None = None) -> dict:
+    """
+    Fill in full descriptions for the given stored jobs and append the updated
+    versions to the store. Cached pages are reused; the rest are fetched in
+    per-host lanes. Returns counters: enriched, cached, fetched, failed.
+    """
+    own_cache = cache is None
+    if own_cache:
+        cache = DetailCache()
+    stats = {"enriched": 0, "cached": 0, "fetched": 0, "failed": 0}
+
+    pending: dict[str, str] = {}  # job id -> url
+    for job in jobs:
+        job_id = job.get("id")
+        url = job.get("url", "")
+        if not job_id or not url.startswith("http"):
+            continue
+        if job.get("cluster_id", job_id) != job_id:
+            continue  # near-duplicate: the canonical record carries the text
+        if job.get("description_source"):
+            continue  # already has its full text (API boards, earlier enrichment)
+        pending[job_id] = url
+
+    descriptions: dict[str, str] = {}
+    lanes: dict[str, list] = {}
+    for job_id, url in pending.items():
+        entry = cache.get(job_id)
+        if entry is not None:
+            stats["cached"] += 1
+            descriptions[job_id] = entry["description"]
+            continue
+        lanes.setdefault(host_of(url), []).append(
+            lambda job_id=job_id, url=url: (job_id, url, fetch_detail({"url": url}))
+        )
+
+    for results in run_lanes(lanes).values():
+        for job_id, url, result in results:
+            if result is None:
+                stats["failed"] += 1
+                continue
+            description, status = result
+            stats["fetched"] += 1
+            cache.put(job_id, url, description, status)
+            descriptions[job_id] = description
+
+    for job_id, description in descriptions.items():
+        # Re-read the latest version: clustering may have updated it since
+        job = store.get(job_id)
+        if job is None or job.get("description_source"):
+            continue
+        if len(description) <= len(job.get("description") or ""):
+            continue
+        job["description"] = description
+        job["description_source"] = "detail"
+        store.update(job)
+        stats["enriched"] += 1
+
+    if own_cache:
+        cache.close()
+    return stats
+
+
+def stats_summary(stats: dict) -> str:
+    return (
+        f"{stats['enriched']} enriched ({stats['cached']} from cache, "
+        f"{stats['fetched']} fetched, {stats['failed']} failed)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job detail page enrichment")
+    parser.add_argument("--limit", type=int, help="Fetch at most this many uncached detail pages")
+    parser.add_argument("--stats", action="store_true", help="Print detail cache statistics")
+    args = parser.parse_args()
+
+    cache = DetailCache()
+    if args.stats:
+        with_text = sum(1 for entry in cache.entries.values() if entry["description"])
+        print(f"Cached detail pages: {len(cache)} ({with_text} with a description)")
+        return
+
+    store = JobStore()
+    jobs = [
+        job for job in store.iter_jobs()
+        if not job.get("description_source") and job["id"] not in cache
+    ]
+    if args.limit is not None:
+        jobs = jobs[:args.limit]
+    print(f"Enriching {len(jobs)} stored jobs...")
+    stats = enrich_jobs(store, jobs, cache)
+    cache.close()
+    store.close()
+    print(f"Detail pages: {stats_summary(stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Streaming RSS 2.0 / Atom feed adapter for job boards.
+
+Polling a board's feed is far cheaper than fetching and parsing its HTML search
+pages. The feed is parsed incrementally with ElementTree.iterparse straight
+from the (decompressed) response stream. Each <item>/<entry> is mapped to the
+search.py job schema as soon as it is complete, and is then cleared together
+with the reference the root keeps to it, so memory use does not grow with the
+feed size. Feeds go through http_cache.fetch_cards like the HTML boards, so
+unchanged feeds are a conditional GET answered with 304 and no parsing.
+
+Usage:
+    python3 scripts/feeds.py data/indeed_rss.xml                       # parse a saved feed
+    python3 scripts/feeds.py "https://nl.indeed.com/rss?q=python&l=Eindhoven"
+
+    from feeds import scrape_feed
+    jobs = scrape_feed(url, "Indeed NL", location)
+"""
+
+import argparse
+import re
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import requests
+
+from html_backend import parse_document
+from http_cache import fetch_cards
+from job_store import generate_job_id
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+# RSS titles of the form "Title - Company - Location" (Indeed and most aggregators)
+_TITLE_PARTS_RE = re.compile(r"^(.+?) - (.+) - ([^-]+)$")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(el) -> str:
+    return (el.text or "").strip() if el is not None else ""
+
+
+def _plain(html: str) -> str:
+    return parse_document(html).text(" ") if "<" in html else html.strip()
+
+
+def _date(value: str) -> str:
+    """ISO date from an RFC 822 (RSS) or ISO 8601 (Atom) timestamp."""
+    if not value:
+        return ""
+    try:
+        return parsedate_to_datetime(value).date().isoformat()
+    except (TypeError, ValueError):
+        return value[:10]
+
+
+def _rss_entry(item) -> dict:
+    return {
+        "title": _text(item.find("title")),
+        "link": _text(item.find("link")) or _text(item.find("guid")),
+        "description": _text(item.find(f"{CONTENT_NS}encoded")) or _text(item.find("description")),
+        "published": _text(item.find("pubDate")) or _text(item.find(f"{DC_NS}date")),
+        "company": _text(item.find("source")) or _text(item.find(f"{DC_NS}creator")),
+    }
+
+
+def _atom_entry(entry) -> dict:
+    link = ""
+    for link_el in entry.findall(f"{ATOM_NS}link"):
+        if link_el.get("rel", "alternate") == "alternate":
+            link = link_el.get("href", "")
+            break
+    return {
+        "title": _text(entry.find(f"{ATOM_NS}title")),
+        "link": link,
+        "description": _text(entry.find(f"{ATOM_NS}content")) or _text(entry.find(f"{ATOM_NS}summary")),
+        "published": _text(entry.find(f"{ATOM_NS}published")) or _text(entry.find(f"{ATOM_NS}updated")),
+        "company": _text(entry.find(f"{ATOM_NS}author/{ATOM_NS}name")),
+    }
+
+
+def iter_entries(stream):
+    """
+    Yield the raw fields of every RSS <item> / Atom <entry> in a feed,
+    reading `stream` (a path or binary file object) incrementally.
+    """
+    root = None
+    for event, el in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = el
+            continue
+        tag = el.tag
+        if tag == "item":
+            yield _rss_entry(el)
+        elif tag == f"{ATOM_NS}entry":
+            yield _atom_entry(el)
+        else:
+            continue
+        el.clear()
+        # Drop the finished item from its parent too; clear() alone leaves an
+        # empty element behind for every item
+        if root is not None:
+            for parent in (root, *root):
+                if len(parent) and parent[-1] is el:
+                    parent.remove(el)
+                    break
+
+
+def feed_job(entry: dict, board: str, location: str) -> dict | None:
+    """Map a feed entry to the search.py job schema."""
+    link = entry["link"]
+    if not link:
+        return None
+    title = entry["title"]
+    company = entry["company"]
+    job_location = location
+    match = _TITLE_PARTS_RE.match(title)
+    if match and (not company or match.group(2).strip() == company):
+        title, company, job_location = (part.strip() for part in match.groups())
+    return {
+        "id": generate_job_id(link),
+        "title": title,
+        "company": company or "Unknown",
+        "location": job_location,
+        "url": link,
+        "description": _plain(entry["description"]),
+        "salary": "",
+        "date_posted": _date(entry["published"]),
+        "source": board,
+        "scraped_at": datetime.now().isoformat(),
+    }
+
+
+def parse_feed(stream, board: str, location: str) -> list[dict]:
+    """Parse an RSS/Atom feed into job dicts. A truncated or non-XML body yields what parsed."""
+    jobs = []
+    try:
+        for entry in iter_entries(stream):
+            job = feed_job(entry, board, location)
+            if job:
+                jobs.append(job)
+    except ET.ParseError as e:
+        print(f"    Warning: {board} feed is not valid XML ({e}), kept {len(jobs)} items")
+    return jobs
+
+
+def scrape_feed(url: str, board: str, location: str, params: dict | None = None) -> list[dict]:
+    """Poll a board's feed with a conditional, streamed GET."""
+    try:
+        print(f"  Polling {board} feed")
+        return fetch_cards(
+            url, lambda stream: parse_feed(stream, board, location), params=params, stream=True
+        )
+
+    except requests.RequestException as e:
+        print(f"    Error fetching {board} feed: {e}")
+
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS/Atom job feed reader")
+    parser.add_argument("source", help="Feed URL or saved feed file")
+    parser.add_argument("--board", type=str, default="Feed", help="Source name for the jobs")
+    parser.add_argument("--location", type=str, default="", help="Fallback location")
+    args = parser.parse_args()
+
+    if args.source.startswith(("http://", "https://")):
+        jobs = scrape_feed(args.source, args.board, args.location)
+    elif Path(args.source).exists():
+        jobs = parse_feed(args.source, args.board, args.location)
+    else:
+        print(f"ERROR: {args.source} is neither a URL nor an existing file")
+        sys.exit(1)
+
+    for job in jobs:
+        print(f"  {job['title']} @ {job['company']} ({job['location']}) {job['date_posted']}")
+    print(f"{len(jobs)} feed items")
+
+
+if __name__ == "__main__":
+    main()
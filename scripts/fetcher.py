@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP fetch engine for the job board scrapers.
+
+Every host gets its own token bucket, so the per-site politeness delay is the
+same as the old sequential loop, while different hosts are fetched in
+parallel. Work is grouped into per-host "lanes": each lane runs its tasks in
+order on one worker thread, and lanes for different hosts run side by side.
+A full search cycle therefore takes about as long as the slowest board.
+
+Failures are handled per host as well:
+
+- Responses with 429, 502, 503 or 504 are retried after the server's
+  Retry-After. Without that header, the wait is a jittered exponential backoff.
+  Connection errors and timeouts are retried the same way.
+- Every host has a circuit breaker. After BREAKER_THRESHOLD consecutive failed
+  requests, the breaker opens. While it is open, fetch() raises
+  CircuitOpenError right away instead of waiting on a host that is blocking
+  us.
+- A Retry-After longer than MAX_RETRY_WAIT opens the breaker immediately, for
+  the time the server asked for.
+- When the cooldown is over, a single probe request is let through. If the
+  probe succeeds, the breaker closes. If it fails, the breaker reopens with a
+  doubled cooldown.
+
+One blocked board therefore costs a few seconds instead of stalling its lane
+for every remaining query.
+
+Usage (from another script in scripts/):
+    from fetcher import CircuitOpenError, fetch, run_lanes
+
+    resp = fetch("https://nl.indeed.com/jobs", params={"q": "python"})
+    results = run_lanes({"nl.indeed.com": [task1, task2], "www.werkenbij.nl": [task3]})
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9,nl;q=0.8",
+}
+
+CONNECT_TIMEOUT = 5
+REQUEST_TIMEOUT = 30
+DELAY_BETWEEN_REQUESTS = 3  # seconds, default for hosts not listed below
+
+# Seconds between requests per host. Override at runtime with configure_host().
+HOST_DELAYS = {
+    "nl.indeed.com": DELAY_BETWEEN_REQUESTS,
+    "www.ictergezocht.nl": DELAY_BETWEEN_REQUESTS,
+    "www.werkenbij.nl": DELAY_BETWEEN_REQUESTS,
+    "www.linkedin.com": DELAY_BETWEEN_REQUESTS,
+    "www.stepstone.nl": DELAY_BETWEEN_REQUESTS,
+    "www.arbeitnow.com": DELAY_BETWEEN_REQUESTS,
+    "boards-api.greenhouse.io": 1,
+    "apply.workable.com": DELAY_BETWEEN_REQUESTS,
+}
+
+RETRY_STATUSES = {429, 502, 503, 504}
+BLOCKED_STATUSES = {403}   # count towards the breaker, but retrying will not help
+MAX_RETRIES = 2
+BACKOFF_BASE = 2.0         # seconds; doubled per retry, with full jitter
+MAX_BACKOFF = 30
+MAX_RETRY_WAIT = 60        # a longer Retry-After opens the breaker instead of sleeping
+
+BREAKER_THRESHOLD = 3      # consecutive failed requests that open a host's breaker
+BREAKER_COOLDOWN = 120     # seconds before the first probe; doubled per failed probe
+MAX_BREAKER_COOLDOWN = 1800
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised by fetch() without a request while a host's circuit breaker is open."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        if self.rate == float("inf"):
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probe -> closed or open again."""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.failures = 0
+        self.cooldown = BREAKER_COOLDOWN
+        self.open_until = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Seconds until the breaker lets a probe through (0 when closed)."""
+        return max(0.0, self.open_until - time.monotonic())
+
+    def allow(self) -> None:
+        """Raise CircuitOpenError unless a request to the host may be sent now."""
+        with self.lock:
+            if not self.open_until:
+                return
+            wait = self.open_until - time.monotonic()
+            if wait > 0 or self.probing:
+                raise CircuitOpenError(
+                    f"circuit open for {self.host} (retry in {max(wait, 0):.0f}s)"
+                )
+            self.probing = True
+
+    def success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.cooldown = BREAKER_COOLDOWN
+            self.open_until = 0.0
+            self.probing = False
+
+    def failure(self, retry_after: float | None = None) -> None:
+        """Record a failed request; open the breaker if it is time to."""
+        with self.lock:
+            self.failures += 1
+            long_wait = retry_after is not None and retry_after > MAX_RETRY_WAIT
+            if not (self.probing or long_wait or self.failures >= BREAKER_THRESHOLD):
+                return
+            if self.probing:
+                self.cooldown = min(self.cooldown * 2, MAX_BREAKER_COOLDOWN)
+            self.probing = False
+            wait = max(self.cooldown, retry_after or 0)
+            self.open_until = time.monotonic() + wait
+            print(f"    Warning: {self.host} is failing, pausing requests for {wait:.0f}s")
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+_breakers: dict[str, CircuitBreaker] = {}
+_local = threading.local()
+
+
+def host_of(url: str) -> str:
+    """Return the lower-cased host of a URL."""
+    return urlparse(url).netloc.lower()
+
+
+def configure_host(host: str, delay: float, burst: float = 1.0) -> None:
+    """Set the politeness delay (seconds between requests) and burst size for a host."""
+    with _buckets_lock:
+        HOST_DELAYS[host] = delay
+        _buckets[host] = TokenBucket(1.0 / delay if delay > 0 else float("inf"), burst)
+
+
+def bucket_for(host: str) -> TokenBucket:
+    """Return the token bucket for a host, creating it from HOST_DELAYS if needed."""
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            delay = HOST_DELAYS.get(host, DELAY_BETWEEN_REQUESTS)
+            bucket = TokenBucket(1.0 / delay if delay > 0 else float("inf"))
+            _buckets[host] = bucket
+        return bucket
+
+
+def breaker_for(host: str) -> CircuitBreaker:
+    """Return the circuit breaker for a host, creating it if needed."""
+    with _buckets_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+
+def open_circuits() -> dict[str, float]:
+    """{host: seconds until the next probe} for every host whose breaker is open."""
+    with _buckets_lock:
+        breakers = list(_breakers.values())
+    return {b.host: b.remaining() for b in breakers if b.open_until}
+
+
+def retry_after(resp: requests.Response) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), None if absent."""
+    value = resp.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(MAX_BACKOFF, BACKOFF_BASE * 2 ** attempt))
+
+
+def _session() -> requests.Session:
+    """One requests.Session per worker thread (sessions are not thread-safe)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        _local.session = session
+    return session
+
+
+def fetch(url: str, params: dict | None = None, headers: dict | None = None,
+          stream: bool = False) -> requests.Response:
+    """
+    GET a URL after taking a token from its host's bucket, retrying throttled
+    and failed requests as described in the module docstring. With `stream`,
+    the body is not read up front (use resp.raw or resp.iter_content).
+    Raises requests.RequestException on network errors and HTTP error statuses,
+    and CircuitOpenError while the host's breaker is open.
+    """
+    host = host_of(url)
+    breaker = breaker_for(host)
+    for attempt in range(MAX_RETRIES + 1):
+        breaker.allow()
+        bucket_for(host).acquire()
+        try:
+            resp = _session().get(
+                url, params=params, headers=headers,
+                timeout=(CONNECT_TIMEOUT, REQUEST_TIMEOUT), stream=stream,
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            breaker.failure()
+            if attempt == MAX_RETRIES or breaker.remaining():
+                raise
+            time.sleep(backoff(attempt))
+            continue
+        except requests.RequestException:
+            # TooManyRedirects, ChunkedEncodingError, ...: not worth a retry, but
+            # still a failure (and it must end a half-open probe)
+            breaker.failure()
+            raise
+
+        if resp.status_code not in RETRY_STATUSES | BLOCKED_STATUSES:
+            breaker.success()
+            break
+        wait = retry_after(resp)
+        breaker.failure(wait)
+        # Give up on a block, on the last attempt, or once the breaker opened
+        # (which includes a Retry-After longer than MAX_RETRY_WAIT)
+        if resp.status_code in BLOCKED_STATUSES or attempt == MAX_RETRIES or breaker.remaining():
+            break
+        resp.close()
+        time.sleep(wait if wait is not None else backoff(attempt))
+
+    resp.raise_for_status()
+    return resp
+
+
+def fetch_head(url: str, breaker_key: str | None = None) -> str:
+    """
+    Follow a URL's redirects with a HEAD request and return the final URL.
+    Servers that reject HEAD get a streamed GET whose body is never read.
+    `breaker_key` selects a circuit breaker other than the host's, so failures
+    here do not block the host's search pages; requests still take the host's
+    token bucket.
+    """
+    host = host_of(url)
+    breaker = breaker_for(breaker_key or host)
+    breaker.allow()
+    bucket_for(host).acquire()
+    timeout = (CONNECT_TIMEOUT, REQUEST_TIMEOUT)
+    try:
+        resp = _session().head(url, allow_redirects=True, timeout=timeout)
+        if resp.status_code in (403, 405, 501):
+            bucket_for(host).acquire()
+            resp = _session().get(url, allow_redirects=True, timeout=timeout, stream=True)
+            resp.close()
+    except requests.RequestException:
+        breaker.failure()
+        raise
+    if resp.status_code in RETRY_STATUSES | BLOCKED_STATUSES:
+        breaker.failure(retry_after(resp))
+    else:
+        breaker.success()
+    resp.raise_for_status()
+    return resp.url
+
+
+def run_lanes(lanes: dict[str, list], max_workers: int | None = None) -> dict[str, list]:
+    """
+    Run callables grouped by host. Tasks within a lane run sequentially in
+    order; lanes run in parallel, at most `max_workers` at a time (default:
+    all of them). Returns {lane: [result, ...]} with results in the same
+    order as the tasks.
+    """
+    if not lanes:
+        return {}
+
+    def run_lane(tasks: list) -> list:
+        return [task() for task in tasks]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers or len(lanes), len(lanes))) as pool:
+        futures = {lane: pool.submit(run_lane, tasks) for lane, tasks in lanes.items()}
+        return {lane: future.result() for lane, future in futures.items()}
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Offline Dutch place gazetteer for location scoring.
+
+data/nl-places.tsv lists the Dutch municipalities and larger places with
+approximate coordinates, plus aliases (municipality names, Frisian and
+English names, "Den Bosch" for 's-Hertogenbosch, ...) and the provinces as a
+fallback. On load, the great-circle distance from the home city to every
+place is computed once. After that, resolving a location is a dict lookup.
+
+Board location strings are noisy: "1234 AB Veldhoven", "Capelle a/d IJssel,
+Zuid-Holland", "Eindhoven (Hybrid)", "Den Haag - Netherlands". normalize()
+lower-cases, strips accents, postcodes and punctuation. lookup() tries every
+comma/dash separated segment as a whole, then its word n-grams (longest
+first), and only falls back to a province when no place matched. Results are
+memoized per raw string, because the same few hundred location strings repeat
+across thousands of jobs.
+
+Many Dutch place names are also ordinary or foreign words ("Best of both",
+"Stein am Rhein"), so an n-gram inside a longer segment only counts when the
+rest of the segment is location filler ("Greater Eindhoven Area", "Hybrid in
+Utrecht") or the string has Dutch context (a postcode, a province, "Netherlands").
+A string that names another country and no Dutch context resolves to nothing.
+
+Usage:
+    python3 scripts/gazetteer.py "Capelle aan den IJssel" "5504 DA Veldhoven"
+    python3 scripts/gazetteer.py --check      # run the built-in resolution checks
+
+    from gazetteer import get_gazetteer
+    km = get_gazetteer("Eindhoven").distance_km("Veldhoven, Noord-Brabant")   # ~6
+"""
+
+import argparse
+import math
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PLACES_PATH = DATA_DIR / "nl-places.tsv"
+
+HOME_CITY = "Eindhoven"
+EARTH_RADIUS_KM = 6371.0
+
+_POSTCODE_RE = re.compile(r"\b\d{4}\s?[a-z]{2}\b")
+_SEGMENT_RE = re.compile(r"[,;|()\[\]•·]| - | – ")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+# Words that may surround a place name in a segment without making it ambiguous
+FILLER_WORDS = {
+    "area", "greater", "metropolitan", "region", "regio", "omgeving", "centrum", "city",
+    "hybrid", "hybride", "remote", "onsite", "on", "site", "office", "work", "working",
+    "in", "near", "the", "of", "en", "and", "or", "nl",
+}
+NL_WORDS = {"netherlands", "nederland", "holland", "nl"}
+FOREIGN_COUNTRY_RE = re.compile(
+    r"\b(?:germany|deutschland|belgium|belgie|belgique|switzerland|schweiz|suisse|"
+    r"austria|osterreich|france|luxembourg|united kingdom|uk|england|spain|poland|"
+    r"united states|usa)\b"
+)
+
+# (location string, expected place name or None), run by --check
+CHECKS = [
+    ("Capelle aan den IJssel", "Capelle aan den IJssel"),
+    ("5504 DA Veldhoven", "Veldhoven"),
+    ("Veldhoven Noord-Brabant", "Veldhoven"),
+    ("Eindhoven (Hybrid)", "Eindhoven"),
+    ("Greater Eindhoven Area", "Eindhoven"),
+    ("Hybrid work in Utrecht", "Utrecht"),
+    ("Den Haag - Netherlands", "Den Haag"),
+    ("Best", "Best"),
+    ("Best, Noord-Brabant, Netherlands", "Best"),
+    ("Stein, Limburg", "Stein"),
+    ("Best of both", None),
+    ("Stein am Rhein", None),
+    ("Stein, Switzerland", None),
+    ("Berlin, Germany", None),
+]
+
+
+def normalize(text: str) -> str:
+    """Lower-case, accent-free, postcode-free, single-spaced words."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _POSTCODE_RE.sub(" ", text)
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class Gazetteer:
+    """Normalized place names -> place, with distances from `home` precomputed."""
+
+    def __init__(self, home: str = HOME_CITY, path: Path = PLACES_PATH):
+        self.places: dict[str, tuple] = {}      # key -> (name, province, lat, lon)
+        self.provinces: dict[str, tuple] = {}
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            name, province, lat, lon = fields[:4]
+            place = (name, province, float(lat), float(lon))
+            table = self.provinces if province == "-" else self.places
+            aliases = fields[4].split("|") if len(fields) > 4 and fields[4] else []
+            for key in (name, *aliases):
+                table.setdefault(normalize(key), place)
+        self.max_words = max(len(key.split()) for key in (*self.places, *self.provinces))
+
+        self.home = self.places.get(normalize(home))
+        if self.home is None:
+            raise ValueError(f"home city {home!r} is not in {path}")
+        _, _, home_lat, home_lon = self.home
+        self.distances = {
+            place: haversine_km(home_lat, home_lon, place[2], place[3])
+            for place in {*self.places.values(), *self.provinces.values()}
+        }
+        self._memo: dict[str, tuple | None] = {}
+
+    def _ngrams(self, words: list[str]):
+        """(start, size, n-gram) over the words, longest first."""
+        for size in range(min(self.max_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                yield start, size, " ".join(words[start:start + size])
+
+    def _match(self, segment: str, table: dict, dutch: bool) -> tuple | None:
+        """
+        The place a segment names: the whole segment, else an n-gram whose
+        other words are all FILLER_WORDS (any n-gram when `dutch` context).
+        """
+        if segment in table:
+            return table[segment]
+        words = segment.split()
+        for start, size, gram in self._ngrams(words):
+            place = table.get(gram)
+            if place is None:
+                continue
+            rest = words[:start] + words[start + size:]
+            if dutch or all(word in FILLER_WORDS for word in rest):
+                return place
+        return None
+
+    def _dutch_context(self, location: str, segments: list[str]) -> bool:
+        """A Dutch postcode, a province or "Netherlands" anywhere in the string."""
+        if _POSTCODE_RE.search(location.lower()):
+            return True
+        for segment in segments:
+            words = segment.split()
+            if NL_WORDS & set(words):
+                return True
+            if any(gram in self.provinces for _, _, gram in self._ngrams(words)):
+                return True
+        return False
+
+    def lookup(self, location: str) -> tuple | None:
+        """The (name, province, lat, lon) a location string refers to, or None."""
+        if location in self._memo:
+            return self._memo[location]
+        segments = [normalize(part) for part in _SEGMENT_RE.split(location.lower())]
+        segments = [segment for segment in segments if segment]
+        dutch = self._dutch_context(location, segments)
+        place = None
+        if not dutch and FOREIGN_COUNTRY_RE.search(" ".join(segments)):
+            segments = []  # another country and nothing Dutch: not a Dutch place
+        for table in (self.places, self.provinces):
+            for segment in segments:
+                place = self._match(segment, table, dutch)
+                if place:
+                    break
+            if place:
+                break
+        self._memo[location] = place
+        return place
+
+    def distance_km(self, location: str) -> float | None:
+        """Distance from the home city to the place a location string names, None if unknown."""
+        place = self.lookup(location)
+        return self.distances[place] if place else None
+
+
+@lru_cache(maxsize=None)
+def get_gazetteer(home: str = HOME_CITY) -> Gazetteer:
+    """Shared Gazetteer per home city, loaded on first use."""
+    return Gazetteer(home)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve job locations to Dutch places")
+    parser.add_argument("locations", nargs="*", help="Location strings to resolve")
+    parser.add_argument("--home", type=str, default=HOME_CITY, help="Home city")
+    parser.add_argument("--check", action="store_true", help="Run the built-in resolution checks")
+    args = parser.parse_args()
+
+    gazetteer = get_gazetteer(args.home)
+    if args.check:
+        failed = 0
+        for location, expected in CHECKS:
+            place = gazetteer.lookup(location)
+            name = place[0] if place else None
+            ok = name == expected
+            failed += not ok
+            print(f"  {'ok  ' if ok else 'FAIL'} {location!r}: {name} (expected {expected})")
+        if failed:
+            print(f"ERROR: {failed} of {len(CHECKS)} checks failed")
+            sys.exit(1)
+        print(f"All {len(CHECKS)} checks passed")
+        return
+
+    for location in args.locations:
+        place = gazetteer.lookup(location)
+        if place is None:
+            print(f"  {location!r}: unknown")
+        else:
+            name, province, _, _ = place
+            region = "province" if province == "-" else province
+            print(f"  {location!r}: {name} ({region}), {gazetteer.distances[place]:.0f} km")
+
+
+if __name__ == "__main__":
+    main()
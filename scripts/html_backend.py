@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Pluggable HTML parser backend for job card extraction.
+
+The scrapers only need a tiny DOM surface: CSS `select` / `select_one`,
+attribute lookup, the tag name and BeautifulSoup-style
+`get_text(separator, strip=True)`.
+This module exposes exactly that over three backends:
+
+- selectolax (lexbor) — fastest, used when installed
+- lxml + cssselect   — fast, used when installed
+- BeautifulSoup      — pure-Python html.parser, always available fallback
+
+Text extraction is implemented the same way for every backend (strip each
+text node, join with the separator, skip comments and script/style/template contents),
+so all backends return identical cards. scripts/bench_parsers.py verifies
+that over the data/*.html corpus.
+
+JOB_HTML_BACKEND overrides the default backend. A name that is not
+installed prints a warning and falls back to the fastest installed one.
+
+Usage:
+    from html_backend import parse_document
+
+    doc = parse_document(html)            # default backend
+    for card in doc.select("div.vacancy-card"):
+        title_el = card.select_one("h2 a")
+        title, link = title_el.text(), title_el.get("href", "")
+"""
+
+import os
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml = None
+
+# Tags whose text BeautifulSoup's get_text() leaves out
+SKIP_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+
+
+class BsNode:
+    """BeautifulSoup element wrapper."""
+
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def name(self) -> str:
+        return self.el.name
+
+    def select(self, css: str) -> list:
+        return [BsNode(el) for el in self.el.select(css)]
+
+    def select_one(self, css: str):
+        el = self.el.select_one(css)
+        return BsNode(el) if el is not None else None
+
+    def get(self, attr: str, default=None):
+        return self.el.get(attr, default)
+
+    def text(self, separator: str = "") -> str:
+        return self.el.get_text(separator, strip=True)
+
+
+class LxmlNode:
+    """lxml element wrapper; CSS selectors are compiled once and reused."""
+
+    __slots__ = ("el",)
+    _selectors: dict = {}
+
+    def __init__(self, el):
+        self.el = el
+
+    @classmethod
+    def _compile(cls, css: str):
+        selector = cls._selectors.get(css)
+        if selector is None:
+            selector = cls._selectors[css] = CSSSelector(css)
+        return selector
+
+    @property
+    def name(self) -> str:
+        return self.el.tag
+
+    def select(self, css: str) -> list:
+        return [LxmlNode(el) for el in self._compile(css)(self.el)]
+
+    def select_one(self, css: str):
+        for el in self._compile(css)(self.el):
+            return LxmlNode(el)
+        return None
+
+    def get(self, attr: str, default=None):
+        return self.el.get(attr, default)
+
+    def text(self, separator: str = "") -> str:
+        parts: list[str] = []
+        _lxml_text(self.el, parts)
+        return separator.join(parts)
+
+
+def _lxml_text(el, parts: list[str]) -> None:
+    if el.text and isinstance(el.tag, str):
+        stripped = el.text.strip()
+        if stripped:
+            parts.append(stripped)
+    for child in el:
+        # Comments and processing instructions have a non-string tag
+        if isinstance(child.tag, str) and child.tag not in SKIP_TEXT_TAGS:
+            _lxml_text(child, parts)
+        if child.tail:
+            stripped = child.tail.strip()
+            if stripped:
+                parts.append(stripped)
+
+
+class LexborNode:
+    """selectolax (lexbor) node wrapper."""
+
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def name(self) -> str:
+        return self.el.tag
+
+    def select(self, css: str) -> list:
+        return [LexborNode(el) for el in self.el.css(css)]
+
+    def select_one(self, css: str):
+        el = self.el.css_first(css)
+        return LexborNode(el) if el is not None else None
+
+    def get(self, attr: str, default=None):
+        value = self.el.attributes.get(attr, default)
+        return default if value is None else value
+
+    def text(self, separator: str = "") -> str:
+        parts: list[str] = []
+        _lexbor_text(self.el, parts)
+        return separator.join(parts)
+
+
+def _lexbor_text(el, parts: list[str]) -> None:
+    for child in el.iter(include_text=True):
+        tag = child.tag
+        if tag == "-text":
+            stripped = child.text_content.strip()
+            if stripped:
+                parts.append(stripped)
+        elif not tag.startswith("-") and tag not in SKIP_TEXT_TAGS:
+            _lexbor_text(child, parts)
+
+
+def available_backends() -> list[str]:
+    """Installed backends, fastest first."""
+    backends = []
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    if lxml is not None:
+        backends.append("lxml")
+    backends.append("bs4")
+    return backends
+
+
+def _env_backend() -> str:
+    """JOB_HTML_BACKEND if it names an installed backend, else the fastest installed one."""
+    name = os.environ.get("JOB_HTML_BACKEND")
+    backends = available_backends()
+    if name and name not in backends:
+        print(
+            f"Warning: JOB_HTML_BACKEND='{name}' is not available "
+            f"(installed: {', '.join(backends)}), using {backends[0]}"
+        )
+        name = None
+    return name or backends[0]
+
+
+_default_backend = _env_backend()
+
+
+def set_default_backend(name: str) -> None:
+    """Select the backend used by parse_document() when none is given."""
+    global _default_backend
+    if name not in available_backends():
+        raise ValueError(
+            f"HTML backend '{name}' is not available (installed: {', '.join(available_backends())})"
+        )
+    _default_backend = name
+
+
+def default_backend() -> str:
+    return _default_backend
+
+
+def parse_document(html: str, backend: str | None = None):
+    """Parse an HTML page and return the root node for the chosen backend."""
+    backend = backend or _default_backend
+    if backend not in available_backends():
+        raise ValueError(
+            f"HTML backend '{backend}' is not available (installed: {', '.join(available_backends())})"
+        )
+    if backend == "selectolax":
+        return LexborNode(LexborHTMLParser(html).root)
+    if backend == "lxml":
+        if not html.strip():
+            html = "<html></html>"
+        try:
+            return LxmlNode(lxml.html.document_fromstring(html))
+        except ValueError:
+            # lxml refuses str input that carries an XML encoding declaration
+            return LxmlNode(lxml.html.document_fromstring(html.encode("utf-8")))
+    return BsNode(BeautifulSoup(html, "html.parser"))
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Persistent response cache for job board search pages.
+
+Entries are keyed by the normalized URL + query params and store the
+ETag / Last-Modified validators together with the *parsed* job cards, not
+the raw HTML. The next request for the same search is sent as a conditional
+GET; on 304 Not Modified the cached cards are returned as-is, so an unchanged
+board costs one tiny round-trip and no parsing.
+
+The cache lives in data/http-cache.json and is written once per run.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from fetcher import fetch
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+CACHE_PATH = DATA_DIR / "http-cache.json"
+
+MAX_ENTRY_AGE_DAYS = 14  # entries not revalidated for this long are dropped on save
+
+
+def cache_key(url: str, params: dict | None = None) -> str:
+    """
+    Normalize a URL and its query params into a stable cache key:
+    lower-cased scheme/host, no fragment, query params merged and sorted.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((k, str(v)) for k, v in params.items())
+    query.sort()
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        urlencode(query),
+        "",
+    ))
+
+
+class ResponseCache:
+    """On-disk {key: {etag, last_modified, cards, stored_at}} map with run counters."""
+
+    def __init__(self, path: Path = CACHE_PATH, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.stats = {"hit": 0, "miss": 0, "revalidate": 0}
+        self.entries: dict[str, dict] = {}
+        if enabled and path.exists():
+            try:
+                self.entries = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                self.entries = {}
+
+    def get(self, key: str) -> dict | None:
+        if not self.enabled:
+            return None
+        with self.lock:
+            return self.entries.get(key)
+
+    def put(self, key: str, etag: str, last_modified: str, cards: list[dict]) -> None:
+        if not self.enabled:
+            return
+        with self.lock:
+            self.entries[key] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "cards": cards,
+                "stored_at": time.time(),
+            }
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as freshly revalidated."""
+        with self.lock:
+            if key in self.entries:
+                self.entries[key]["stored_at"] = time.time()
+
+    def count(self, counter: str) -> None:
+        with self.lock:
+            self.stats[counter] += 1
+
+    def save(self) -> None:
+        """Drop stale entries and write the cache to disk."""
+        if not self.enabled:
+            return
+        cutoff = time.time() - MAX_ENTRY_AGE_DAYS * 86400
+        with self.lock:
+            self.entries = {
+                k: v for k, v in self.entries.items() if v.get("stored_at", 0) >= cutoff
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.entries, ensure_ascii=False))
+
+    def summary(self) -> str:
+        s = self.stats
+        return f"{s['hit']} hits (304), {s['miss']} misses, {s['revalidate']} revalidations"
+
+
+default_cache = ResponseCache(enabled=False)
+
+
+def set_default_cache(cache: ResponseCache) -> None:
+    """Install the cache used by fetch_cards() when none is passed explicitly."""
+    global default_cache
+    default_cache = cache
+
+
+def fetch_cards(url: str, parse, params: dict | None = None,
+                cache: ResponseCache | None = None, stream: bool = False) -> list[dict]:
+    """
+    Fetch a search page and return its parsed job cards, using a conditional
+    GET when the cache holds validators for it. `parse` maps page text to cards;
+    with `stream` it gets the decompressed binary body stream instead, so large
+    documents (feeds) can be parsed incrementally.
+    Raises requests.RequestException like fetch().
+    """
+    cache = cache or default_cache
+    key = cache_key(url, params)
+    entry = cache.get(key)
+
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    if headers:
+        cache.count("revalidate")
+
+    resp = fetch(url, params=params, headers=headers or None, stream=stream)
+
+    if resp.status_code == 304 and entry:
+        resp.close()
+        cache.count("hit")
+        cache.touch(key)
+        return entry["cards"]
+
+    cache.count("miss")
+    if stream:
+        resp.raw.decode_content = True
+        with resp:
+            cards = parse(resp.raw)
+    else:
+        cards = parse(resp.text)
+
+    etag = resp.headers.get("ETag", "")
+    last_modified = resp.headers.get("Last-Modified", "")
+    if etag or last_modified:
+        cache.put(key, etag, last_modified, cards)
+    return cards
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Append-only job store — replaces the whole-file data/raw-jobs.json rewrite.
+
+Layout (data/jobs/):
+    segment-000001.jsonl   one job per line, appended to; a new segment is
+    segment-000002.jsonl   started once the current one passes SEGMENT_MAX_BYTES
+    index.tsv              one line per written record: id, segment, offset, url
+
+A job is never rewritten in place. Updating a job appends a new version and
+a new index line; the latest index line for an id wins. Compaction rewrites
+only the latest versions into a fresh segment. It runs when there are too many
+segments or too many superseded records. The cost of a run therefore scales
+with the number of new jobs, not with the history.
+
+The first time the store is opened, jobs from data/raw-jobs.json are
+imported.
+
+Usage:
+    python3 scripts/job_store.py --stats
+    python3 scripts/job_store.py --compact
+
+    from job_store import JobStore
+    store = JobStore()
+    added = store.add(jobs)          # only jobs with unseen URLs are written
+    for job in store.iter_jobs():    # streams latest versions
+        ...
+    store.close()
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from canonical_url import canonicalize_url
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+STORE_DIR = DATA_DIR / "jobs"
+LEGACY_JSON_PATH = DATA_DIR / "raw-jobs.json"
+
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+COMPACT_MAX_SEGMENTS = 8
+COMPACT_SUPERSEDED_RATIO = 0.25
+
+
+def generate_job_id(url: str) -> str:
+    """
+    Generate a deterministic ID from a job URL. The URL is canonicalized
+    first (see scripts/canonical_url.py), so tracking params and localized
+    variants of one posting share an ID.
+    """
+    return hashlib.md5(canonicalize_url(url).encode()).hexdigest()[:12]
+
+
+class JobStore:
+    """JSONL segments plus a compact id/url index, see module docstring."""
+
+    def __init__(self, root: Path = STORE_DIR, legacy_path: Path | None = LEGACY_JSON_PATH):
+        self.root = root
+        self.index_path = root / "index.tsv"
+        self.latest: dict[str, tuple[int, int]] = {}  # id -> (segment, offset)
+        self.url_ids: dict[str, str] = {}             # canonical url -> id
+        self.records = 0                              # index lines incl. superseded
+        self._segment_file = None
+        self._index_file = None
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+        if not self.records and legacy_path and legacy_path.exists():
+            self._import_legacy(legacy_path)
+
+    # -- index ------------------------------------------------------------
+
+    def _load_index(self) -> None:
+        if not self.index_path.exists():
+            return
+        with self.index_path.open(encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t", 3)
+                if len(parts) != 4:
+                    continue  # torn write from an interrupted run
+                job_id, segment, offset, url = parts
+                self.latest[job_id] = (int(segment), int(offset))
+                if url:
+                    self.url_ids[canonicalize_url(url)] = job_id
+                self.records += 1
+
+    def _import_legacy(self, path: Path) -> None:
+        try:
+            jobs = json.loads(path.read_text())
+        except json.JSONDecodeError:
+            return
+        added = self.add(jobs)
+        self.flush()
+        print(f"  Imported {len(added)} jobs from {path.name} into {self.root}")
+
+    # -- segments ---------------------------------------------------------
+
+    def segments(self) -> list[int]:
+        """Existing segment numbers, oldest first."""
+        numbers = []
+        for path in self.root.glob("segment-*.jsonl"):
+            try:
+                numbers.append(int(path.stem.split("-", 1)[1]))
+            except ValueError:
+                continue
+        return sorted(numbers)
+
+    def _segment_path(self, number: int) -> Path:
+        return self.root / f"segment-{number:06d}.jsonl"
+
+    def _open_for_append(self):
+        """Return (segment number, file) for the segment new records go to."""
+        if self._segment_file is not None and self._segment_file.tell() < SEGMENT_MAX_BYTES:
+            return self._segment_number, self._segment_file
+        if self._segment_file is not None:
+            self._segment_file.close()
+            number = self._segment_number + 1
+        else:
+            existing = self.segments()
+            number = existing[-1] if existing else 1
+            if self._segment_path(number).exists() and \
+                    self._segment_path(number).stat().st_size >= SEGMENT_MAX_BYTES:
+                number += 1
+        self._segment_number = number
+        self._segment_file = self._segment_path(number).open("ab")
+        return number, self._segment_file
+
+    def _write(self, job: dict) -> None:
+        number, f = self._open_for_append()
+        offset = f.tell()
+        f.write((json.dumps(job, ensure_ascii=False) + "\n").encode("utf-8"))
+        if self._index_file is None:
+            self._index_file = self.index_path.open("a", encoding="utf-8")
+        url = job.get("url", "").replace("\t", " ").replace("\n", " ")
+        self._index_file.write(f"{job['id']}\t{number}\t{offset}\t{url}\n")
+        self.latest[job["id"]] = (number, offset)
+        if url:
+            self.url_ids[canonicalize_url(url)] = job["id"]
+        self.records += 1
+
+    # -- public API -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.latest)
+
+    def has_url(self, url: str) -> bool:
+        """True if a job with this URL (compared in canonical form) is stored."""
+        return canonicalize_url(url) in self.url_ids
+
+    def id_set(self) -> set[str]:
+        """IDs of all stored jobs."""
+        return set(self.latest)
+
+    def add(self, jobs) -> list[dict]:
+        """Append jobs whose URL is not stored yet. Returns the jobs written."""
+        added = []
+        for job in jobs:
+            url = job.get("url", "")
+            if not url or self.has_url(url):
+                continue
+            job.setdefault("id", generate_job_id(url))
+            self._write(job)
+            added.append(job)
+        return added
+
+    def update(self, job: dict) -> None:
+        """Append a new version of a stored job (same id); it supersedes the old one."""
+        self._write(job)
+
+    def get(self, job_id: str) -> dict | None:
+        """Read the latest version of one job by id (a single seek + readline)."""
+        position = self.latest.get(job_id)
+        if position is None:
+            return None
+        self.flush()
+        number, offset = position
+        with self._segment_path(number).open("rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def iter_jobs(self):
+        """Stream the latest version of every stored job, oldest first."""
+        self.flush()
+        for number in self.segments():
+            with self._segment_path(number).open("rb") as f:
+                offset = 0
+                for line in f:
+                    start = offset
+                    offset += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        job = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if self.latest.get(job.get("id")) == (number, start):
+                        yield job
+
+    def flush(self) -> None:
+        for f in (self._segment_file, self._index_file):
+            if f is not None:
+                f.flush()
+
+    def close(self) -> None:
+        for f in (self._segment_file, self._index_file):
+            if f is not None:
+                f.close()
+        self._segment_file = None
+        self._index_file = None
+
+    # -- compaction -------------------------------------------------------
+
+    def needs_compaction(self) -> bool:
+        superseded = self.records - len(self.latest)
+        return (
+            len(self.segments()) > COMPACT_MAX_SEGMENTS
+            or (self.records and superseded / self.records > COMPACT_SUPERSEDED_RATIO)
+        )
+
+    def maybe_compact(self) -> bool:
+        """Compact if needed. Returns True if compaction ran."""
+        if self.needs_compaction():
+            self.compact()
+            return True
+        return False
+
+    def compact(self) -> None:
+        """
+        Rewrite the latest version of every job into one fresh segment and a
+        fresh index, then delete the old segments. The index is swapped in
+        atomically, so an interrupted compaction leaves the old store intact.
+        """
+        old_segments = self.segments()
+        jobs = self.iter_jobs()
+        self.close()
+
+        number = (old_segments[-1] if old_segments else 0) + 1
+        segment_path = self._segment_path(number)
+        tmp_index = self.index_path.with_suffix(".tsv.tmp")
+        latest: dict[str, tuple[int, int]] = {}
+        url_ids: dict[str, str] = {}
+
+        with segment_path.open("wb") as seg, tmp_index.open("w", encoding="utf-8") as idx:
+            for job in jobs:
+                offset = seg.tell()
+                seg.write((json.dumps(job, ensure_ascii=False) + "\n").encode("utf-8"))
+                url = job.get("url", "").replace("\t", " ").replace("\n", " ")
+                idx.write(f"{job['id']}\t{number}\t{offset}\t{url}\n")
+                latest[job["id"]] = (number, offset)
+                if url:
+                    url_ids[canonicalize_url(url)] = job["id"]
+
+        os.replace(tmp_index, self.index_path)
+        for old in old_segments:
+            self._segment_path(old).unlink(missing_ok=True)
+
+        self.latest = latest
+        self.url_ids = url_ids
+        self.records = len(latest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append-only job store maintenance")
+    parser.add_argument("--compact", action="store_true", help="Compact the store now")
+    parser.add_argument("--stats", action="store_true", help="Print store statistics")
+    args = parser.parse_args()
+
+    store = JobStore()
+    if args.compact:
+        store.compact()
+        print(f"Compacted {len(store)} jobs into {store.segments()}")
+    if args.stats or not args.compact:
+        superseded = store.records - len(store)
+        print(f"Jobs: {len(store)}")
+        print(f"Index records: {store.records} ({superseded} superseded)")
+        print(f"Segments: {len(store.segments())}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
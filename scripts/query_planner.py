@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Search query planner: decide which board x keyword queries are worth running.
+
+Every role in preferences.md is searched on every board, and many of those
+queries return largely the same postings ("Software Engineer" vs "Full Stack
+Developer" on a small board). The planner keeps a history per (board, keyword)
+in data/query-history.json with:
+
+- the IDs of the most recent results
+- the new-job yield of the last runs (results not in the store before the run)
+- a run interval in cycles
+
+Planning for a board works in two steps:
+
+1. Greedy set cover over the recent result IDs. The queries that together
+   cover COVERAGE of everything the board returned are "covering"; the rest
+   are redundant.
+2. A query runs when it is due. The interval starts at 1 (every cycle) and
+   doubles, up to MAX_INTERVAL, each time a run brings no new jobs. Any new
+   job resets it to 1. Redundant queries run at most every REDUNDANT_INTERVAL
+   cycles.
+
+Queries without history always run, and nothing is pruned forever, so a query
+that starts yielding again is picked back up within MAX_INTERVAL cycles.
+
+Usage:
+    python3 scripts/query_planner.py          # print the history and next plan
+
+    from query_planner import QueryPlanner
+    planner = QueryPlanner()
+    keywords_now = planner.plan("Indeed NL", keywords)
+    ...
+    planner.record("Indeed NL", keyword, jobs, seen_ids)
+    planner.save()
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+HISTORY_PATH = DATA_DIR / "query-history.json"
+
+COVERAGE = 0.95           # share of a board's known results the covering queries must reach
+MIN_UNIQUE_RESULTS = 2    # a query must add at least this many IDs to the cover to be picked
+REDUNDANT_INTERVAL = 4    # redundant queries run at most every N cycles
+MAX_INTERVAL = 8          # zero-yield backoff cap, in cycles
+MAX_TRACKED_IDS = 300     # recent result IDs kept per query
+MAX_TRACKED_RUNS = 10
+
+
+def query_key(board: str, keyword: str) -> str:
+    return f"{board}|{' '.join(keyword.lower().split())}"
+
+
+class QueryPlanner:
+    """Per-query yield/overlap history and the planning rules from the module docstring."""
+
+    def __init__(self, path: Path = HISTORY_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {"cycles": {}, "queries": {}}
+        if path.exists():
+            try:
+                self.data = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                pass
+
+    def _entry(self, board: str, keyword: str) -> dict | None:
+        return self.data["queries"].get(query_key(board, keyword))
+
+    def redundant(self, board: str, keywords: list[str]) -> set[str]:
+        """Keywords whose recent results are covered by the board's other queries."""
+        id_sets = {}
+        for keyword in keywords:
+            entry = self._entry(board, keyword)
+            if entry and entry["runs"]:
+                id_sets[keyword] = set(entry["ids"])
+        universe = set().union(*id_sets.values()) if id_sets else set()
+        if not universe:
+            return set()
+
+        covered: set = set()
+        chosen = set()
+        remaining = dict(id_sets)
+        while remaining and len(covered) < COVERAGE * len(universe):
+            keyword, ids = max(remaining.items(), key=lambda item: len(item[1] - covered))
+            if len(ids - covered) < MIN_UNIQUE_RESULTS:
+                break
+            chosen.add(keyword)
+            covered |= ids
+            del remaining[keyword]
+        return set(id_sets) - chosen
+
+    def plan(self, board: str, keywords: list[str]) -> list[str]:
+        """Advance the board's cycle counter and return the keywords to run now."""
+        with self.lock:
+            cycle = self.data["cycles"].get(board, 0) + 1
+            self.data["cycles"][board] = cycle
+        redundant = self.redundant(board, keywords)
+
+        planned = []
+        for keyword in keywords:
+            entry = self._entry(board, keyword)
+            if not entry or not entry["runs"]:
+                planned.append(keyword)
+                continue
+            interval = entry["interval"]
+            if keyword in redundant:
+                interval = max(interval, REDUNDANT_INTERVAL)
+            if cycle - entry["last_cycle"] >= interval:
+                planned.append(keyword)
+        return planned
+
+    def record(self, board: str, keyword: str, jobs: list[dict], seen_ids: set) -> None:
+        """
+        Store the outcome of a query run. `seen_ids` is the store's ID set
+        before the run; `jobs` must already carry their ingest-time ids.
+        """
+        ids = [job["id"] for job in jobs]
+        new = sum(1 for job_id in set(ids) if job_id not in seen_ids)
+        with self.lock:
+            entry = self.data["queries"].setdefault(
+                query_key(board, keyword), {"runs": [], "ids": [], "interval": 1, "last_cycle": 0}
+            )
+            entry["runs"] = (entry["runs"] + [{"at": time.time(), "results": len(ids), "new": new}])[
+                -MAX_TRACKED_RUNS:
+            ]
+            entry["ids"] = list(dict.fromkeys(ids))[:MAX_TRACKED_IDS]
+            entry["last_cycle"] = self.data["cycles"].get(board, 0)
+            entry["interval"] = 1 if new else min(entry["interval"] * 2, MAX_INTERVAL)
+
+    def save(self) -> None:
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.data, indent=2))
+
+    def report(self) -> list[str]:
+        """One line per tracked query: average results/new jobs and current interval."""
+        lines = []
+        for key, entry in sorted(self.data["queries"].items()):
+            runs = entry["runs"]
+            if not runs:
+                continue
+            avg_results = sum(r["results"] for r in runs) / len(runs)
+            avg_new = sum(r["new"] for r in runs) / len(runs)
+            lines.append(
+                f"  {key:<50} {avg_results:6.1f} results  {avg_new:6.1f} new  "
+                f"every {entry['interval']} cycle(s)"
+            )
+        return lines
+
+
+def main():
+    planner = QueryPlanner()
+    if not planner.data["queries"]:
+        print("No query history yet. Run search.py first.")
+        return
+    print("Query history (averages over the last runs):")
+    for line in planner.report():
+        print(line)
+
+    boards: dict[str, list[str]] = {}
+    for key in planner.data["queries"]:
+        board, keyword = key.split("|", 1)
+        boards.setdefault(board, []).append(keyword)
+    print("\nRedundant queries (covered by the board's other queries):")
+    for board, keywords in sorted(boards.items()):
+        redundant = planner.redundant(board, keywords)
+        if redundant:
+            print(f"  {board}: {', '.join(sorted(redundant))}")
+
+
+if __name__ == "__main__":
+    main()
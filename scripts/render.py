@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Browser rendering stage for JS-heavy job boards.
+
+search.py writes the search URLs of boards that only work in a browser
+(Glassdoor) to data/js-board-urls.json. This stage renders the URLs with
+Playwright. It uses one long-lived headless
+Chromium and a small pool of reusable browser contexts, so there is no
+per-URL browser startup. Images, fonts and media are aborted
+via route interception before they are downloaded. At most --pool-size pages
+render at once, and every navigation first takes a token from the same
+per-host buckets the HTTP scrapers use (see scripts/fetcher.py).
+
+Rendered pages are saved as rendered/<board>_<hash>.html in the snapshot
+archive (scripts/snapshot_archive.py). They can be replayed with
+`search.py --replay data/rendered`. Boards with a card parser in RENDER_BOARDS
+are merged into the job store, just like the HTTP boards. Glassdoor has none
+yet, so its pages are only archived and run.sh leaves this stage out of `all`.
+
+Usage:
+    python3 scripts/render.py
+    python3 scripts/render.py --pool-size 2 --board "Glassdoor NL"
+    python3 scripts/render.py --no-store     # render and save snapshots only
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+from fetcher import BLOCKED_STATUSES, HEADERS, RETRY_STATUSES, breaker_for, bucket_for, host_of
+from job_store import JobStore
+from search import ingest_jobs, load_preferences
+from snapshot_archive import SnapshotArchive
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+JS_BOARDS_PATH = DATA_DIR / "js-board-urls.json"
+RENDER_PREFIX = "rendered/"  # snapshot archive directory for rendered pages
+
+POOL_SIZE = 3
+PAGE_TIMEOUT_MS = 30000
+RESULTS_TIMEOUT_MS = 10000
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Board -> (selector that signals the result list has rendered, card parser or None)
+RENDER_BOARDS = {
+    "Glassdoor NL": ("li[data-test=jobListing]", None),
+}
+
+
+async def _block_heavy_resources(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """One Chromium instance with `size` reusable contexts, handed out via a queue."""
+
+    def __init__(self, size: int = POOL_SIZE):
+        self.size = size
+        self._playwright = None
+        self._browser = None
+        self._contexts: asyncio.Queue = asyncio.Queue()
+
+    async def __aenter__(self):
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        for _ in range(self.size):
+            context = await self._browser.new_context(
+                viewport={"width": 1280, "height": 720},
+                user_agent=HEADERS["User-Agent"],
+                locale="en-US",
+            )
+            await context.route("**/*", _block_heavy_resources)
+            await self._contexts.put(context)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        while not self._contexts.empty():
+            await (self._contexts.get_nowait()).close()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+    async def render(self, url: str, wait_for: str | None = None) -> str:
+        """Render a page in a pooled context and return its HTML."""
+        # Same politeness budget and circuit breaker as the HTTP scrapers;
+        # acquire() blocks, so it runs off the event loop
+        host = host_of(url)
+        breaker = breaker_for(host)
+        breaker.allow()
+        context = page = None
+        try:
+            try:
+                await asyncio.to_thread(bucket_for(host).acquire)
+                context = await self._contexts.get()
+                page = await context.new_page()
+                response = await page.goto(
+                    url, wait_until="domcontentloaded", timeout=PAGE_TIMEOUT_MS
+                )
+            except BaseException:
+                # Including cancellation: a half-open probe must always be settled
+                breaker.failure()
+                raise
+            if response is not None and response.status in RETRY_STATUSES | BLOCKED_STATUSES:
+                breaker.failure()
+            else:
+                breaker.success()
+            if wait_for:
+                try:
+                    await page.wait_for_selector(wait_for, timeout=RESULTS_TIMEOUT_MS)
+                except Exception:
+                    pass  # no results or a different layout; keep what rendered
+            return await page.content()
+        finally:
+            if page is not None:
+                await page.close()
+            if context is not None:
+                await self._contexts.put(context)
+
+
+def snapshot_name(entry: dict) -> str:
+    """Stable snapshot file name for a JS board URL, e.g. glassdoor_3f2a9c1d.html."""
+    board = entry["board"].split()[0].lower()
+    digest = hashlib.md5(entry["search_url"].encode()).hexdigest()[:8]
+    return f"{board}_{digest}.html"
+
+
+async def render_entries(entries: list[dict], location: str, pool_size: int = POOL_SIZE,
+                         archive: SnapshotArchive | None = None) -> list[dict]:
+    """Render every JS board URL through one browser pool and return the parsed cards."""
+    archive = archive or SnapshotArchive()
+    jobs: list[dict] = []
+
+    async with BrowserPool(pool_size) as pool:
+
+        async def render_one(entry: dict) -> None:
+            wait_for, parse = RENDER_BOARDS.get(entry["board"], (None, None))
+            start = time.perf_counter()
+            try:
+                html = await pool.render(entry["search_url"], wait_for)
+            except Exception as e:
+                print(f"    Warning: Could not render {entry['search_url']}: {e}")
+                return
+            elapsed = time.perf_counter() - start
+            archive.add(RENDER_PREFIX + snapshot_name(entry), html)
+            cards = parse(html, location) if parse else []
+            jobs.extend(cards)
+            note = f"{len(cards)} listings" if parse else "saved, no card parser"
+            print(f"  {entry['board']}: {note} in {elapsed:.1f}s")
+
+        await asyncio.gather(*(render_one(entry) for entry in entries))
+
+    archive.save()
+
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render JS-heavy job boards with Playwright")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE, help="Pages rendered at once")
+    parser.add_argument("--board", action="append", help="Only render these boards (repeatable)")
+    parser.add_argument(
+        "--no-store", action="store_true", help="Only save snapshots, don't merge into the job store"
+    )
+    args = parser.parse_args()
+
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        # Optional stage: a missing browser must not stop the rest of the cycle
+        print("Playwright is not installed (pip install playwright && playwright install chromium).")
+        print("Skipping JS-heavy boards.")
+        return
+
+    if not JS_BOARDS_PATH.exists():
+        print(f"ERROR: {JS_BOARDS_PATH} not found. Run search.py first.")
+        sys.exit(1)
+
+    entries = json.loads(JS_BOARDS_PATH.read_text())
+    if args.board:
+        entries = [e for e in entries if e["board"] in args.board]
+    location = load_preferences()["location"]
+
+    print(f"Rendering {len(entries)} JS board URLs with {args.pool_size} browser contexts...")
+    start = time.perf_counter()
+    jobs = asyncio.run(render_entries(entries, location, args.pool_size))
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {len(entries)} pages in {elapsed:.1f}s, {len(jobs)} listings found")
+
+    if args.no_store or not jobs:
+        return
+
+    store = JobStore()
+    ingest_jobs(store, jobs)
+    store.close()
+
+    print("\nRender phase complete.")
+
+
+if __name__ == "__main__":
+    main()
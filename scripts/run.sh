@@ -2,11 +2,20 @@
 # Job Hunter Orchestrator — runs the full pipeline sequentially.
 #
 # Usage:
-#   bash scripts/run.sh           # Full pipeline
+#   bash scripts/run.sh           # Full pipeline (all phases except render and daemon)
 #   bash scripts/run.sh search    # Search only
+#   bash scripts/run.sh watch     # Poll the ATS watchlist only
+#   bash scripts/run.sh render    # Render JS-heavy boards (snapshots only: no Glassdoor parser yet)
 #   bash scripts/run.sh score     # Score only
 #   bash scripts/run.sh tailor    # Tailor only
 #   bash scripts/run.sh apply     # Apply only
+#   bash scripts/run.sh daemon    # Per-board freshness scheduler (runs until stopped)
+#
+# Scoring writes the top 200 qualifying jobs to data/scored-jobs.json (the
+# input of tailor.py; change with score.py --top-k) and every score to
+# data/scores/. data/all-scored-jobs.json is no longer written by default:
+# set ALL_SCORES=1 to export it on each run, or run
+# python3 scripts/score_sink.py --export data/all-scored-jobs.json.
 
 set -euo pipefail
 
@@ -25,9 +34,21 @@ run_search() {
     log "Search phase complete."
 }
 
+run_watch() {
+    log "Polling ATS watchlist..."
+    python3 scripts/ats_watchlist.py >> "$LOG_FILE" 2>&1
+    log "Watchlist phase complete."
+}
+
+run_render() {
+    log "Rendering JS-heavy boards..."
+    python3 scripts/render.py >> "$LOG_FILE" 2>&1
+    log "Render phase complete."
+}
+
 run_score() {
     log "Starting job scoring..."
-    python3 scripts/score.py >> "$LOG_FILE" 2>&1
+    python3 scripts/score.py ${ALL_SCORES:+--all-scores} >> "$LOG_FILE" 2>&1
     log "Scoring phase complete."
 }
 
@@ -43,6 +64,12 @@ run_apply() {
     log "Application phase complete."
 }
 
+run_daemon() {
+    log "Starting freshness scheduler..."
+    python3 scripts/scheduler.py --tailor >> "$LOG_FILE" 2>&1
+    log "Scheduler stopped."
+}
+
 # Determine which phases to run
 PHASE="${1:-all}"
 
@@ -52,6 +79,12 @@ case "$PHASE" in
     search)
         run_search
         ;;
+    watch)
+        run_watch
+        ;;
+    render)
+        run_render
+        ;;
     score)
         run_score
         ;;
@@ -61,14 +94,18 @@ case "$PHASE" in
     apply)
         run_apply
         ;;
+    daemon)
+        run_daemon
+        ;;
     all)
         run_search
+        run_watch
         run_score
         run_tailor
         run_apply
         ;;
     *)
-        echo "Usage: $0 {search|score|tailor|apply|all}"
+        echo "Usage: $0 {search|watch|render|score|tailor|apply|daemon|all}"
         exit 1
         ;;
 esac
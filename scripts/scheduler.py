@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Per-board freshness scheduler — a long-running alternative to run.sh cycles.
+
+Instead of running the whole search -> score -> tailor pipeline at one fixed
+cadence, every board x keyword query gets its own TTL:
+
+- A run that finds new jobs halves the TTL, down to MIN_TTL.
+- A run that finds nothing new grows it by TTL_GROWTH, up to MAX_TTL.
+
+Busy boards are polled often and quiet ones rarely. The schedule (TTL and
+next due time per query) is persisted in data/schedule.json, so a restart
+picks up where the daemon stopped.
+
+The process stays warm between runs: modules, the job store index, the HTTP
+session pool and the indexes and caches of the later stages (near-duplicate
+index, redirect and detail caches, BM25 index, vector and score caches) are
+loaded once. Each tick runs only the due queries, ingests their results like
+search.py, and passes only the newly added jobs downstream
+(score.score_new_jobs). With --tailor, tailor.py is started when a new job
+qualifies. Applying stays a manual step.
+
+A tick that fails is logged and the daemon keeps running; the queries it
+did not record stay due and are retried after ERROR_SLEEP.
+
+Usage:
+    python3 scripts/scheduler.py                 # run until interrupted
+    python3 scripts/scheduler.py --once          # run the due queries once and exit
+    python3 scripts/scheduler.py --status        # print the schedule
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from api_boards import FeedCursors
+from bm25_index import BM25Index
+from canonical_url import default_redirects
+from dedupe import NearDuplicateIndex
+from enrich import DetailCache
+from fetcher import host_of, open_circuits
+from http_cache import ResponseCache, set_default_cache
+from job_store import JobStore
+from query_planner import query_key
+from score import score_new_jobs
+from score_cache import ScoreCache, profile_fingerprint
+from search import build_boards, ingest_jobs, load_preferences, run_queries
+from semantic import VectorCache, get_vectorizer
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+SCHEDULE_PATH = DATA_DIR / "schedule.json"
+
+DEFAULT_TTL = 2 * 3600
+MIN_TTL = 15 * 60
+MAX_TTL = 24 * 3600
+TTL_GROWTH = 1.5
+MAX_SLEEP = 300  # re-check the schedule at least this often (seconds)
+ERROR_SLEEP = 60  # pause after a failed tick (seconds)
+
+
+class Schedule:
+    """{query key: {board, keyword, ttl, next_run, last_new}} persisted as JSON."""
+
+    def __init__(self, path: Path = SCHEDULE_PATH):
+        self.path = path
+        self.tasks: dict[str, dict] = {}
+        if path.exists():
+            try:
+                self.tasks = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                self.tasks = {}
+
+    def sync(self, queries: list[tuple]) -> None:
+        """Add new (board, keyword) queries as due now; drop queries no longer configured."""
+        keys = {}
+        for board, keyword in queries:
+            key = query_key(board, keyword)
+            keys[key] = self.tasks.get(key) or {
+                "board": board,
+                "keyword": keyword,
+                "ttl": DEFAULT_TTL,
+                "next_run": 0,
+                "last_new": 0,
+            }
+        self.tasks = keys
+
+    def due(self, now: float) -> list[tuple]:
+        return [
+            (task["board"], task["keyword"])
+            for task in self.tasks.values()
+            if task["next_run"] <= now
+        ]
+
+    def next_due(self) -> float:
+        return min((task["next_run"] for task in self.tasks.values()), default=time.time())
+
+    def record(self, board: str, keyword: str, new: int, now: float) -> None:
+        task = self.tasks[query_key(board, keyword)]
+        if new:
+            task["ttl"] = max(MIN_TTL, task["ttl"] / 2)
+        else:
+            task["ttl"] = min(MAX_TTL, task["ttl"] * TTL_GROWTH)
+        task["last_new"] = new
+        task["next_run"] = now + task["ttl"]
+
+    def postpone(self, board: str, keyword: str, until: float) -> None:
+        """Move a query's next run without touching its TTL."""
+        self.tasks[query_key(board, keyword)]["next_run"] = until
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.tasks, indent=2))
+
+
+class WarmState:
+    """The indexes and caches ingest and scoring use, loaded once for the daemon."""
+
+    def __init__(self, store: JobStore):
+        self.dedupe = NearDuplicateIndex(store)
+        self.redirects = default_redirects()  # shared with the early-stop checks
+        self.details = DetailCache()
+        self.bm25 = BM25Index()
+        try:
+            self.vectors = VectorCache(get_vectorizer())
+        except RuntimeError:
+            self.vectors = None  # no numpy: semantic similarity is skipped
+        self.scores = ScoreCache(profile_fingerprint())
+
+    def score_cache(self) -> ScoreCache:
+        """The score cache, reloaded when the profile changed since it was loaded."""
+        fingerprint = profile_fingerprint()
+        if self.scores.fingerprint != fingerprint:
+            self.scores = ScoreCache(fingerprint)
+        return self.scores
+
+    def close(self) -> None:
+        self.dedupe.close()
+        self.details.close()
+
+
+def run_due(schedule: Schedule, store: JobStore, prefs: dict, cache: ResponseCache,
+            cursors: FeedCursors, max_pages: int, warm: WarmState) -> list[dict]:
+    """Run the due queries, ingest their results and return the jobs added to the store."""
+    now = time.time()
+    due = schedule.due(now)
+    if not due:
+        return []
+
+    print(f"\n[{datetime.now():%Y-%m-%d %H:%M:%S}] Running {len(due)} due queries")
+    seen_ids = store.id_set()
+    boards = build_boards(prefs["location"], prefs["languages"], max_pages, seen_ids, cursors)
+    results = run_queries(boards, due)
+    cache.save()
+    blocked = open_circuits()  # before ingest's detail fetches can trip more breakers
+
+    all_jobs = [job for jobs in results.values() for job in jobs]
+    added = ingest_jobs(
+        store, all_jobs, index=warm.dedupe, redirects=warm.redirects, details=warm.details
+    )
+
+    # Counted after ingest, which rewrote each job's id in place to the
+    # canonical (clickout-resolved) one the store keys it by
+    hosts = {board: host_of(url) for board, url, _ in boards}
+    for (board, keyword), jobs in results.items():
+        new = len({job["id"] for job in jobs} - seen_ids)
+        if not jobs and hosts[board] in blocked:
+            # Retry once the host's breaker lets a probe through
+            schedule.postpone(board, keyword, now + blocked[hosts[board]])
+            print(f"  {board} / '{keyword}': host unavailable, retrying later")
+            continue
+        schedule.record(board, keyword, new, now)
+        print(f"  {board} / '{keyword}': {len(jobs)} listings, {new} new")
+    schedule.save()
+
+    warm.dedupe.close()
+    warm.details.close()
+    store.flush()
+    cursors.save()
+    return added
+
+
+def run_downstream(added: list[dict], min_score: float, tailor: bool, warm: WarmState) -> None:
+    """Score only the new jobs; start tailoring when one of them qualifies."""
+    if not added:
+        return
+    qualifying = score_new_jobs(
+        added, min_score, cache=warm.score_cache(), index=warm.bm25, vectors=warm.vectors
+    )
+    print(f"  Scored {len(added)} new jobs, {len(qualifying)} qualifying (>= {min_score})")
+    for job in qualifying:
+        print(f"    [{job['score']}/10] {job['title']} @ {job['company']}")
+    if tailor and qualifying:
+        subprocess.run([sys.executable, str(BASE_DIR / "scripts" / "tailor.py")], check=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-board freshness scheduler daemon")
+    parser.add_argument("--once", action="store_true", help="Run the due queries once and exit")
+    parser.add_argument("--status", action="store_true", help="Print the schedule and exit")
+    parser.add_argument("--max-pages", type=int, default=3, help="Max pages per board query")
+    parser.add_argument("--min-score", type=float, default=7.0, help="Minimum score threshold")
+    parser.add_argument(
+        "--tailor", action="store_true", help="Run tailor.py when a new job qualifies"
+    )
+    args = parser.parse_args()
+
+    prefs = load_preferences()
+    keywords = [role.strip() for role in prefs["roles"]]
+    schedule = Schedule()
+    board_names = [board for board, _, _ in build_boards(prefs["location"], prefs["languages"])]
+    schedule.sync([(board, kw) for board in board_names for kw in keywords])
+
+    if args.status:
+        now = time.time()
+        for task in sorted(schedule.tasks.values(), key=lambda t: t["next_run"]):
+            wait = max(0, task["next_run"] - now) / 60
+            print(
+                f"  {task['board']:<16} {task['keyword']:<28} ttl {task['ttl'] / 60:6.0f} min  "
+                f"due in {wait:6.0f} min  (last run: {task['last_new']} new)"
+            )
+        return
+
+    store = JobStore()
+    cache = ResponseCache()
+    set_default_cache(cache)
+    cursors = FeedCursors()
+    warm = WarmState(store)
+    print(f"Scheduler started: {len(schedule.tasks)} queries over {len(board_names)} boards")
+
+    failed = False
+    try:
+        while True:
+            try:
+                added = run_due(schedule, store, prefs, cache, cursors, args.max_pages, warm)
+                run_downstream(added, args.min_score, args.tailor, warm)
+                failed = False
+            except Exception:
+                # One bad tick (parse error, I/O error, ...) must not end the daemon
+                print(f"ERROR: scheduler tick failed, retrying in {ERROR_SLEEP}s")
+                traceback.print_exc()
+                failed = True
+            if args.once:
+                break
+            wait = ERROR_SLEEP if failed else schedule.next_due() - time.time()
+            time.sleep(min(MAX_SLEEP, max(1.0, wait)))
+    except KeyboardInterrupt:
+        print("\nScheduler stopped.")
+    finally:
+        schedule.save()
+        warm.close()
+        store.close()
+    if args.once and failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,70 @@
 """
 Job Matching Scorer — scores and ranks scraped jobs against the user's profile.
 
-Reads raw-jobs.json and resume.md, scores each job 1-10 based on:
+Streams jobs from the job store (data/jobs/, see scripts/job_store.py) and
+reads resume.md, scores each job 1-10 based on:
 - Skills overlap
 - Experience level match
-- Location match
+- Location match (commute distance bands, see scripts/gazetteer.py)
 - Salary range match
 
-Filters out already-applied jobs and saves scored results to data/scored-jobs.json.
+Filters out already-applied jobs and near-duplicates (jobs whose cluster_id
+points at another canonical posting, see scripts/dedupe.py). Each scored job
+keeps its cluster_id. Jobs are streamed, so memory stays flat as the store
+grows:
+- the top K qualifying jobs (--top-k, default TOP_K) are kept in a heap and
+  saved to data/scored-jobs.json, which tailor.py reads;
+- every score goes to a partitioned JSONL sink in data/scores/, where only
+  changed partitions are rewritten (see scripts/score_sink.py). The old
+  data/all-scored-jobs.json is no longer written by default; --all-scores
+  exports the sink to it (one row per job, without descriptions).
+Scores are cached per job content and profile (scripts/score_cache.py), so a
+run only scores new or edited jobs; --rescore ignores the cache. Every job
+also gets a BM25 relevance to the resume (scripts/bm25_index.py) and a
+semantic similarity to the profile (scripts/semantic.py) in its breakdown.
+With numpy installed, jobs are scored in vectorized batches (BatchScorer,
+checked for parity and benchmarked by scripts/bench_score.py).
 
 Usage:
     python3 scripts/score.py
     python3 scripts/score.py --min-score 7
+    python3 scripts/score.py --top-k 50
+    python3 scripts/score.py --all-scores    # also write data/all-scored-jobs.json
+    python3 scripts/score.py --rescore
+    python3 scripts/score.py --vectorizer models/all-MiniLM-L6-v2
 """
 
 import argparse
 import json
 import re
 import sys
+from itertools import islice
 from pathlib import Path
 
+from bm25_index import BM25Index, resume_query
+from canonical_url import canonicalize_url
+from gazetteer import HOME_CITY, get_gazetteer
+from job_store import JobStore
+from score_cache import ScoreCache, profile_fingerprint
+from score_sink import ScoreSink, TopK
+from semantic import DEFAULT_VECTORIZER, VectorCache, get_vectorizer, text_hash
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 PROFILE_DIR = BASE_DIR / "profile"
 
+# (max km from the home city, location points); farther Dutch places get FAR_LOCATION_SCORE
+DISTANCE_BANDS = [(15, 1.5), (40, 1.25), (80, 1.0), (130, 0.75)]
+FAR_LOCATION_SCORE = 0.5
+BATCH_SIZE = 2048  # jobs per streamed chunk (cache lookups, BatchScorer, vectors, sink)
+TOP_K = 200  # qualifying jobs kept in data/scored-jobs.json
+NO_RELEVANCE = {"bm25": 0.0, "terms": []}
+
 
 def load_resume() -> str:
     """Load the resume markdown file."""
@@ -95,112 +136,157 @@ def load_preferences() -> dict:
         elif section == "avoid":
             prefs["avoid"].append(item)
 
+    prefs["home_city"] = load_home_city()
     return prefs
 
 
-def load_raw_jobs() -> list[dict]:
-    """Load scraped jobs from raw-jobs.json."""
-    raw_path = DATA_DIR / "raw-jobs.json"
-    if not raw_path.exists():
-        print("ERROR: raw-jobs.json not found. Run search.py first.")
+def load_home_city() -> str:
+    """The city from the resume's "Location:" line, used as the commute origin."""
+    resume_path = PROFILE_DIR / "resume.md"
+    if resume_path.exists():
+        match = re.search(r"location:\W*([^,\n]+)", resume_path.read_text(), re.IGNORECASE)
+        place = get_gazetteer().lookup(match.group(1)) if match else None
+        if place:
+            return place[0]
+    return HOME_CITY
+
+
+def iter_raw_jobs():
+    """Stream scraped jobs from the job store, one dict at a time."""
+    store = JobStore()
+    if not len(store):
+        print("ERROR: job store is empty. Run search.py first.")
         sys.exit(1)
     try:
-        return json.loads(raw_path.read_text())
-    except json.JSONDecodeError as e:
-        print(f"ERROR: Invalid JSON in raw-jobs.json: {e}")
-        sys.exit(1)
+        yield from store.iter_jobs()
+    finally:
+        store.close()
 
 
 def load_applied_jobs() -> set:
-    """Load URLs of already-applied jobs."""
+    """
+    Load URLs of already-applied jobs, both as recorded and in canonical form
+    (stored jobs carry the canonical url, see canonical_url.py).
+    """
     apps_path = DATA_DIR / "applications.json"
     if not apps_path.exists():
         return set()
     try:
         applications = json.loads(apps_path.read_text())
-        return {app["url"] for app in applications if "url" in app}
+        urls = {app["url"] for app in applications if "url" in app}
     except (json.JSONDecodeError, KeyError):
         return set()
+    return urls | {canonicalize_url(url) for url in urls}
+
+
+def is_applied(job: dict, applied_urls: set) -> bool:
+    return job.get("url") in applied_urls or job.get("raw_url") in applied_urls
+
+
+# Known tech skills/keywords. Every pattern starts and ends with \b.
+SKILL_PATTERNS = [
+    # Languages
+    r"\bc#\b", r"\b\.net\b", r"\basp\.net\b", r"\bpython\b", r"\bjavascript\b",
+    r"\btypescript\b", r"\bjava\b", r"\bsql\b", r"\bhtml\b", r"\bcss\b",
+    r"\bc\+\+\b", r"\bgo\b", r"\brust\b", r"\bruby\b", r"\bphp\b",
+    r"\bkotlin\b", r"\bswift\b", r"\br\b", r"\bscala\b",
+    # Frameworks
+    r"\breact\b", r"\bangular\b", r"\bvue\b", r"\bnode\.?js\b",
+    r"\bflask\b", r"\bdjango\b", r"\bfastapi\b", r"\bspring\b",
+    r"\b\.net\s*core\b", r"\blazor\b", r"\bnext\.?js\b",
+    r"\bexpress\b", r"\brails\b", r"\blaravel\b",
+    # Tools & Platforms
+    r"\bdocker\b", r"\bkubernetes\b", r"\bk8s\b", r"\bazure\b", r"\baws\b",
+    r"\bgcp\b", r"\bgit\b", r"\bci/cd\b", r"\bjenkins\b", r"\bterraform\b",
+    r"\blinux\b", r"\bredis\b", r"\bmongodb\b", r"\bpostgresql?\b",
+    r"\belasticsearch\b", r"\brabbitmq\b", r"\bkafka\b",
+    # Domains
+    r"\bmachine learning\b", r"\bml\b", r"\bai\b", r"\bdeep learning\b",
+    r"\bdata science\b", r"\bdevops\b", r"\bscrum\b", r"\bagile\b",
+    r"\bmicroservices\b", r"\brest\s*api\b", r"\bgraphql\b",
+    r"\biot\b", r"\bmes\b", r"\bmanufacturing\b", r"\bautomation\b",
+    r"\bsaas\b", r"\bfull.?stack\b",
+]
+
+# All patterns as one alternation inside a lookahead, tried only at word
+# boundaries. The lookahead consumes nothing, so matches of different patterns
+# may overlap ("asp.net core" yields asp.net, .net core and .net), like the
+# per-pattern searches did. The matched text is mapped back to its pattern
+# (cached per distinct text), which is much faster than named groups. The only
+# two patterns that can match at the same position are .net core and .net,
+# so .net core is tried first and implies .net when the words are separated by
+# whitespace.
+_NET = r"\b\.net\b"
+_NET_CORE = r"\b\.net\s*core\b"
+_SKILL_ORDER = [_NET_CORE] + [p for p in SKILL_PATTERNS if p != _NET_CORE]
+_SKILL_BODIES = [re.compile(p[2:-2]) for p in _SKILL_ORDER]
+
+
+def _prefix_alternation(bodies: list[str]) -> str:
+    """
+    Alternation of pattern bodies grouped by their first atom, keeping their
+    order within each group: "a(?:ws|zure)|c(?:#|ss)". Alternatives with
+    different first atoms cannot match at the same position, so this matches
+    exactly what the flat alternation does, but re tries one branch instead of
+    all of them at each word boundary.
+    """
+    groups: dict[str, list[str]] = {}
+    for body in bodies:
+        head = body[:2] if body.startswith("\\") else body[0]
+        groups.setdefault(head, []).append(body[len(head):])
+    return "|".join(f"{head}(?:{'|'.join(tails)})" for head, tails in groups.items())
 
 
-def extract_skills_from_text(text: str) -> set[str]:
-    """Extract known tech skills/keywords from text."""
-    # Common tech skills to look for
-    skill_patterns = [
-        # Languages
-        r"\bc#\b", r"\b\.net\b", r"\basp\.net\b", r"\bpython\b", r"\bjavascript\b",
-        r"\btypescript\b", r"\bjava\b", r"\bsql\b", r"\bhtml\b", r"\bcss\b",
-        r"\bc\+\+\b", r"\bgo\b", r"\brust\b", r"\bruby\b", r"\bphp\b",
-        r"\bkotlin\b", r"\bswift\b", r"\br\b", r"\bscala\b",
-        # Frameworks
-        r"\breact\b", r"\bangular\b", r"\bvue\b", r"\bnode\.?js\b",
-        r"\bflask\b", r"\bdjango\b", r"\bfastapi\b", r"\bspring\b",
-        r"\b\.net\s*core\b", r"\blazor\b", r"\bnext\.?js\b",
-        r"\bexpress\b", r"\brails\b", r"\blaravel\b",
-        # Tools & Platforms
-        r"\bdocker\b", r"\bkubernetes\b", r"\bk8s\b", r"\bazure\b", r"\baws\b",
-        r"\bgcp\b", r"\bgit\b", r"\bci/cd\b", r"\bjenkins\b", r"\bterraform\b",
-        r"\blinux\b", r"\bredis\b", r"\bmongodb\b", r"\bpostgresql?\b",
-        r"\belasticsearch\b", r"\brabbitmq\b", r"\bkafka\b",
-        # Domains
-        r"\bmachine learning\b", r"\bml\b", r"\bai\b", r"\bdeep learning\b",
-        r"\bdata science\b", r"\bdevops\b", r"\bscrum\b", r"\bagile\b",
-        r"\bmicroservices\b", r"\brest\s*api\b", r"\bgraphql\b",
-        r"\biot\b", r"\bmes\b", r"\bmanufacturing\b", r"\bautomation\b",
-        r"\bsaas\b", r"\bfull.?stack\b",
-    ]
-
-    found = set()
-    text_lower = text.lower()
-    for pattern in skill_patterns:
-        if re.search(pattern, text_lower):
-            # Normalize the matched skill name
-            match = re.search(pattern, text_lower)
-            if match:
-                found.add(match.group(0).strip())
-    return found
+_SKILL_RE = re.compile(r"\b(?=(" + _prefix_alternation([p[2:-2] for p in _SKILL_ORDER]) + r")\b)")
+_NET_INDEX = _SKILL_ORDER.index(_NET)
+_NET_AFTER_CORE_RE = re.compile(r"\.net\s")
+_skill_index: dict[str, int] = {}
 
 
-def score_job(job: dict, resume_text: str, resume_skills: set, prefs: dict) -> dict:
-    """
-    Score a single job listing against the profile. Returns the job dict
-    with added 'score' and 'score_breakdown' fields.
-    """
-    score = 0.0
-    breakdown = {}
+def _pattern_index(skill: str) -> int:
+    """Index of the first pattern in _SKILL_ORDER that matched `skill` in full."""
+    index = _skill_index.get(skill)
+    if index is None:
+        index = next(i for i, body in enumerate(_SKILL_BODIES) if body.fullmatch(skill))
+        _skill_index[skill] = index
+    return index
 
-    job_text = f"{job.get('title', '')} {job.get('description', '')} {job.get('company', '')}".lower()
-    job_skills = extract_skills_from_text(job_text)
 
-    # 1. Skills overlap (0-4 points)
-    if resume_skills and job_skills:
-        overlap = resume_skills & job_skills
-        overlap_ratio = len(overlap) / max(len(job_skills), 1)
-        skills_score = min(4.0, overlap_ratio * 5)
-        breakdown["skills_match"] = {
-            "score": round(skills_score, 1),
-            "matched": sorted(overlap),
-            "job_requires": sorted(job_skills),
-        }
-    else:
-        skills_score = 2.0  # Neutral if we can't determine
-        breakdown["skills_match"] = {"score": 2.0, "note": "Could not determine skills"}
-    score += skills_score
-
-    # 2. Title/Role match (0-3 points)
+def extract_skills_from_text(text: str) -> set[str]:
+    """
+    Extract known tech skills/keywords from text in a single pass. Each
+    pattern contributes the text of its first (leftmost) match.
+    """
+    found = {}
+    for match in _SKILL_RE.finditer(text.lower()):
+        skill = match.group(1)
+        index = _pattern_index(skill)
+        if index not in found:
+            found[index] = skill.strip()
+        # Every .net core match, not just the first: a leftmost ".netcore"
+        # does not imply .net, a later ".net core" does
+        if index == 0 and _NET_AFTER_CORE_RE.match(skill):
+            found.setdefault(_NET_INDEX, ".net")
+    return set(found.values())
+
+
+def title_match(title: str, prefs: dict) -> float:
+    """Title points (0-3): the best share of a target role's words found in the title."""
     title_score = 0.0
-    job_title = job.get("title", "").lower()
+    job_title = title.lower()
     for role in prefs.get("target_roles", []):
         role_words = role.lower().split()
         matches = sum(1 for word in role_words if word in job_title)
         role_match = matches / max(len(role_words), 1)
         title_score = max(title_score, role_match * 3)
-    breakdown["title_match"] = round(title_score, 1)
-    score += title_score
+    return title_score
 
-    # 3. Location match (0-1.5 points)
-    job_location = job.get("location", "").lower()
+
+def location_match(location: str, prefs: dict) -> tuple[float, float | None]:
+    """Location points (0-1.5) and the distance from home in km (None if unknown)."""
+    job_location = location.lower()
     location_score = 0.0
+    distance = get_gazetteer(prefs.get("home_city", HOME_CITY)).distance_km(job_location)
     if "remote" in job_location:
         location_score = 1.5
     else:
@@ -208,13 +294,19 @@ def score_job(job: dict, resume_text: str, resume_skills: set, prefs: dict) -> d
             if loc.lower() in job_location:
                 location_score = 1.5
                 break
-        if location_score == 0 and ("netherlands" in job_location or "nederland" in job_location):
+        if location_score == 0 and distance is not None:
+            location_score = next(
+                (points for max_km, points in DISTANCE_BANDS if distance <= max_km),
+                FAR_LOCATION_SCORE,
+            )
+        elif location_score == 0 and ("netherlands" in job_location or "nederland" in job_location):
             location_score = 0.75
-    breakdown["location_match"] = round(location_score, 1)
-    score += location_score
+    return location_score, distance
 
-    # 4. Salary check (0-1 points)
-    salary_text = job.get("salary", "").lower()
+
+def salary_match(salary: str, prefs: dict) -> float:
+    """Salary points (0-1); 0.5 when no salary is listed or it cannot be parsed."""
+    salary_text = salary.lower()
     salary_score = 0.5  # Neutral if not listed
     if salary_text:
         # Try to extract numeric salary
@@ -234,6 +326,49 @@ def score_job(job: dict, resume_text: str, resume_skills: set, prefs: dict) -> d
                     salary_score = 0.0
             except ValueError:
                 salary_score = 0.5
+    return salary_score
+
+
+def score_job(job: dict, resume_text: str, resume_skills: set, prefs: dict) -> dict:
+    """
+    Score a single job listing against the profile. Returns the job dict
+    with added 'score' and 'score_breakdown' fields.
+    """
+    score = 0.0
+    breakdown = {}
+
+    job_text = f"{job.get('title', '')} {job.get('description', '')} {job.get('company', '')}".lower()
+    job_skills = extract_skills_from_text(job_text)
+
+    # 1. Skills overlap (0-4 points)
+    if resume_skills and job_skills:
+        overlap = resume_skills & job_skills
+        overlap_ratio = len(overlap) / max(len(job_skills), 1)
+        skills_score = min(4.0, overlap_ratio * 5)
+        breakdown["skills_match"] = {
+            "score": round(skills_score, 1),
+            "matched": sorted(overlap),
+            "job_requires": sorted(job_skills),
+        }
+    else:
+        skills_score = 2.0  # Neutral if we can't determine
+        breakdown["skills_match"] = {"score": 2.0, "note": "Could not determine skills"}
+    score += skills_score
+
+    # 2. Title/Role match (0-3 points)
+    title_score = title_match(job.get("title", ""), prefs)
+    breakdown["title_match"] = round(title_score, 1)
+    score += title_score
+
+    # 3. Location match (0-1.5 points)
+    location_score, distance = location_match(job.get("location") or "", prefs)
+    breakdown["location_match"] = round(location_score, 2)
+    if distance is not None:
+        breakdown["distance_km"] = round(distance)
+    score += location_score
+
+    # 4. Salary check (0-1 points)
+    salary_score = salary_match(job.get("salary") or "", prefs)
     breakdown["salary_match"] = round(salary_score, 1)
     score += salary_score
 
@@ -262,9 +397,264 @@ def score_job(job: dict, resume_text: str, resume_skills: set, prefs: dict) -> d
     return job
 
 
+class BatchScorer:
+    """
+    Scores chunks of jobs with NumPy array operations, with exactly the same
+    results as score_job. The per-field rules are score_job's own
+    (extract_skills_from_text, title_match, location_match, salary_match);
+    what is batched is how they are applied and combined:
+
+    - skills: a (jobs x skills) boolean matrix over a growing vocabulary; the
+      overlap with the resume is a masked row sum.
+    - title / location / salary: codes into tables filled once per distinct
+      string, kept across chunks.
+    - industry / avoid: (terms x jobs) substring hit matrices.
+
+    Components are summed in score_job's order and stored with Python's
+    round(), so the floats are identical. Requires numpy; parity and speed
+    are checked by scripts/bench_score.py.
+    """
+
+    def __init__(self, resume_skills: set, prefs: dict):
+        self.resume_skills = resume_skills
+        self.prefs = prefs
+        self.industries = [industry.lower() for industry in prefs.get("preferred_industries", [])]
+        self.avoid = prefs.get("avoid", [])
+        self.skill_columns: dict[str, int] = {}
+        self.titles: dict[str, float] = {}
+        self.locations: dict[str, tuple[float, float | None]] = {}
+        self.salaries: dict[str, float] = {}
+
+    @staticmethod
+    def _lookup(keys: list[str], table: dict, rule) -> list:
+        """Per-key values from `table`, computing `rule(key)` once for keys not seen yet."""
+        for key in set(keys).difference(table):
+            table[key] = rule(key)
+        return [table[key] for key in keys]
+
+    @staticmethod
+    def _term_hits(texts: list[str], terms: list[str]):
+        """(terms x jobs) matrix: term occurs in the job's text."""
+        hits = np.zeros((len(terms), len(texts)), dtype=bool)
+        for t, term in enumerate(terms):
+            hits[t] = [term in text for text in texts]
+        return hits
+
+    def score(self, jobs: list[dict]) -> list[dict]:
+        """Score a chunk of jobs in place and return it, like score_job per job."""
+        n = len(jobs)
+        if not n:
+            return jobs
+        prefs = self.prefs
+
+        texts = [
+            f"{job.get('title', '')} {job.get('description', '')} {job.get('company', '')}".lower()
+            for job in jobs
+        ]
+        # 1. Skills overlap
+        job_skills = [extract_skills_from_text(text) for text in texts]
+        cells = [
+            (row, self.skill_columns.setdefault(skill, len(self.skill_columns)))
+            for row, skills in enumerate(job_skills)
+            for skill in skills
+        ]
+        skills = np.zeros((n, len(self.skill_columns)), dtype=bool)
+        if cells:
+            rows, columns = zip(*cells)
+            skills[list(rows), list(columns)] = True
+        resume_mask = np.zeros(len(self.skill_columns), dtype=bool)
+        resume_mask[[self.skill_columns[s] for s in self.resume_skills if s in self.skill_columns]] = True
+        job_counts = skills.sum(axis=1)
+        overlap_counts = (skills & resume_mask).sum(axis=1)
+        known = (job_counts > 0) & bool(self.resume_skills)
+        ratio = overlap_counts / np.maximum(job_counts, 1)
+        skills_score = np.where(known, np.minimum(4.0, ratio * 5), 2.0)
+
+        # 2. Title/role match, 3 + 4. location and salary
+        title_score = np.array(self._lookup(
+            [job.get("title", "") for job in jobs], self.titles, lambda t: title_match(t, prefs)
+        ))
+        locations = self._lookup(
+            [job.get("location") or "" for job in jobs], self.locations,
+            lambda loc: location_match(loc, prefs),
+        )
+        location_score = np.array([points for points, _ in locations])
+        salary_score = np.array(self._lookup(
+            [job.get("salary") or "" for job in jobs], self.salaries, lambda s: salary_match(s, prefs)
+        ))
+
+        # 5. Industry match and avoid penalties
+        industry_score = np.where(self._term_hits(texts, self.industries).any(axis=0), 0.5, 0.0)
+        avoid_hits = self._term_hits(texts, self.avoid)
+        penalty = 2.0 * avoid_hits.sum(axis=0)
+
+        score = np.zeros(n)
+        score += skills_score
+        score += title_score
+        score += location_score
+        score += salary_score
+        score += industry_score
+        score -= penalty
+        final = np.clip(score, 1.0, 10.0)
+
+        # Breakdowns with Python's round(), exactly as score_job stores them
+        columns = zip(
+            known.tolist(), skills_score.tolist(), title_score.tolist(), location_score.tolist(),
+            salary_score.tolist(), industry_score.tolist(), final.tolist(),
+        )
+        avoid_rows = avoid_hits.T.tolist()
+        for i, (job, values) in enumerate(zip(jobs, columns)):
+            is_known, skills_points, title_points, location_points, salary_points, \
+                industry_points, final_score = values
+            if is_known:
+                skills_match = {
+                    "score": round(skills_points, 1),
+                    "matched": sorted(self.resume_skills & job_skills[i]),
+                    "job_requires": sorted(job_skills[i]),
+                }
+            else:
+                skills_match = {"score": 2.0, "note": "Could not determine skills"}
+            breakdown = {
+                "skills_match": skills_match,
+                "title_match": round(title_points, 1),
+                "location_match": round(location_points, 2),
+            }
+            distance = locations[i][1]
+            if distance is not None:
+                breakdown["distance_km"] = round(distance)
+            breakdown["salary_match"] = round(salary_points, 1)
+            breakdown["industry_match"] = round(industry_points, 1)
+            penalties = [item for item, hit in zip(self.avoid, avoid_rows[i]) if hit]
+            if penalties:
+                breakdown["penalties"] = penalties
+            job["score"] = round(final_score, 1)
+            job["score_breakdown"] = breakdown
+        return jobs
+
+
+def score_jobs(jobs, resume_text: str, resume_skills: set, prefs: dict) -> list[dict]:
+    """
+    Score an iterable of jobs: with BatchScorer in chunks of BATCH_SIZE when
+    numpy is installed, with score_job one by one otherwise. Same results.
+    """
+    if np is None:
+        return [score_job(job, resume_text, resume_skills, prefs) for job in jobs]
+    scorer = BatchScorer(resume_skills, prefs)
+    jobs = iter(jobs)
+    scored = []
+    while chunk := list(islice(jobs, BATCH_SIZE)):
+        scored.extend(scorer.score(chunk))
+    return scored
+
+
+def add_relevance(jobs: list[dict], resume_text: str, index: BM25Index | None = None) -> BM25Index:
+    """
+    Add the jobs to the BM25 index and each job's relevance to the resume as
+    score_breakdown["relevance"].
+    """
+    if index is None:
+        index = BM25Index()
+    index.update(jobs)
+    index.save()
+    relevance = index.relevance(resume_query(resume_text, index))
+    for job in jobs:
+        job["score_breakdown"]["relevance"] = relevance.get(job.get("id"), NO_RELEVANCE)
+    return index
+
+
+def profile_text(resume_text: str, prefs: dict) -> str:
+    """The text semantic similarity is measured against: resume plus target roles."""
+    return f"{resume_text}\n{' '.join(prefs.get('target_roles', []))}"
+
+
+def add_semantic(jobs: list[dict], vectors: VectorCache, profile: str) -> list[str]:
+    """
+    Add each job's cosine similarity to the profile text as
+    score_breakdown["semantic"]. Returns the text hashes of the jobs, for
+    VectorCache.retain.
+    """
+    texts = [f"{job.get('title') or ''}\n{job.get('description') or ''}" for job in jobs]
+    for job, similarity in zip(jobs, vectors.similarities(profile, texts).tolist()):
+        job["score_breakdown"]["semantic"] = round(similarity, 3)
+    return [text_hash(text) for text in texts]
+
+
+def save_qualifying(qualifying: list[dict]) -> None:
+    """Write the ranked qualifying jobs to data/scored-jobs.json (read by tailor.py)."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    scored_path = DATA_DIR / "scored-jobs.json"
+    scored_path.write_text(json.dumps(qualifying, indent=2, ensure_ascii=False))
+
+
+def score_new_jobs(jobs: list[dict], min_score: float = 7.0, top_k: int = TOP_K,
+                   cache: ScoreCache | None = None, index: BM25Index | None = None,
+                   vectors: VectorCache | None = None) -> list[dict]:
+    """
+    Score only the given (newly added) jobs and merge them into the existing
+    outputs, instead of rescoring the whole store: their sink partitions and
+    the top-K in scored-jobs.json. Used by the scheduler daemon, which passes
+    in its loaded score cache, BM25 index and vector cache. Returns the new
+    jobs that qualify.
+    """
+    resume_text = load_resume()
+    resume_skills = extract_skills_from_text(resume_text)
+    prefs = load_preferences()
+    applied_urls = load_applied_jobs()
+
+    new_scored = score_jobs(
+        (
+            dict(job)
+            for job in jobs
+            if not is_applied(job, applied_urls)
+            and job.get("cluster_id", job.get("id")) == job.get("id")
+        ),
+        resume_text, resume_skills, prefs,
+    )
+    if cache is None:
+        cache = ScoreCache(profile_fingerprint())
+    cache.store(new_scored)
+    cache.save()
+    add_relevance(new_scored, resume_text, index)
+    if vectors is None and np is not None:
+        vectors = VectorCache(get_vectorizer())
+    if vectors is not None:
+        add_semantic(new_scored, vectors, profile_text(resume_text, prefs))
+        vectors.save()
+    ScoreSink().upsert(new_scored)
+
+    scored_path = DATA_DIR / "scored-jobs.json"
+    existing = []
+    if scored_path.exists():
+        try:
+            existing = json.loads(scored_path.read_text())
+        except json.JSONDecodeError:
+            existing = []
+    top = TopK(top_k)
+    new_ids = {job["id"] for job in new_scored}
+    for job in [job for job in existing if job.get("id") not in new_ids] + new_scored:
+        if job["score"] >= min_score:
+            top.push(job)
+    save_qualifying(top.ranked())
+    return [job for job in new_scored if job["score"] >= min_score]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Job matching scorer")
     parser.add_argument("--min-score", type=float, default=7.0, help="Minimum score threshold")
+    parser.add_argument(
+        "--top-k", type=int, default=TOP_K, help="Qualifying jobs kept in scored-jobs.json"
+    )
+    parser.add_argument(
+        "--all-scores", action="store_true",
+        help="Also export every score, best first, to data/all-scored-jobs.json",
+    )
+    parser.add_argument(
+        "--rescore", action="store_true", help="Ignore cached scores and rescore every job"
+    )
+    parser.add_argument(
+        "--vectorizer", type=str, default=DEFAULT_VECTORIZER,
+        help="Semantic vectorizer: 'hashing' or a local sentence-transformers model",
+    )
     args = parser.parse_args()
 
     print("Loading profile data...")
@@ -275,48 +665,103 @@ def main():
     print(f"  Target roles: {prefs['target_roles']}")
 
     print("\nLoading jobs...")
-    raw_jobs = load_raw_jobs()
     applied_urls = load_applied_jobs()
-    print(f"  Raw jobs: {len(raw_jobs)}")
-    print(f"  Already applied: {len(applied_urls)}")
-
-    # Filter out already-applied jobs
-    jobs_to_score = [j for j in raw_jobs if j.get("url") not in applied_urls]
-    print(f"  Jobs to score: {len(jobs_to_score)}")
-
-    # Score each job
+    print(f"  Already applied: {len(applied_urls)} URLs (as recorded and canonical)")
+    counts = {"raw": 0, "duplicates": 0, "scored": 0, "qualifying": 0}
+
+    def canonical_jobs():
+        """Stream jobs from the store, skipping already-applied ones and near-duplicates."""
+        counts["raw"] = counts["duplicates"] = 0
+        for job in iter_raw_jobs():
+            counts["raw"] += 1
+            if is_applied(job, applied_urls):
+                continue
+            # Near-duplicates of another posting are scored once, via the canonical job
+            if job.get("cluster_id", job.get("id")) != job.get("id"):
+                counts["duplicates"] += 1
+                continue
+            yield job
+
+    # Pass 1: bring the relevance index up to date. It depends on the whole
+    # corpus, so relevance is refreshed for every job on every run
+    index = BM25Index()
+    job_ids = set()
+    for job in canonical_jobs():
+        index.update([job])
+        job_ids.add(job.get("id"))
+    index.retain(job_ids)
+    index.save()
+    relevance = index.relevance(resume_query(resume_text, index))
+    print(f"  Relevance index: {len(index)} jobs, {len(index.postings)} terms")
+
+    # Pass 2: stream the jobs in batches. Unchanged jobs get their cached
+    # score, only new or edited ones are scored. Every job goes to the sink,
+    # only the top K qualifying ones stay in memory
     print("\nScoring jobs...")
-    scored_jobs = []
-    for job in jobs_to_score:
-        scored = score_job(job, resume_text, resume_skills, prefs)
-        scored_jobs.append(scored)
-
-    # Sort by score descending
-    scored_jobs.sort(key=lambda j: j["score"], reverse=True)
-
-    # Filter by minimum score
-    qualifying = [j for j in scored_jobs if j["score"] >= args.min_score]
+    cache = ScoreCache(profile_fingerprint())
+    if args.rescore:
+        cache.clear()
+    try:
+        vectors = VectorCache(get_vectorizer(args.vectorizer)) if np is not None else None
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    profile = profile_text(resume_text, prefs)
+    text_hashes = set()
+    sink = ScoreSink()
+    qualifying = TopK(args.top_k)
+    best = TopK(10)
+    jobs = canonical_jobs()
+    while chunk := list(islice(jobs, BATCH_SIZE)):
+        pending = [job for job in chunk if not cache.lookup(job)]
+        score_jobs(pending, resume_text, resume_skills, prefs)
+        cache.store(pending)
+        if vectors is not None:
+            text_hashes.update(add_semantic(chunk, vectors, profile))
+        for job in chunk:
+            job["score_breakdown"]["relevance"] = relevance.get(job.get("id"), NO_RELEVANCE)
+            sink.write(job)
+            best.push(job)
+            counts["scored"] += 1
+            if job["score"] >= args.min_score:
+                counts["qualifying"] += 1
+                qualifying.push(job)
+    changed = sink.commit()
+    cache.retain(job_ids)
+    cache.save()
+    if vectors is not None:
+        vectors.retain(text_hashes)
+        vectors.save()
+    save_qualifying(qualifying.ranked())
+
+    print(f"  Raw jobs: {counts['raw']}")
+    print(f"  Near-duplicates skipped: {counts['duplicates']}")
+    print(f"  Jobs scored: {counts['scored']}")
+    print(f"  Score cache: {cache.summary()}")
+    if vectors is not None:
+        print(f"  Semantic vectors: {len(vectors)} cached ({vectors.vectorizer.name})")
 
     print(f"\nResults:")
-    print(f"  Total scored: {len(scored_jobs)}")
-    print(f"  Qualifying (>= {args.min_score}): {len(qualifying)}")
+    print(f"  Total scored: {counts['scored']}")
+    print(f"  Qualifying (>= {args.min_score}): {counts['qualifying']}")
 
-    if scored_jobs:
+    if counts["scored"]:
         print(f"\nTop 10 jobs:")
-        for i, job in enumerate(scored_jobs[:10], 1):
+        for i, job in enumerate(best.ranked(), 1):
             print(f"  {i}. [{job['score']}/10] {job['title']} @ {job['company']}")
             print(f"     {job['url']}")
 
-    # Save scored jobs
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    scored_path = DATA_DIR / "scored-jobs.json"
-    scored_path.write_text(json.dumps(qualifying, indent=2, ensure_ascii=False))
-    print(f"\nSaved {len(qualifying)} qualifying jobs to {scored_path}")
-
-    # Also save all scores for reference
-    all_scored_path = DATA_DIR / "all-scored-jobs.json"
-    all_scored_path.write_text(json.dumps(scored_jobs, indent=2, ensure_ascii=False))
-    print(f"Saved all {len(scored_jobs)} scored jobs to {all_scored_path}")
+    kept = min(counts["qualifying"], args.top_k)
+    print(f"\nSaved the top {kept} qualifying jobs to {DATA_DIR / 'scored-jobs.json'}")
+    print(
+        f"Saved all {counts['scored']} scores to {sink.root} "
+        f"({len(changed)}/{sink.partitions} partitions changed)"
+    )
+    all_path = DATA_DIR / "all-scored-jobs.json"
+    if args.all_scores:
+        print(f"Exported {sink.export(all_path)} scores to {all_path}")
+    else:
+        print(f"  ({all_path.name} is only written with --all-scores)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Incremental scoring cache for score.py.
+
+A job's score depends only on the job fields score_job reads (title,
+description, company, location, salary) and on the profile: resume.md,
+preferences.md, the place gazetteer used for commute distances, and the
+scoring rules themselves (SCORE_VERSION). The cache stores every job's score
+and score_breakdown under its id, together with a hash of those job fields.
+The whole cache is stamped with a fingerprint of the profile.
+
+- A job whose content hash matches its entry gets the cached score back.
+- A new or edited job is rescored.
+- A different profile fingerprint (an edited resume or preferences file)
+  discards every entry on load, so everything is rescored.
+
+Steady-state runs only score the jobs added or changed since the last run.
+The cache lives in data/score-cache.json and is written once per run.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from gazetteer import PLACES_PATH
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PROFILE_DIR = BASE_DIR / "profile"
+CACHE_PATH = DATA_DIR / "score-cache.json"
+
+SCORE_VERSION = 1  # bump when the scoring rules in score.py change
+SCORED_FIELDS = ("title", "description", "company", "location", "salary")
+
+
+def profile_fingerprint() -> str:
+    """Hash of everything besides the job itself that a score depends on."""
+    digest = hashlib.sha1(f"score-v{SCORE_VERSION}".encode("utf-8"))
+    for path in (PROFILE_DIR / "resume.md", PROFILE_DIR / "preferences.md", PLACES_PATH):
+        digest.update(b"\x1e")
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def content_hash(job: dict) -> str:
+    """Hash of the job fields that score_job reads."""
+    content = "\x1f".join(str(job.get(field) or "") for field in SCORED_FIELDS)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """On-disk {job id: {hash, score, score_breakdown}} for one profile fingerprint."""
+
+    def __init__(self, fingerprint: str, path: Path = CACHE_PATH):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.lock = threading.Lock()
+        self.stats = {"hit": 0, "miss": 0}
+        self.invalidated = False
+        self.entries: dict[str, dict] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                data = {}
+            if data.get("profile") == fingerprint:
+                self.entries = data.get("jobs", {})
+            else:
+                self.invalidated = bool(data)
+
+    def lookup(self, job: dict) -> bool:
+        """Fill in a job's cached score and breakdown. False when it has to be (re)scored."""
+        with self.lock:
+            entry = self.entries.get(job.get("id"))
+            if entry is None or entry["hash"] != content_hash(job):
+                self.stats["miss"] += 1
+                return False
+            self.stats["hit"] += 1
+        job["score"] = entry["score"]
+        job["score_breakdown"] = dict(entry["score_breakdown"])
+        return True
+
+    def store(self, jobs: list[dict]) -> None:
+        """Remember the scores of freshly scored jobs."""
+        with self.lock:
+            for job in jobs:
+                if job.get("id"):
+                    self.entries[job["id"]] = {
+                        "hash": content_hash(job),
+                        "score": job["score"],
+                        "score_breakdown": dict(job["score_breakdown"]),
+                    }
+
+    def retain(self, job_ids: set) -> None:
+        """Drop the entries of jobs that are gone from the store (or now skipped)."""
+        with self.lock:
+            self.entries = {k: v for k, v in self.entries.items() if k in job_ids}
+
+    def clear(self) -> None:
+        """Forget every entry, so every job is rescored."""
+        with self.lock:
+            self.entries = {}
+
+    def save(self) -> None:
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(
+                json.dumps({"profile": self.fingerprint, "jobs": self.entries}, ensure_ascii=False)
+            )
+
+    def summary(self) -> str:
+        s = self.stats
+        note = " (profile changed, cache reset)" if self.invalidated else ""
+        return f"{s['hit']} cached, {s['miss']} rescored{note}"
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Streaming outputs of score.py: a top-K heap and a partitioned score sink.
+
+score.py used to hold every scored job (descriptions included) in memory,
+sort the whole list and rewrite data/all-scored-jobs.json with indent=2 on
+every run. Now it streams, and data/all-scored-jobs.json is only written on
+request (score.py --all-scores or --export below, rows without descriptions):
+
+- TopK keeps the best K qualifying jobs in a min-heap while the jobs stream
+  past. Only those K end up in data/scored-jobs.json, ranked like the old
+  sort: by score, ties in store order.
+- ScoreSink stores one compact JSON line per scored job: id, title, company,
+  location, url, cluster_id, score and breakdown, but no description. Rows
+  are spread over PARTITIONS files by a hash of the job id:
+
+      data/scores/part-00.jsonl ... part-15.jsonl
+      data/scores/manifest.json     {part: {"rows": n, "sha1": digest}}
+
+  A full run streams rows into temporary partition files and hashes them on
+  the way. A partition replaces the previous file only when its digest
+  changed, so unchanged partitions are never rewritten. upsert() (used for
+  the scheduler's new jobs) rewrites just the partitions the jobs hash to.
+
+The BM25 "relevance" field is left out of the sink: it depends on the whole
+corpus and would change every partition on every run. It is kept in
+scored-jobs.json.
+
+Usage:
+    python3 scripts/score_sink.py --stats
+    python3 scripts/score_sink.py --export data/all-scored-jobs.json   # one sorted JSON file
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import zlib
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+SCORES_DIR = DATA_DIR / "scores"
+
+PARTITIONS = 16
+ROW_FIELDS = ("id", "title", "company", "location", "url", "cluster_id", "score", "score_breakdown")
+VOLATILE_BREAKDOWN = ("relevance",)  # corpus-dependent, not stored in the sink
+
+
+class TopK:
+    """The k best jobs by score seen so far; ties go to the job pushed first."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.heap: list[tuple] = []
+        self.seen = 0
+
+    def push(self, job: dict) -> None:
+        entry = (job["score"], -self.seen, job)
+        self.seen += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, entry)
+
+    def ranked(self) -> list[dict]:
+        return [job for _, _, job in sorted(self.heap, key=lambda e: (-e[0], -e[1]))]
+
+
+def compact_row(job: dict) -> dict:
+    row = {field: job[field] for field in ROW_FIELDS if field in job}
+    breakdown = row.get("score_breakdown")
+    if breakdown and any(key in breakdown for key in VOLATILE_BREAKDOWN):
+        row["score_breakdown"] = {k: v for k, v in breakdown.items() if k not in VOLATILE_BREAKDOWN}
+    return row
+
+
+def _encode(row: dict) -> bytes:
+    return (json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class ScoreSink:
+    """Hash-partitioned JSONL rows of every scored job, see module docstring."""
+
+    def __init__(self, root: Path = SCORES_DIR, partitions: int = PARTITIONS):
+        self.root = root
+        self.partitions = partitions
+        self.manifest_path = root / "manifest.json"
+        self.manifest: dict[str, dict] = {}
+        if self.manifest_path.exists():
+            try:
+                data = json.loads(self.manifest_path.read_text())
+            except json.JSONDecodeError:
+                data = {}
+            if data.get("partitions") == partitions:
+                self.manifest = data.get("parts", {})
+        self._writers: dict[str, tuple] = {}
+
+    def partition_of(self, job_id: str) -> str:
+        return f"{zlib.crc32(str(job_id).encode('utf-8')) % self.partitions:02d}"
+
+    def _path(self, part: str) -> Path:
+        return self.root / f"part-{part}.jsonl"
+
+    def write(self, job: dict) -> None:
+        """Stream one scored job into its partition's temporary file (full run)."""
+        part = self.partition_of(job.get("id", ""))
+        writer = self._writers.get(part)
+        if writer is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            f = open(self._path(part).with_suffix(".jsonl.tmp"), "wb")
+            writer = self._writers[part] = (f, hashlib.sha1(), [0])
+        f, digest, rows = writer
+        line = _encode(compact_row(job))
+        f.write(line)
+        digest.update(line)
+        rows[0] += 1
+
+    def commit(self) -> list[str]:
+        """
+        Finish a full run: replace the partitions whose content changed, drop
+        partitions that received no rows. Returns the changed partitions.
+        """
+        changed = []
+        parts = {}
+        for part, (f, digest, rows) in sorted(self._writers.items()):
+            f.close()
+            tmp = self._path(part).with_suffix(".jsonl.tmp")
+            sha1 = digest.hexdigest()
+            if self.manifest.get(part, {}).get("sha1") == sha1 and self._path(part).exists():
+                tmp.unlink()
+            else:
+                os.replace(tmp, self._path(part))
+                changed.append(part)
+            parts[part] = {"rows": rows[0], "sha1": sha1}
+        for part in set(self.manifest) - set(parts):
+            self._path(part).unlink(missing_ok=True)
+            changed.append(part)
+        self._writers = {}
+        self.manifest = parts
+        self._save_manifest()
+        return changed
+
+    def _read(self, part: str) -> dict[str, dict]:
+        path = self._path(part)
+        rows = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        row = json.loads(line)
+                        rows[row.get("id")] = row
+        return rows
+
+    def upsert(self, jobs: list[dict]) -> list[str]:
+        """Add or replace rows of some jobs, rewriting only their partitions."""
+        by_part: dict[str, list[dict]] = {}
+        for job in jobs:
+            by_part.setdefault(self.partition_of(job.get("id", "")), []).append(job)
+        self.root.mkdir(parents=True, exist_ok=True)
+        for part, part_jobs in by_part.items():
+            rows = self._read(part)
+            rows.update((job.get("id"), compact_row(job)) for job in part_jobs)
+            data = b"".join(_encode(row) for row in rows.values())
+            tmp = self._path(part).with_suffix(".jsonl.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, self._path(part))
+            self.manifest[part] = {"rows": len(rows), "sha1": hashlib.sha1(data).hexdigest()}
+        self._save_manifest()
+        return sorted(by_part)
+
+    def iter_rows(self):
+        """Stream every stored row, partition by partition."""
+        for part in sorted(self.manifest):
+            yield from self._read(part).values()
+
+    def export(self, path: Path) -> int:
+        """Write every row, best score first, to one JSON file. Returns the row count."""
+        rows = sorted(self.iter_rows(), key=lambda row: row.get("score", 0), reverse=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(rows, indent=2, ensure_ascii=False))
+        return len(rows)
+
+    def __len__(self) -> int:
+        return sum(entry["rows"] for entry in self.manifest.values())
+
+    def _save_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"partitions": self.partitions, "parts": self.manifest}, indent=2))
+        os.replace(tmp, self.manifest_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the partitioned score sink")
+    parser.add_argument("--stats", action="store_true", help="Print partition sizes")
+    parser.add_argument("--export", type=Path, help="Write all rows, best first, to one JSON file")
+    args = parser.parse_args()
+
+    sink = ScoreSink()
+    if args.export:
+        print(f"Exported {sink.export(args.export)} rows to {args.export}")
+        return
+
+    print(f"Score sink: {len(sink)} rows in {len(sink.manifest)}/{sink.partitions} partitions")
+    if args.stats:
+        for part, entry in sorted(sink.manifest.items()):
+            size = sink._path(part).stat().st_size if sink._path(part).exists() else 0
+            print(f"  part-{part}.jsonl  {entry['rows']:>7} rows  {size:>10,} bytes  {entry['sha1'][:12]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,34 @@
 #!/usr/bin/env python3
 """
-Job Board Scraper — searches configured job boards and saves raw listings.
-
-Scrapes job listings from Indeed NL, ICTerGezocht, and other boards.
-Uses requests + BeautifulSoup for static sites.
-For JS-heavy sites (LinkedIn, Glassdoor), outputs instructions for Playwright MCP.
+Job Board Scraper — searches configured job boards and saves raw listings
+to the append-only job store in data/jobs/ (see scripts/job_store.py).
+
+Scrapes job listings from Indeed NL, ICTerGezocht, Werkenbij, LinkedIn (guest
+search endpoint) and StepStone (embedded listing data, see
+scripts/embedded_json.py), plus JSON API boards such as Arbeitnow (see
+scripts/api_boards.py) and RSS/Atom feeds (see scripts/feeds.py).
+Uses requests + a pluggable HTML backend (selectolax, lxml or BeautifulSoup,
+see scripts/html_backend.py) for static sites. Boards are fetched in parallel
+(one lane per host) with a per-host token bucket, see scripts/fetcher.py.
+Search pages are revalidated with conditional GETs and unchanged pages reuse
+their previously parsed cards (data/http-cache.json, see scripts/http_cache.py).
+New jobs get their full description from the detail page (see scripts/enrich.py).
+Keyword x board queries that keep returning nothing new, or only postings other
+queries already cover, run less often (see scripts/query_planner.py).
+For JS-heavy sites (Glassdoor), writes their search URLs to
+data/js-board-urls.json for the browser rendering stage (scripts/render.py).
 
 Usage:
     python3 scripts/search.py
     python3 scripts/search.py --keywords "Python Developer" --location "Eindhoven"
+    python3 scripts/search.py --host-delay nl.indeed.com=5
+    python3 scripts/search.py --no-cache --no-enrich
+    python3 scripts/search.py --all-queries           # bypass the query planner
+    python3 scripts/search.py --replay                 # parse data/*.html, no network
+    python3 scripts/search.py --replay --replay-output /tmp/cards.json --profile
 """
 
 import argparse
-import hashlib
 import json
 import os
 import re
@@ -23,23 +39,39 @@ from pathlib import Path
 from urllib.parse import quote_plus, urljoin
 
 import requests
-from bs4 import BeautifulSoup
+
+from api_boards import ARBEITNOW_API_URL, FeedCursors, iter_arbeitnow
+from canonical_url import RedirectCache, canonicalize_jobs, ingest_id
+from dedupe import NearDuplicateIndex, backfill, cluster_and_store
+from embedded_json import embedded_blobs, find_objects
+from enrich import DetailCache, enrich_jobs, stats_summary
+from feeds import scrape_feed
+from fetcher import configure_host, host_of, open_circuits, run_lanes
+from html_backend import available_backends, parse_document, set_default_backend
+from http_cache import ResponseCache, fetch_cards, set_default_cache
+from job_store import JobStore, generate_job_id
+from query_planner import QueryPlanner
+from snapshot_archive import SnapshotArchive
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 PROFILE_DIR = BASE_DIR / "profile"
 LOG_DIR = BASE_DIR / "logs"
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    ),
-    "Accept-Language": "en-US,en;q=0.9,nl;q=0.8",
-}
+INDEED_URL = "https://nl.indeed.com/jobs"
+INDEED_RSS_URL = "https://nl.indeed.com/rss"
+ICTERGEZOCHT_URL = "https://www.ictergezocht.nl/vacatures"
+WERKENBIJ_URL = "https://www.werkenbij.nl/vacatures"
+# Guest endpoint behind LinkedIn's public job search: plain HTML cards, no login or JS
+LINKEDIN_GUEST_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+LINKEDIN_GEO_ID = "102890719"  # Netherlands
+LINKEDIN_PAGE_SIZE = 25
+STEPSTONE_URL = "https://www.stepstone.nl/vacatures"
+
+# "Language:" names in preferences.md -> codes used by api_boards.detect_language()
+LANGUAGE_CODES = {"english": "en", "dutch": "nl", "nederlands": "nl", "german": "de", "duits": "de"}
 
-REQUEST_TIMEOUT = 30
-DELAY_BETWEEN_REQUESTS = 3  # seconds
+KNOWN_PAGE_RATIO = 0.8  # stop paginating once this share of a page is already known
 
 
 def load_preferences() -> dict:
@@ -55,6 +87,7 @@ def load_preferences() -> dict:
         "roles": [],
         "location": "Eindhoven",
         "boards": [],
+        "languages": set(),
     }
 
     # Parse target roles
@@ -96,18 +129,103 @@ def load_preferences() -> dict:
                 preferences["location"] = loc_match.group(1).split(",")[0].strip()
                 break
 
+    # Parse accepted posting languages, e.g. "Language: English or Dutch"
+    for line in content.splitlines():
+        if "Language:" in line:
+            names = re.findall(r"[A-Za-z]+", line.split("Language:", 1)[1].lower())
+            preferences["languages"] = {LANGUAGE_CODES[n] for n in names if n in LANGUAGE_CODES}
+            break
+
     return preferences
 
 
-def generate_job_id(url: str) -> str:
-    """Generate a deterministic ID from a job URL."""
-    return hashlib.md5(url.encode()).hexdigest()[:12]
+def parse_indeed_cards(html: str, location: str) -> list[dict]:
+    """Extract job cards from an Indeed NL search result page."""
+    jobs = []
+    soup = parse_document(html)
+
+    # Indeed uses various class patterns for job cards
+    job_cards = soup.select("div.job_seen_beacon, div.jobsearch-SerpJobCard, div.result")
+
+    for card in job_cards:
+        try:
+            # Title
+            title_el = card.select_one("h2.jobTitle a, a.jcs-JobTitle, h2 a")
+            if not title_el:
+                continue
+            title = title_el.text()
+            link = title_el.get("href", "")
+            if link and not link.startswith("http"):
+                link = urljoin("https://nl.indeed.com", link)
+
+            # Company
+            company_el = card.select_one(
+                "span.companyName, span[data-testid='company-name'], "
+                "div.company_location span.companyName"
+            )
+            company = company_el.text() if company_el else "Unknown"
+
+            # Location
+            loc_el = card.select_one(
+                "div.companyLocation, div[data-testid='text-location']"
+            )
+            job_location = loc_el.text() if loc_el else location
+
+            # Description snippet
+            desc_el = card.select_one("div.job-snippet, td.resultContent div.css-1dbjc4n")
+            description = desc_el.text() if desc_el else ""
+
+            # Salary (if available)
+            salary_el = card.select_one(
+                "div.salary-snippet-container, span.estimated-salary, "
+                "div[data-testid='attribute_snippet_testid']"
+            )
+            salary = salary_el.text() if salary_el else ""
+
+            if link:
+                jobs.append({
+                    "id": generate_job_id(link),
+                    "title": title,
+                    "company": company,
+                    "location": job_location,
+                    "url": link,
+                    "description": description,
+                    "salary": salary,
+                    "date_posted": "",
+                    "source": "Indeed NL",
+                    "scraped_at": datetime.now().isoformat(),
+                })
+
+        except Exception as e:
+            print(f"    Warning: Failed to parse a job card: {e}")
+            continue
+
+    return jobs
+
+
+def mostly_known(board: str, page: int, page_jobs: list[dict], seen_ids: set | None) -> bool:
+    """
+    True when at least KNOWN_PAGE_RATIO of a result page is already stored.
+    Cards are compared by the id they get once ingested, so a clickout whose
+    target is in the redirect cache matches the stored job it resolved to.
+    """
+    if seen_ids is None or not page_jobs:
+        return False
+    known = sum(1 for job in page_jobs if ingest_id(job["url"]) in seen_ids)
+    if known / len(page_jobs) < KNOWN_PAGE_RATIO:
+        return False
+    print(f"    {board}: {known}/{len(page_jobs)} already known, stopping after page {page + 1}")
+    return True
 
 
-def scrape_indeed_nl(keyword: str, location: str, max_pages: int = 3) -> list[dict]:
-    """Scrape job listings from Indeed NL."""
+def scrape_indeed_nl(keyword: str, location: str, max_pages: int = 3,
+                     seen_ids: set | None = None) -> list[dict]:
+    """
+    Scrape job listings from Indeed NL. With `seen_ids`, pagination stops as
+    soon as a page is mostly (KNOWN_PAGE_RATIO) listings we already have.
+    """
     jobs = []
-    base_url = "https://nl.indeed.com/jobs"
+    base_url = INDEED_URL
 
     for page in range(max_pages):
         params = {
@@ -118,70 +236,15 @@ def scrape_indeed_nl(keyword: str, location: str, max_pages: int = 3) -> list[di
 
         try:
             print(f"  Searching Indeed NL: '{keyword}' in {location} (page {page + 1})")
-            resp = requests.get(
-                base_url, params=params, headers=HEADERS, timeout=REQUEST_TIMEOUT
+            page_jobs = fetch_cards(
+                base_url, lambda html: parse_indeed_cards(html, location), params=params
             )
-            resp.raise_for_status()
-
-            soup = BeautifulSoup(resp.text, "html.parser")
-
-            # Indeed uses various class patterns for job cards
-            job_cards = soup.select("div.job_seen_beacon, div.jobsearch-SerpJobCard, div.result")
-
-            for card in job_cards:
-                try:
-                    # Title
-                    title_el = card.select_one("h2.jobTitle a, a.jcs-JobTitle, h2 a")
-                    if not title_el:
-                        continue
-                    title = title_el.get_text(strip=True)
-                    link = title_el.get("href", "")
-                    if link and not link.startswith("http"):
-                        link = urljoin("https://nl.indeed.com", link)
-
-                    # Company
-                    company_el = card.select_one(
-                        "span.companyName, span[data-testid='company-name'], "
-                        "div.company_location span.companyName"
-                    )
-                    company = company_el.get_text(strip=True) if company_el else "Unknown"
-
-                    # Location
-                    loc_el = card.select_one(
-                        "div.companyLocation, div[data-testid='text-location']"
-                    )
-                    job_location = loc_el.get_text(strip=True) if loc_el else location
-
-                    # Description snippet
-                    desc_el = card.select_one("div.job-snippet, td.resultContent div.css-1dbjc4n")
-                    description = desc_el.get_text(strip=True) if desc_el else ""
-
-                    # Salary (if available)
-                    salary_el = card.select_one(
-                        "div.salary-snippet-container, span.estimated-salary, "
-                        "div[data-testid='attribute_snippet_testid']"
-                    )
-                    salary = salary_el.get_text(strip=True) if salary_el else ""
-
-                    if link:
-                        jobs.append({
-                            "id": generate_job_id(link),
-                            "title": title,
-                            "company": company,
-                            "location": job_location,
-                            "url": link,
-                            "description": description,
-                            "salary": salary,
-                            "date_posted": "",
-                            "source": "Indeed NL",
-                            "scraped_at": datetime.now().isoformat(),
-                        })
-
-                except Exception as e:
-                    print(f"    Warning: Failed to parse a job card: {e}")
-                    continue
+            jobs.extend(page_jobs)
 
-            time.sleep(DELAY_BETWEEN_REQUESTS)
+            if not page_jobs:
+                break
+            if page + 1 < max_pages and mostly_known("Indeed NL", page, page_jobs, seen_ids):
+                break
 
         except requests.RequestException as e:
             print(f"    Error fetching Indeed NL page {page + 1}: {e}")
@@ -190,150 +253,326 @@ def scrape_indeed_nl(keyword: str, location: str, max_pages: int = 3) -> list[di
     return jobs
 
 
-def scrape_ictergezocht(keyword: str, location: str) -> list[dict]:
-    """Scrape job listings from ICTerGezocht.nl."""
+def parse_ictergezocht_cards(html: str, location: str) -> list[dict]:
+    """Extract job cards from an ICTerGezocht search result page."""
     jobs = []
-    search_url = f"https://www.ictergezocht.nl/vacatures?q={quote_plus(keyword)}&location={quote_plus(location)}"
-
-    try:
-        print(f"  Searching ICTerGezocht: '{keyword}' in {location}")
-        resp = requests.get(search_url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-
-        soup = BeautifulSoup(resp.text, "html.parser")
+    soup = parse_document(html)
 
-        # ICTerGezocht job listing cards
-        job_cards = soup.select("div.vacancy-item, article.vacancy, div.search-result")
+    # ICTerGezocht job listing cards. The current layout renders each card as
+    # <a class="vacancy" data-vacancyid=...> with the details in data-* attributes.
+    job_cards = soup.select(
+        "div.vacancy-item, article.vacancy, div.search-result, a.vacancy[data-vacancyid]"
+    )
 
-        for card in job_cards:
-            try:
+    for card in job_cards:
+        try:
+            salary = ""
+            if card.name == "a":
+                title_el = card.select_one("h3, h2")
+                if not title_el:
+                    continue
+                title = title_el.text()
+                link = card.get("href", "")
+                company = card.get("data-business") or "Unknown"
+                job_location = card.get("data-location-label") or location
+                for offer_el in card.select("div.requested-wrapper div.offer"):
+                    offer = offer_el.text()
+                    if "€" in offer:
+                        salary = offer
+                        break
+                description = ""
+            else:
                 title_el = card.select_one("h2 a, h3 a, a.vacancy-title")
                 if not title_el:
                     continue
 
-                title = title_el.get_text(strip=True)
+                title = title_el.text()
                 link = title_el.get("href", "")
-                if link and not link.startswith("http"):
-                    link = urljoin("https://www.ictergezocht.nl", link)
 
                 company_el = card.select_one("span.company, div.company-name")
-                company = company_el.get_text(strip=True) if company_el else "Unknown"
+                company = company_el.text() if company_el else "Unknown"
 
                 loc_el = card.select_one("span.location, div.vacancy-location")
-                job_location = loc_el.get_text(strip=True) if loc_el else location
+                job_location = loc_el.text() if loc_el else location
 
                 desc_el = card.select_one("div.description, p.vacancy-description")
-                description = desc_el.get_text(strip=True) if desc_el else ""
-
-                if link:
-                    jobs.append({
-                        "id": generate_job_id(link),
-                        "title": title,
-                        "company": company,
-                        "location": job_location,
-                        "url": link,
-                        "description": description,
-                        "salary": "",
-                        "date_posted": "",
-                        "source": "ICTerGezocht",
-                        "scraped_at": datetime.now().isoformat(),
-                    })
+                description = desc_el.text() if desc_el else ""
+
+            if link and not link.startswith("http"):
+                link = urljoin("https://www.ictergezocht.nl", link)
+
+            if link:
+                jobs.append({
+                    "id": generate_job_id(link),
+                    "title": title,
+                    "company": company,
+                    "location": job_location,
+                    "url": link,
+                    "description": description,
+                    "salary": salary,
+                    "date_posted": "",
+                    "source": "ICTerGezocht",
+                    "scraped_at": datetime.now().isoformat(),
+                })
+
+        except Exception as e:
+            print(f"    Warning: Failed to parse ICTerGezocht card: {e}")
+            continue
+
+    return jobs
 
-            except Exception as e:
-                print(f"    Warning: Failed to parse ICTerGezocht card: {e}")
-                continue
+
+def scrape_ictergezocht(keyword: str, location: str) -> list[dict]:
+    """Scrape job listings from ICTerGezocht.nl."""
+    search_url = f"{ICTERGEZOCHT_URL}?q={quote_plus(keyword)}&location={quote_plus(location)}"
+
+    try:
+        print(f"  Searching ICTerGezocht: '{keyword}' in {location}")
+        return fetch_cards(search_url, lambda html: parse_ictergezocht_cards(html, location))
 
     except requests.RequestException as e:
         print(f"    Error fetching ICTerGezocht: {e}")
 
+    return []
+
+
+def parse_werkenbij_cards(html: str, location: str) -> list[dict]:
+    """Extract job cards from a werkenbij.nl search result page."""
+    jobs = []
+    soup = parse_document(html)
+    job_cards = soup.select("div.vacancy-card, article.vacancy, li.search-result")
+
+    for card in job_cards:
+        try:
+            title_el = card.select_one("h2 a, h3 a, a.vacancy-link")
+            if not title_el:
+                continue
+
+            title = title_el.text()
+            link = title_el.get("href", "")
+            if link and not link.startswith("http"):
+                link = urljoin("https://www.werkenbij.nl", link)
+
+            company_el = card.select_one("span.company, div.company")
+            company = company_el.text() if company_el else "Unknown"
+
+            loc_el = card.select_one("span.location, div.location")
+            job_location = loc_el.text() if loc_el else location
+
+            desc_el = card.select_one("div.description, p.summary")
+            description = desc_el.text() if desc_el else ""
+
+            if link:
+                jobs.append({
+                    "id": generate_job_id(link),
+                    "title": title,
+                    "company": company,
+                    "location": job_location,
+                    "url": link,
+                    "description": description,
+                    "salary": "",
+                    "date_posted": "",
+                    "source": "Werkenbij",
+                    "scraped_at": datetime.now().isoformat(),
+                })
+
+        except Exception as e:
+            print(f"    Warning: Failed to parse Werkenbij card: {e}")
+            continue
+
     return jobs
 
 
 def scrape_werkenbij(keyword: str, location: str) -> list[dict]:
     """Scrape job listings from werkenbij.nl."""
-    jobs = []
-    search_url = f"https://www.werkenbij.nl/vacatures?query={quote_plus(keyword)}&location={quote_plus(location)}"
+    search_url = f"{WERKENBIJ_URL}?query={quote_plus(keyword)}&location={quote_plus(location)}"
 
     try:
         print(f"  Searching Werkenbij: '{keyword}' in {location}")
-        resp = requests.get(search_url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
+        return fetch_cards(search_url, lambda html: parse_werkenbij_cards(html, location))
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        job_cards = soup.select("div.vacancy-card, article.vacancy, li.search-result")
+    except requests.RequestException as e:
+        print(f"    Error fetching Werkenbij: {e}")
 
-        for card in job_cards:
-            try:
-                title_el = card.select_one("h2 a, h3 a, a.vacancy-link")
-                if not title_el:
-                    continue
+    return []
 
-                title = title_el.get_text(strip=True)
-                link = title_el.get("href", "")
-                if link and not link.startswith("http"):
-                    link = urljoin("https://www.werkenbij.nl", link)
-
-                company_el = card.select_one("span.company, div.company")
-                company = company_el.get_text(strip=True) if company_el else "Unknown"
-
-                loc_el = card.select_one("span.location, div.location")
-                job_location = loc_el.get_text(strip=True) if loc_el else location
-
-                desc_el = card.select_one("div.description, p.summary")
-                description = desc_el.get_text(strip=True) if desc_el else ""
-
-                if link:
-                    jobs.append({
-                        "id": generate_job_id(link),
-                        "title": title,
-                        "company": company,
-                        "location": job_location,
-                        "url": link,
-                        "description": description,
-                        "salary": "",
-                        "date_posted": "",
-                        "source": "Werkenbij",
-                        "scraped_at": datetime.now().isoformat(),
-                    })
 
-            except Exception as e:
-                print(f"    Warning: Failed to parse Werkenbij card: {e}")
+def parse_linkedin_cards(html: str, location: str) -> list[dict]:
+    """Extract job cards from a LinkedIn jobs search page (rendered or guest HTML)."""
+    jobs = []
+    soup = parse_document(html)
+    job_cards = soup.select("div.base-search-card")
+
+    for card in job_cards:
+        try:
+            link_el = card.select_one("a.base-card__full-link, a.base-search-card__link")
+            title_el = card.select_one("h3.base-search-card__title")
+            if not link_el or not title_el:
                 continue
 
-    except requests.RequestException as e:
-        print(f"    Error fetching Werkenbij: {e}")
+            title = title_el.text()
+            link = link_el.get("href", "")
+
+            company_el = card.select_one("h4.base-search-card__subtitle")
+            company = company_el.text() if company_el else "Unknown"
+
+            loc_el = card.select_one("span.job-search-card__location")
+            job_location = loc_el.text() if loc_el else location
+
+            salary_el = card.select_one("span.job-search-card__salary-info")
+            salary = salary_el.text() if salary_el else ""
+
+            date_el = card.select_one("time")
+            date_posted = date_el.get("datetime", "") if date_el else ""
+
+            if link:
+                jobs.append({
+                    "id": generate_job_id(link),
+                    "title": title,
+                    "company": company,
+                    "location": job_location,
+                    "url": link,
+                    "description": "",
+                    "salary": salary,
+                    "date_posted": date_posted,
+                    "source": "LinkedIn",
+                    "scraped_at": datetime.now().isoformat(),
+                })
+
+        except Exception as e:
+            print(f"    Warning: Failed to parse LinkedIn card: {e}")
+            continue
 
     return jobs
 
 
-def generate_linkedin_urls(keyword: str, location: str) -> list[dict]:
+def scrape_linkedin(keyword: str, location: str, max_pages: int = 3,
+                    seen_ids: set | None = None) -> list[dict]:
     """
-    Generate LinkedIn search URLs for Playwright MCP to navigate.
-    LinkedIn requires JS rendering and authentication, so we output
-    URLs for the agent to handle via browser automation.
+    Scrape LinkedIn through its guest search endpoint, which serves the same
+    base-card markup as the rendered search page to plain HTTP clients.
     """
-    encoded_keyword = quote_plus(keyword)
-    # LinkedIn geoId for Eindhoven area / Netherlands
-    geo_id = "102890719"  # Netherlands
+    jobs = []
 
-    urls = [
-        {
-            "board": "LinkedIn",
-            "search_url": (
-                f"https://www.linkedin.com/jobs/search/"
-                f"?keywords={encoded_keyword}"
-                f"&location={quote_plus(location)}"
-                f"&geoId={geo_id}"
-                f"&f_TPR=r604800"  # Past week
-            ),
-            "note": "Requires login. Use Playwright MCP to navigate and scrape.",
+    for page in range(max_pages):
+        params = {
+            "keywords": keyword,
+            "location": location,
+            "geoId": LINKEDIN_GEO_ID,
+            "f_TPR": "r604800",  # Past week
+            "start": page * LINKEDIN_PAGE_SIZE,
         }
-    ]
-    return urls
+
+        try:
+            print(f"  Searching LinkedIn: '{keyword}' in {location} (page {page + 1})")
+            page_jobs = fetch_cards(
+                LINKEDIN_GUEST_URL, lambda html: parse_linkedin_cards(html, location), params=params
+            )
+            jobs.extend(page_jobs)
+
+            if not page_jobs:
+                break
+            if page + 1 < max_pages and mostly_known("LinkedIn", page, page_jobs, seen_ids):
+                break
+
+        except requests.RequestException as e:
+            print(f"    Error fetching LinkedIn page {page + 1}: {e}")
+            break
+
+    return jobs
+
+
+def _is_stepstone_listing(item: dict) -> bool:
+    return (
+        isinstance(item.get("title"), str)
+        and isinstance(item.get("url"), str)
+        and any(key in item for key in ("companyName", "company", "hiringOrganization"))
+    )
+
+
+def _name_of(value) -> str:
+    """Plain string from a field that is either a string or a {"name": ...} object."""
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("label") or ""
+    return value if isinstance(value, str) else ""
+
+
+def parse_stepstone_cards(html: str, location: str) -> list[dict]:
+    """
+    Extract job listings from the data StepStone embeds in its search page
+    (Next.js state / preloaded store / JSON-LD, see scripts/embedded_json.py).
+    """
+    if "/error/code/403" in html:
+        print("    Warning: StepStone returned an access-denied page")
+        return []
+
+    jobs = []
+    seen_links = set()
+    for blob in embedded_blobs(html):
+        for item in find_objects(blob, _is_stepstone_listing):
+            try:
+                link = urljoin("https://www.stepstone.nl", item["url"])
+                if link in seen_links:
+                    continue
+                seen_links.add(link)
+
+                company = _name_of(item.get("companyName") or item.get("company")
+                                   or item.get("hiringOrganization"))
+                job_location = _name_of(item.get("location") or item.get("jobLocation"))
+                salary = item.get("salary")
+
+                jobs.append({
+                    "id": generate_job_id(link),
+                    "title": item["title"].strip(),
+                    "company": company or "Unknown",
+                    "location": job_location or location,
+                    "url": link,
+                    "description": item.get("textSnippet") or item.get("snippet") or "",
+                    "salary": salary if isinstance(salary, str) else "",
+                    "date_posted": item.get("datePosted") or item.get("publishedDate") or "",
+                    "source": "StepStone",
+                    "scraped_at": datetime.now().isoformat(),
+                })
+
+            except Exception as e:
+                print(f"    Warning: Failed to parse StepStone listing: {e}")
+                continue
+
+    return jobs
+
+
+def scrape_stepstone(keyword: str, location: str) -> list[dict]:
+    """Scrape StepStone NL from the listing data embedded in its server-rendered page."""
+    search_url = f"{STEPSTONE_URL}/{quote_plus(keyword)}/in-{quote_plus(location)}"
+
+    try:
+        print(f"  Searching StepStone: '{keyword}' in {location}")
+        return fetch_cards(search_url, lambda html: parse_stepstone_cards(html, location))
+
+    except requests.RequestException as e:
+        print(f"    Error fetching StepStone: {e}")
+
+    return []
+
+
+def scrape_arbeitnow(keyword: str, languages: set, seen_ids: set | None = None,
+                     cursors: FeedCursors | None = None) -> list[dict]:
+    """Stream matching postings from the Arbeitnow JSON API (see scripts/api_boards.py)."""
+    jobs = []
+
+    try:
+        print(f"  Searching Arbeitnow API: '{keyword}'")
+        for job in iter_arbeitnow(keyword, languages, seen_ids=seen_ids, cursors=cursors):
+            jobs.append(job)
+
+    except (requests.RequestException, ValueError) as e:
+        print(f"    Error fetching Arbeitnow: {e}")
+
+    return jobs
 
 
 def generate_glassdoor_urls(keyword: str, location: str) -> list[dict]:
-    """Generate Glassdoor search URLs for Playwright MCP."""
+    """Generate Glassdoor search URLs for the browser rendering stage (render.py)."""
     encoded_keyword = quote_plus(keyword)
     return [
         {
@@ -343,21 +582,7 @@ def generate_glassdoor_urls(keyword: str, location: str) -> list[dict]:
                 f"{quote_plus(location)}-{encoded_keyword}-vacatures-"
                 f"SRCH_IL.0,{len(location)}_IC{quote_plus(location)}_KO{len(location)+1},{len(location)+1+len(keyword)}.htm"
             ),
-            "note": "May require Playwright MCP for full rendering.",
-        }
-    ]
-
-
-def generate_stepstone_urls(keyword: str, location: str) -> list[dict]:
-    """Generate StepStone NL search URLs for Playwright MCP."""
-    encoded_keyword = quote_plus(keyword)
-    return [
-        {
-            "board": "StepStone NL",
-            "search_url": (
-                f"https://www.stepstone.nl/vacatures/{encoded_keyword}/in-{quote_plus(location)}"
-            ),
-            "note": "May require Playwright MCP for full rendering.",
+            "note": "Rendered by scripts/render.py.",
         }
     ]
 
@@ -374,29 +599,180 @@ def deduplicate_jobs(jobs: list[dict]) -> list[dict]:
     return unique
 
 
-def load_existing_jobs() -> list[dict]:
-    """Load previously scraped jobs to avoid re-adding."""
-    raw_path = DATA_DIR / "raw-jobs.json"
-    if raw_path.exists():
-        try:
-            return json.loads(raw_path.read_text())
-        except json.JSONDecodeError:
-            return []
-    return []
+def merge_jobs(store: JobStore, new_jobs: list[dict],
+               index: NearDuplicateIndex | None = None) -> list[dict]:
+    """
+    Append new jobs to the job store, skipping URLs it already holds and
+    clustering cross-board near-duplicates (see scripts/dedupe.py).
+    """
+    if index is None:
+        index = NearDuplicateIndex(store)
+    if len(index) < len(store):
+        print(f"  Indexed {backfill(store, index)} stored jobs for near-duplicate detection")
+    added, duplicates = cluster_and_store(store, index, new_jobs)
+    index.close()
+    print(
+        f"  Added {len(added)} new jobs, {duplicates} of them near-duplicates "
+        f"of known postings (total: {len(store)})"
+    )
+    return added
+
+
+def build_boards(location: str, languages: set, max_pages: int = 3,
+                 seen_ids: set | None = None, cursors: FeedCursors | None = None) -> list[tuple]:
+    """
+    The HTTP boards as (name, url, scrape) tuples; scrape(keyword) returns job
+    dicts. `seen_ids` and `cursors` enable the early pagination stops.
+    """
+    return [
+        ("Indeed NL", INDEED_URL,
+         lambda kw: scrape_indeed_nl(kw, location, max_pages=max_pages, seen_ids=seen_ids)),
+        ("Indeed NL (RSS)", INDEED_RSS_URL,
+         lambda kw: scrape_feed(INDEED_RSS_URL, "Indeed NL", location, {"q": kw, "l": location})),
+        ("ICTerGezocht", ICTERGEZOCHT_URL, lambda kw: scrape_ictergezocht(kw, location)),
+        ("Werkenbij", WERKENBIJ_URL, lambda kw: scrape_werkenbij(kw, location)),
+        ("LinkedIn", LINKEDIN_GUEST_URL,
+         lambda kw: scrape_linkedin(kw, location, max_pages=max_pages, seen_ids=seen_ids)),
+        ("StepStone", STEPSTONE_URL, lambda kw: scrape_stepstone(kw, location)),
+        ("Arbeitnow", ARBEITNOW_API_URL,
+         lambda kw: scrape_arbeitnow(kw, languages, seen_ids=seen_ids, cursors=cursors)),
+    ]
 
 
-def merge_jobs(existing: list[dict], new_jobs: list[dict]) -> list[dict]:
-    """Merge new jobs into existing list, avoiding duplicates."""
-    existing_urls = {job["url"] for job in existing}
-    merged = list(existing)
-    added = 0
-    for job in new_jobs:
-        if job["url"] not in existing_urls:
-            merged.append(job)
-            existing_urls.add(job["url"])
-            added += 1
-    print(f"  Added {added} new jobs (total: {len(merged)})")
-    return merged
+def run_queries(boards: list[tuple], queries: list[tuple]) -> dict[tuple, list[dict]]:
+    """
+    Run (board, keyword) queries and return {(board, keyword): jobs}. One lane
+    per host: queries for the same host (e.g. Indeed search pages and its feed)
+    run in order behind its token bucket, different hosts in parallel.
+    """
+    by_name = {board: (url, scrape) for board, url, scrape in boards}
+    lanes: dict[str, list] = {}
+    slots = {}  # (board, keyword) -> (host, position in the host's lane)
+    for board, kw in queries:
+        url, scrape = by_name[board]
+        lane = lanes.setdefault(host_of(url), [])
+        slots[(board, kw)] = (host_of(url), len(lane))
+        lane.append(lambda scrape=scrape, kw=kw: scrape(kw))
+    results = run_lanes(lanes)
+    return {query: results[host][position] for query, (host, position) in slots.items()}
+
+
+def ingest_jobs(store: JobStore, jobs: list[dict], enrich: bool = True,
+                index: NearDuplicateIndex | None = None, redirects: RedirectCache | None = None,
+                details: DetailCache | None = None) -> list[dict]:
+    """
+    Canonicalize and deduplicate scraped jobs, append the new ones to the store
+    (clustering near-duplicates) and fetch their detail pages. Returns the
+    jobs added. A long-running caller (scheduler.py) passes in its loaded
+    near-duplicate index, redirect cache and detail cache.
+    """
+    jobs = deduplicate_jobs(canonicalize_jobs(jobs, cache=redirects))
+    print(f"Total unique jobs scraped: {len(jobs)}")
+    added = merge_jobs(store, jobs, index)
+    if added and enrich:
+        print(f"  Detail pages: {stats_summary(enrich_jobs(store, added, details))}")
+    if store.maybe_compact():
+        print("  Compacted job store")
+    return added
+
+
+# Snapshot filename prefix -> (board, card parser), used by --replay
+REPLAY_PARSERS = [
+    ("indeed_", "Indeed NL", parse_indeed_cards),
+    ("ictergezocht", "ICTerGezocht", parse_ictergezocht_cards),
+    ("werkenbij_", "Werkenbij", parse_werkenbij_cards),
+    ("linkedin_", "LinkedIn", parse_linkedin_cards),
+    ("stepstone_", "StepStone", parse_stepstone_cards),
+]
+
+
+def replay_parser_for(name: str):
+    """Return (board, parse) for a snapshot file name, or None if no parser matches."""
+    for prefix, board, parse in REPLAY_PARSERS:
+        if name.startswith(prefix):
+            return board, parse
+    return None
+
+
+def iter_snapshot_files(snapshot_dir: Path, archive: SnapshotArchive | None = None):
+    """
+    Yield (name, text) for every saved HTML page in a directory, followed by
+    the archived snapshots for the same directory that have no loose copy.
+    """
+    loose = sorted(snapshot_dir.glob("*.html"))
+    for path in loose:
+        yield path.name, path.read_text(errors="replace")
+
+    archive = archive or SnapshotArchive()
+    try:
+        directory = snapshot_dir.resolve().relative_to(DATA_DIR).as_posix()
+    except ValueError:
+        return  # outside data/, nothing archived for it
+    names = {path.name for path in loose}
+    for name, text in archive.iter_dir("" if directory == "." else directory):
+        if name not in names:
+            yield name, text
+
+
+def replay_snapshots(snapshots, location: str) -> list[dict]:
+    """
+    Feed saved board pages through the same card parsers the live scrapers
+    use, without touching the network. `snapshots` yields (name, text).
+    Prints per-file card counts and parse times, returns all cards.
+    """
+    cards: list[dict] = []
+    skipped: list[str] = []
+    parse_time = 0.0
+    parsed_files = 0
+
+    for name, text in snapshots:
+        match = replay_parser_for(name)
+        if match is None:
+            skipped.append(name)
+            continue
+        board, parse = match
+
+        start = time.perf_counter()
+        file_cards = parse(text, location)
+        elapsed = time.perf_counter() - start
+
+        parse_time += elapsed
+        parsed_files += 1
+        cards.extend(file_cards)
+        print(f"  {name} [{board}]: {len(file_cards)} cards in {elapsed * 1000:.1f} ms")
+
+    print(f"\nReplayed {parsed_files} snapshots: {len(cards)} cards in {parse_time:.3f}s", end="")
+    if parse_time > 0:
+        print(f" ({len(cards) / parse_time:.0f} cards/sec)")
+    else:
+        print()
+    if skipped:
+        print(f"Skipped {len(skipped)} snapshots without a parser: {', '.join(skipped)}")
+    return cards
+
+
+def run_replay(args) -> None:
+    """Handle --replay: parse snapshots offline, never fetch or write the job store."""
+    location = args.location or "Eindhoven"
+    print(f"Replaying snapshots from {args.replay}")
+
+    snapshots = iter_snapshot_files(Path(args.replay))
+    if args.profile:
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        cards = profiler.runcall(replay_snapshots, snapshots, location)
+        print()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+    else:
+        cards = replay_snapshots(snapshots, location)
+
+    if args.replay_output:
+        # Drop the volatile timestamp so outputs from two runs diff cleanly
+        stable = [{k: v for k, v in card.items() if k != "scraped_at"} for card in cards]
+        Path(args.replay_output).write_text(json.dumps(stable, indent=2, ensure_ascii=False))
+        print(f"Saved {len(stable)} cards to {args.replay_output}")
 
 
 def main():
@@ -404,8 +780,58 @@ def main():
     parser.add_argument("--keywords", type=str, help="Override search keywords (comma-separated)")
     parser.add_argument("--location", type=str, help="Override search location")
     parser.add_argument("--max-pages", type=int, default=3, help="Max pages per board")
+    parser.add_argument(
+        "--host-delay", action="append", default=[], metavar="HOST=SECONDS",
+        help="Override the politeness delay for a host (repeatable)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignore and don't update the response cache"
+    )
+    parser.add_argument(
+        "--no-early-stop", action="store_true",
+        help="Always fetch --max-pages pages, even when a page is mostly known listings, "
+             "and ignore the API feed cursors",
+    )
+    parser.add_argument(
+        "--all-queries", action="store_true",
+        help="Run every keyword on every board instead of the query planner's selection",
+    )
+    parser.add_argument(
+        "--no-enrich", action="store_true",
+        help="Don't fetch detail pages for full descriptions of new jobs",
+    )
+    parser.add_argument(
+        "--parser", choices=available_backends(),
+        help="HTML parser backend for card extraction (default: fastest installed)",
+    )
+    parser.add_argument(
+        "--replay", nargs="?", const=str(DATA_DIR), metavar="DIR",
+        help="Parse saved HTML snapshots (default: data/) instead of fetching boards",
+    )
+    parser.add_argument(
+        "--replay-output", type=str, metavar="PATH",
+        help="With --replay, write the extracted cards to PATH for regression diffs",
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="With --replay, print a cProfile report"
+    )
     args = parser.parse_args()
 
+    if args.parser:
+        set_default_backend(args.parser)
+
+    if args.replay:
+        run_replay(args)
+        return
+
+    for override in args.host_delay:
+        host, _, delay = override.partition("=")
+        try:
+            configure_host(host.strip().lower(), float(delay))
+        except ValueError:
+            print(f"ERROR: Invalid --host-delay '{override}', expected HOST=SECONDS")
+            sys.exit(1)
+
     # Load preferences
     prefs = load_preferences()
     keywords = args.keywords.split(",") if args.keywords else prefs["roles"]
@@ -416,57 +842,68 @@ def main():
     print(f"  Location: {location}")
     print()
 
-    # Collect all scraped jobs
-    all_jobs: list[dict] = []
-
-    # Scrape static boards
-    for keyword in keywords:
-        keyword = keyword.strip()
-        print(f"\nSearching for: '{keyword}'")
-
-        # Indeed NL
-        indeed_jobs = scrape_indeed_nl(keyword, location, max_pages=args.max_pages)
-        all_jobs.extend(indeed_jobs)
-        print(f"    Indeed NL: {len(indeed_jobs)} listings found")
-
-        # ICTerGezocht
-        ict_jobs = scrape_ictergezocht(keyword, location)
-        all_jobs.extend(ict_jobs)
-        print(f"    ICTerGezocht: {len(ict_jobs)} listings found")
-
-        # Werkenbij
-        werkenbij_jobs = scrape_werkenbij(keyword, location)
-        all_jobs.extend(werkenbij_jobs)
-        print(f"    Werkenbij: {len(werkenbij_jobs)} listings found")
-
-        time.sleep(DELAY_BETWEEN_REQUESTS)
-
-    # Deduplicate
-    all_jobs = deduplicate_jobs(all_jobs)
-    print(f"\nTotal unique jobs scraped: {len(all_jobs)}")
-
-    # Merge with existing
-    existing_jobs = load_existing_jobs()
-    merged = merge_jobs(existing_jobs, all_jobs)
+    keywords = [keyword.strip() for keyword in keywords]
+    store = JobStore()
+    seen_ids = store.id_set()
+    early_stop_ids = None if args.no_early_stop else seen_ids
+    cursors = None if args.no_early_stop else FeedCursors()
+    boards = build_boards(location, prefs["languages"], args.max_pages, early_stop_ids, cursors)
+
+    planner = None if args.all_queries else QueryPlanner()
+    queries = [
+        (board, kw)
+        for board, _, _ in boards
+        for kw in (planner.plan(board, keywords) if planner else keywords)
+    ]
+    cache = ResponseCache(enabled=not args.no_cache)
+    set_default_cache(cache)
+    results = run_queries(boards, queries)
+    cache.save()
 
-    # Save raw jobs
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    raw_path = DATA_DIR / "raw-jobs.json"
-    raw_path.write_text(json.dumps(merged, indent=2, ensure_ascii=False))
-    print(f"Saved to {raw_path}")
+    # Hosts whose circuit breaker is open: an empty result there says nothing
+    # about the query, so it is not recorded in the planner history
+    blocked = open_circuits()
 
-    # Generate URLs for JS-heavy boards (for Playwright MCP)
+    all_jobs: list[dict] = []
+    for keyword in keywords:
+        print(f"\nResults for: '{keyword}'")
+        for board, _, _ in boards:
+            if (board, keyword) not in results:
+                print(f"    {board}: skipped by the query planner")
+                continue
+            board_jobs = results[(board, keyword)]
+            all_jobs.extend(board_jobs)
+            print(f"    {board}: {len(board_jobs)} listings found")
+
+    for host, wait in sorted(blocked.items()):
+        print(f"Circuit open: {host} (next probe in {wait:.0f}s)")
+    print(f"\nResponse cache: {cache.summary()}")
+    ingest_jobs(store, all_jobs, enrich=not args.no_enrich)
+
+    if planner:
+        # Recorded after ingest, which rewrote each job's id in place to the
+        # canonical (clickout-resolved) one the store keys it by
+        hosts = {board: host_of(url) for board, url, _ in boards}
+        for (board, keyword), board_jobs in results.items():
+            if board_jobs or hosts[board] not in blocked:
+                planner.record(board, keyword, board_jobs, seen_ids)
+        planner.save()
+        print(f"\nQuery planner: ran {len(queries)} of {len(boards) * len(keywords)} board queries")
+    store.close()
+    if cursors:
+        cursors.save()  # only once the postings behind the cursors are stored
+    print(f"Saved to {store.root}")
+
+    # Generate URLs for JS-heavy boards (rendered by scripts/render.py)
     js_boards: list[dict] = []
     for keyword in keywords:
         keyword = keyword.strip()
-        js_boards.extend(generate_linkedin_urls(keyword, location))
         js_boards.extend(generate_glassdoor_urls(keyword, location))
-        js_boards.extend(generate_stepstone_urls(keyword, location))
 
     if js_boards:
         js_path = DATA_DIR / "js-board-urls.json"
         js_path.write_text(json.dumps(js_boards, indent=2, ensure_ascii=False))
-        print(f"\nGenerated {len(js_boards)} URLs for JS-heavy boards (Playwright MCP required)")
+        print(f"\nGenerated {len(js_boards)} URLs for JS-heavy boards (run scripts/render.py)")
         print(f"Saved to {js_path}")
 
     print("\nSearch phase complete.")
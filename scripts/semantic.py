@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Local semantic similarity between the profile and job texts (CPU only).
+
+Keyword matching cannot tell that "Backend Engineer (Mendix/Java/Python)"
+is close to the profile while "Quereinstieg Hörakustik" is not. This module
+maps texts to unit vectors and uses cosine similarity to the profile vector.
+
+Vectorizers (pluggable, see get_vectorizer):
+- "hashing" (default): character 3-5-gram counts hashed into HASH_DIM
+  signed buckets. Needs only numpy and captures shared word stems across
+  spellings and languages.
+- any other name: a sentence-transformers model, loaded from a local path
+  or the local model cache. Optional: install sentence-transformers to use it.
+
+Vectors are cached per content hash in data/vectors/<vectorizer>.f32, a
+memory-mapped float32 matrix with one row per distinct text. The sidecar
+<vectorizer>.json maps hashes to rows. Only new texts are vectorized. The
+similarities of a batch are one matrix-vector product over its rows of the
+memmap.
+Switching the vectorizer uses a separate cache file.
+
+Usage:
+    python3 scripts/semantic.py "Backend Engineer (Mendix/Java/Python)" "Quereinstieg Hörakustik"
+    python3 scripts/semantic.py --model models/all-MiniLM-L6-v2 "Python developer"
+
+    from semantic import VectorCache, get_vectorizer
+    cache = VectorCache(get_vectorizer("hashing"))
+    scores = cache.similarities(profile_text, job_texts)   # cosine per job text
+    cache.save()
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import zlib
+from collections import Counter
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PROFILE_DIR = BASE_DIR / "profile"
+VECTOR_DIR = DATA_DIR / "vectors"
+
+DEFAULT_VECTORIZER = "hashing"
+HASH_DIM = 4096
+NGRAM_SIZES = (3, 4, 5)
+COMPACT_RATIO = 0.5  # rewrite the matrix once fewer than half of its rows are still used
+
+_WORD_RE = re.compile(r"[\w#+.]+")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("semantic similarity needs numpy; install it to enable it")
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class HashingVectorizer:
+    """Signed feature hashing of character n-grams, L2-normalized."""
+
+    def __init__(self, dim: int = HASH_DIM, ngram_sizes: tuple = NGRAM_SIZES):
+        _require_numpy()
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+        self.name = f"hashing-{dim}-{''.join(map(str, ngram_sizes))}"
+
+    def _vector(self, text: str):
+        padded = f" {' '.join(_WORD_RE.findall(text.lower()))} "
+        grams = Counter(
+            padded[i:i + size]
+            for size in self.ngram_sizes
+            for i in range(len(padded) - size + 1)
+        )
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for gram, count in grams.items():
+            bucket = zlib.crc32(gram.encode("utf-8"))
+            sign = 1.0 if bucket & 0x80000000 else -1.0
+            vector[bucket % self.dim] += sign * (1.0 + math.log(count))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def transform(self, texts: list[str]):
+        """(len(texts) x dim) float32 matrix of unit vectors."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            matrix[i] = self._vector(text)
+        return matrix
+
+
+class EmbeddingVectorizer:
+    """A locally available sentence-transformers model, run on the CPU."""
+
+    def __init__(self, model: str):
+        _require_numpy()
+        # Imported here: it pulls in torch, which the default vectorizer does not need
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise RuntimeError(
+                f"vectorizer {model!r} needs sentence-transformers; install it or use 'hashing'"
+            ) from None
+        try:
+            # Never download from the model hub: only local paths and the local cache
+            self.model = SentenceTransformer(model, device="cpu", local_files_only=True)
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"vectorizer {model!r} is not available locally: {e}") from None
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = "st-" + re.sub(r"[^a-z0-9]+", "-", model.lower()).strip("-")
+
+    def transform(self, texts: list[str]):
+        vectors = self.model.encode(
+            texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+
+
+def get_vectorizer(name: str = DEFAULT_VECTORIZER):
+    """"hashing" for the built-in vectorizer; anything else is a sentence-transformers model."""
+    if name == "hashing":
+        return HashingVectorizer()
+    return EmbeddingVectorizer(name)
+
+
+class VectorCache:
+    """Content hash -> row of a memory-mapped float32 matrix, one file pair per vectorizer."""
+
+    def __init__(self, vectorizer, root: Path = VECTOR_DIR):
+        self.vectorizer = vectorizer
+        self.matrix_path = root / f"{vectorizer.name}.f32"
+        self.index_path = root / f"{vectorizer.name}.json"
+        self.rows: dict[str, int] = {}
+        if self.index_path.exists() and self.matrix_path.exists():
+            try:
+                index = json.loads(self.index_path.read_text())
+            except json.JSONDecodeError:
+                index = {}
+            if index.get("dim") == vectorizer.dim:
+                self.rows = index.get("rows", {})
+        row_bytes = vectorizer.dim * 4
+        if self.rows and self.matrix_path.stat().st_size < len(self.rows) * row_bytes:
+            self.rows = {}  # matrix truncated (interrupted write): start over
+        self.matrix = None
+        self._map()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _map(self) -> None:
+        """(Re)map the matrix file read-only with the current row count."""
+        self.matrix = (
+            np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(len(self.rows), self.vectorizer.dim))
+            if self.rows else np.zeros((0, self.vectorizer.dim), dtype=np.float32)
+        )
+
+    def _append(self, texts: list[str]) -> None:
+        """Vectorize texts not cached yet and append their rows to the matrix file."""
+        new = {}
+        for text in texts:
+            digest = text_hash(text)
+            if digest not in self.rows and digest not in new:
+                new[digest] = text
+        if not new:
+            return
+        vectors = self.vectorizer.transform(list(new.values()))
+        self.matrix_path.parent.mkdir(parents=True, exist_ok=True)
+        mode = "r+b" if self.rows else "wb"
+        with open(self.matrix_path, mode) as f:
+            f.seek(len(self.rows) * self.vectorizer.dim * 4)
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            f.truncate()
+        for digest in new:
+            self.rows[digest] = len(self.rows)
+        self._map()
+
+    def row_ids(self, texts: list[str]):
+        """Matrix rows of the texts, vectorizing the ones not cached yet."""
+        self._append(texts)
+        return np.array([self.rows[text_hash(text)] for text in texts], dtype=np.int64)
+
+    def similarities(self, profile_text: str, texts: list[str]):
+        """Cosine similarity of each text to the profile text (float32 array)."""
+        rows = self.row_ids(texts)
+        if not len(rows):
+            return np.zeros(0, dtype=np.float32)
+        profile = self.vectorizer.transform([profile_text])[0]
+        return self.matrix[rows] @ profile
+
+    def retain(self, digests: set[str]) -> bool:
+        """
+        Forget cached texts whose text_hash is not in `digests`. The matrix is
+        rewritten only when fewer than COMPACT_RATIO of its rows are still in
+        use. Returns True if it was rewritten.
+        """
+        keep = [digest for digest in self.rows if digest in digests]
+        if len(keep) >= COMPACT_RATIO * len(self.rows):
+            return False
+        old_rows = np.array([self.rows[digest] for digest in keep], dtype=np.int64)
+        vectors = np.array(self.matrix[old_rows]) if len(keep) else None
+        self.matrix = None  # release the memmap before rewriting the file
+        tmp = self.matrix_path.with_suffix(".f32.tmp")
+        tmp.write_bytes(vectors.tobytes() if vectors is not None else b"")
+        os.replace(tmp, self.matrix_path)
+        self.rows = {digest: i for i, digest in enumerate(keep)}
+        self._map()
+        self.save()
+        return True
+
+    def save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"dim": self.vectorizer.dim, "rows": self.rows}))
+        os.replace(tmp, self.index_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic similarity of texts to the resume")
+    parser.add_argument("texts", nargs="+", help="Job titles or descriptions to compare")
+    parser.add_argument(
+        "--model", type=str, default=DEFAULT_VECTORIZER,
+        help="'hashing' or a local sentence-transformers model name/path",
+    )
+    args = parser.parse_args()
+
+    try:
+        vectorizer = get_vectorizer(args.model)
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    profile = vectorizer.transform([(PROFILE_DIR / "resume.md").read_text()])[0]
+    scores = vectorizer.transform(args.texts) @ profile
+    print(f"Similarity to resume.md ({vectorizer.name}):")
+    for text, score in sorted(zip(args.texts, scores.tolist()), key=lambda item: -item[1]):
+        print(f"  {score:6.3f}  {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Content-addressed archive for captured HTML/JSON page snapshots.
+
+data/ collects raw page captures as loose files, and many of them are
+byte-identical: the same search saved under two names, or a board that
+returned the same page for two queries. The archive stores each distinct
+content once, compressed, under its SHA-256. A manifest maps the logical
+snapshot names to those blobs.
+
+Layout (data/snapshots/):
+    manifest.json          {name: {"blob": sha256, "size": bytes, "stored_at": iso}}
+    blobs/3f/3f2a....zst   zstd-compressed content (.zz: zlib, if zstandard is missing)
+
+Names are paths relative to data/ ("ictergezocht2.html",
+"rendered/linkedin_3f2a9c1d.html"). The archive is an overlay of the data
+directory: search.py --replay DIR reads the loose files in DIR plus the
+archived snapshots under the same relative directory. Loose files win on a
+name clash. Reads are one manifest lookup plus one blob file, independent of
+the archive size.
+
+Usage:
+    python3 scripts/snapshot_archive.py import data/*.html data/*.json   # archive captures
+    python3 scripts/snapshot_archive.py import --remove data/*.html      # ...and delete the originals
+    python3 scripts/snapshot_archive.py list
+    python3 scripts/snapshot_archive.py cat ictergezocht2.html
+    python3 scripts/snapshot_archive.py stats
+    python3 scripts/snapshot_archive.py gc                               # drop unreferenced blobs
+
+    from snapshot_archive import SnapshotArchive
+    archive = SnapshotArchive()
+    archive.add("rendered/linkedin_3f2a9c1d.html", html)
+    html = archive.read_text("rendered/linkedin_3f2a9c1d.html")
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+ARCHIVE_DIR = DATA_DIR / "snapshots"
+
+ZSTD_LEVEL = 19  # snapshots are written once and read many times
+ZLIB_LEVEL = 9
+
+
+def _compress(data: bytes) -> tuple[bytes, str]:
+    """Compress with zstd when available, zlib otherwise. Returns (payload, suffix)."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), ".zst"
+    return zlib.compress(data, ZLIB_LEVEL), ".zz"
+
+
+def _decompress(payload: bytes, suffix: str) -> bytes:
+    if suffix == ".zz":
+        return zlib.decompress(payload)
+    if zstandard is None:
+        raise RuntimeError("this snapshot is zstd-compressed; install zstandard to read it")
+    return zstandard.ZstdDecompressor().decompress(payload)
+
+
+class SnapshotArchive:
+    """Content-addressed blob store plus a name -> blob manifest, see module docstring."""
+
+    def __init__(self, root: Path = ARCHIVE_DIR):
+        self.root = root
+        self.manifest_path = root / "manifest.json"
+        self.lock = threading.Lock()
+        self.entries: dict[str, dict] = {}
+        if self.manifest_path.exists():
+            try:
+                self.entries = json.loads(self.manifest_path.read_text())
+            except json.JSONDecodeError:
+                self.entries = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _blob_path(self, digest: str, suffix: str) -> Path:
+        return self.root / "blobs" / digest[:2] / f"{digest}{suffix}"
+
+    def _find_blob(self, digest: str) -> Path | None:
+        for suffix in (".zst", ".zz"):
+            path = self._blob_path(digest, suffix)
+            if path.exists():
+                return path
+        return None
+
+    def add(self, name: str, data: bytes | str) -> str:
+        """Store a snapshot under `name` (replacing any previous one) and return its hash."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            if self._find_blob(digest) is None:
+                payload, suffix = _compress(data)
+                path = self._blob_path(digest, suffix)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(path.suffix + ".tmp")
+                tmp.write_bytes(payload)
+                os.replace(tmp, path)
+            self.entries[name] = {
+                "blob": digest,
+                "size": len(data),
+                "stored_at": datetime.now().isoformat(),
+            }
+        return digest
+
+    def read(self, name: str) -> bytes:
+        """Return a snapshot's bytes. Raises KeyError for unknown names."""
+        digest = self.entries[name]["blob"]
+        path = self._find_blob(digest)
+        if path is None:
+            raise KeyError(f"{name}: blob {digest} is missing from {self.root}")
+        return _decompress(path.read_bytes(), path.suffix)
+
+    def read_text(self, name: str) -> str:
+        return self.read(name).decode("utf-8", errors="replace")
+
+    def names(self, pattern: str = "*") -> list[str]:
+        """Sorted snapshot names matching a glob pattern."""
+        return sorted(name for name in self.entries if fnmatch.fnmatch(name, pattern))
+
+    def iter_dir(self, directory: str = "", pattern: str = "*.html"):
+        """
+        Yield (file name, text) for the snapshots directly inside a directory
+        relative to data/ ("" for data/ itself), like a glob over loose files.
+        """
+        prefix = f"{directory.strip('/')}/" if directory.strip("/") else ""
+        for name in self.names(prefix + pattern):
+            base = name[len(prefix):]
+            if "/" not in base:
+                yield base, self.read_text(name)
+
+    def remove(self, name: str) -> None:
+        """Drop a name from the manifest. The blob stays until gc()."""
+        with self.lock:
+            self.entries.pop(name, None)
+
+    def gc(self) -> int:
+        """Delete blobs no manifest entry refers to. Returns the number removed."""
+        with self.lock:
+            referenced = {entry["blob"] for entry in self.entries.values()}
+        removed = 0
+        for path in (self.root / "blobs").glob("*/*"):
+            if path.name.split(".")[0] not in referenced:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        """Logical vs. stored bytes and the number of names and distinct blobs."""
+        with self.lock:
+            entries = list(self.entries.values())
+        sizes = {entry["blob"]: entry["size"] for entry in entries}
+        stored = 0
+        for digest in sizes:
+            path = self._find_blob(digest)
+            if path is not None:
+                stored += path.stat().st_size
+        return {
+            "names": len(entries),
+            "blobs": len(sizes),
+            "logical_bytes": sum(entry["size"] for entry in entries),
+            "unique_bytes": sum(sizes.values()),
+            "stored_bytes": stored,
+        }
+
+    def save(self) -> None:
+        with self.lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(self.entries, indent=2, sort_keys=True))
+            os.replace(tmp, self.manifest_path)
+
+
+def snapshot_name(path: Path) -> str:
+    """Archive name of a file: its path relative to data/, or its bare name outside it."""
+    try:
+        return path.resolve().relative_to(DATA_DIR).as_posix()
+    except ValueError:
+        return path.name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed snapshot archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_cmd = sub.add_parser("import", help="Archive snapshot files")
+    import_cmd.add_argument("paths", nargs="+", type=Path)
+    import_cmd.add_argument("--remove", action="store_true", help="Delete the originals afterwards")
+    list_cmd = sub.add_parser("list", help="List archived snapshots")
+    list_cmd.add_argument("pattern", nargs="?", default="*")
+    cat_cmd = sub.add_parser("cat", help="Print a snapshot")
+    cat_cmd.add_argument("name")
+    sub.add_parser("stats", help="Print archive size statistics")
+    sub.add_parser("gc", help="Delete unreferenced blobs")
+    args = parser.parse_args()
+
+    archive = SnapshotArchive()
+
+    if args.command == "import":
+        imported = []
+        for path in args.paths:
+            if not path.is_file():
+                print(f"    Warning: {path} is not a file, skipped")
+                continue
+            archive.add(snapshot_name(path), path.read_bytes())
+            imported.append(path)
+        archive.save()
+        if args.remove:
+            for path in imported:
+                path.unlink()
+        print(f"Archived {len(imported)} snapshots ({archive.stats()['blobs']} distinct blobs)")
+
+    elif args.command == "list":
+        for name in archive.names(args.pattern):
+            entry = archive.entries[name]
+            print(f"  {name:<50} {entry['size']:>9} bytes  {entry['blob'][:12]}")
+
+    elif args.command == "cat":
+        try:
+            sys.stdout.buffer.write(archive.read(args.name))
+        except KeyError:
+            print(f"ERROR: no snapshot named {args.name}")
+            sys.exit(1)
+
+    elif args.command == "stats":
+        stats = archive.stats()
+        ratio = stats["stored_bytes"] / stats["logical_bytes"] if stats["logical_bytes"] else 0
+        print(f"Snapshots:      {stats['names']} names, {stats['blobs']} distinct blobs")
+        print(f"Logical size:   {stats['logical_bytes']:,} bytes")
+        print(f"After dedupe:   {stats['unique_bytes']:,} bytes")
+        print(f"Stored size:    {stats['stored_bytes']:,} bytes ({ratio:.1%})")
+        print(f"Compression:    {'zstd' if zstandard is not None else 'zlib (zstandard not installed)'}")
+
+    elif args.command == "gc":
+        print(f"Removed {archive.gc()} unreferenced blobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+from canonical_url import canonicalize_url
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 PROFILE_DIR = BASE_DIR / "profile"
@@ -75,9 +77,13 @@ def load_applied_jobs() -> dict:
         return {}
     try:
         applications = json.loads(apps_path.read_text())
-        return {app["url"]: app for app in applications if "url" in app}
+        applied = {app["url"]: app for app in applications if "url" in app}
     except (json.JSONDecodeError, KeyError):
         return {}
+    # Scored jobs carry canonical URLs (and the original one in raw_url)
+    for url, app in list(applied.items()):
+        applied.setdefault(canonicalize_url(url), app)
+    return applied
 
 
 def call_claude(prompt: str) -> str:
@@ -200,12 +206,12 @@ def main():
     applied_jobs = load_applied_jobs()
 
     print(f"  Scored jobs: {len(scored_jobs)}")
-    print(f"  Already applied: {len(applied_jobs)}")
+    print(f"  Already applied: {len({app['url'] for app in applied_jobs.values()})}")
 
     # Filter out already-applied jobs
     jobs_to_tailor = [
         j for j in scored_jobs
-        if j.get("url") not in applied_jobs
+        if j.get("url") not in applied_jobs and j.get("raw_url") not in applied_jobs
     ][:args.max_jobs]
 
     print(f"  Jobs to tailor: {len(jobs_to_tailor)}")